@@ -0,0 +1 @@
+# Benchmark scripts, run as modules (e.g. python -m benchmarks.startup)
@@ -0,0 +1,85 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  analytics.py
+#
+#  Benchmark and report for maze analytics over a generated corpus: generates a batch of seeded mazes, optionally
+#  braided, times their structural analysis, and summarizes the statistics (optionally storing them in the run
+#  history).
+#
+#  Example:
+#      python -m benchmarks.analytics --size 25 --count 2000 --braid 0.5 --db run_history.sqlite3
+# ----------------------------------------------------------------------------------------------------------------------
+
+import argparse
+from collections import Counter
+from time import perf_counter
+from maze import Maze
+from maze.analysis import FIELDS, analyze_batch
+from traversals import MazeGenerator
+
+# Corridor length from which corridors are counted together in the report
+LONG_CORRIDOR = 16
+
+def generate_batch(length, count, first_seed, braid=0.0):
+    """
+    Generates a batch of mazes from consecutive seeds.
+    :param braid: The fraction of dead ends to remove from each maze
+    :return: A list of wall encodings
+    """
+    maze = Maze(length)
+    batch = []
+
+    for seed in range(first_seed, first_seed + count):
+        maze.reset_graph()
+        MazeGenerator(maze, seed=seed, braid=braid).generate_maze_dfs()
+        batch.append(maze.get_walls())
+
+    return batch
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.analytics", description="Benchmark maze analytics.")
+    parser.add_argument("--size", type=int, default=25, help="length of the mazes (default: %(default)s)")
+    parser.add_argument("--count", type=int, default=1000, help="number of mazes (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first maze (default: %(default)s)")
+    parser.add_argument(
+        "--braid", type=float, default=0.0, help="fraction of dead ends to remove (default: %(default)s)"
+    )
+    parser.add_argument("--db", help="store the statistics of each maze in this run history")
+    arguments = parser.parse_args()
+
+    start_time = perf_counter()
+    batch = generate_batch(arguments.size, arguments.count, arguments.seed, arguments.braid)
+    generation_time = perf_counter() - start_time
+
+    start_time = perf_counter()
+    results = analyze_batch(arguments.size, batch)
+    analysis_time = perf_counter() - start_time
+
+    print("{} mazes of {}x{}, braid {}".format(arguments.count, arguments.size, arguments.size, arguments.braid))
+    print("{:18}{:9.3f}s".format("Generation:", generation_time))
+    print("{:18}{:9.3f}s  ({:.0f} mazes/s)".format("Analysis:", analysis_time, arguments.count / analysis_time))
+    print()
+
+    print("{:18}{:>10}{:>10}{:>10}".format("", "mean", "min", "max"))
+    for field in FIELDS:
+        values = [getattr(stats, field) for stats in results]
+        print("{:18}{:10.2f}{:10.2f}{:10.2f}".format(field + ":", sum(values) / len(values), min(values), max(values)))
+    print()
+
+    # Corridor lengths over the whole batch, with long corridors in one bin
+    corridors = Counter()
+    for stats in results:
+        for length, count in stats.corridor_lengths.items():
+            corridors[min(length, LONG_CORRIDOR)] += count
+
+    total = sum(corridors.values())
+    print("Corridor lengths:")
+    for length, count in sorted(corridors.items()):
+        label = "{}+".format(length) if length == LONG_CORRIDOR else str(length)
+        print("{:>6}{:10.2%}".format(label, count / total))
+
+    if arguments.db:
+        from history import RunHistory
+        RunHistory(arguments.db).record_mazes(arguments.size, list(enumerate(results, arguments.seed)), arguments.braid)
+
+if __name__ == '__main__':
+    main()
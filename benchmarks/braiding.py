@@ -0,0 +1,108 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  braiding.py
+#
+#  Benchmark for solvers on braided mazes: generates batches of seeded mazes at increasing braid factors (the fraction
+#  of dead ends removed, which adds loops), and reports each solver's mean node expansions, compute time and path
+#  length by loop density, from perfect mazes (no loops) to mazes without dead ends. Perfect mazes have a single path,
+#  so path lengths only differ between solvers on braided mazes. Jump Point Search expands few nodes but passes over
+#  many more cells in its scans between them, so the cells it scans are reported too.
+#
+#  Example:
+#      python -m benchmarks.braiding --size 100 --count 20 --braids 0 0.25 0.5 0.75 1
+# ----------------------------------------------------------------------------------------------------------------------
+
+import argparse
+from maze import Maze
+from maze.analysis import analyze
+from traversals import MazeGenerator
+from traversals.backend import SOLVERS
+
+def run_solvers(length, count, first_seed, braid, algorithms):
+    """
+    Generates and solves a batch of braided mazes.
+    :return: The mean number of loops and dead ends per maze, and the mean expansions, compute time, path length and
+    scanned cells of each solver (None for solvers that do not scan)
+    """
+    loops = 0
+    dead_ends = 0
+    totals = {algorithm: [0, 0.0, 0, 0] for algorithm in algorithms}
+    scanning = set()
+
+    for seed in range(first_seed, first_seed + count):
+        maze = Maze(length)
+        MazeGenerator(maze, seed=seed, braid=braid).generate_maze_dfs()
+
+        stats = analyze(maze)
+        loops += stats.loops
+        dead_ends += stats.dead_ends
+
+        for algorithm in algorithms:
+            # Count the cells colored as the solution path (time spent coloring is not part of the compute time)
+            path = []
+
+            def set_color(x, y, color):
+                if color == "green":
+                    path.append((x, y))
+
+            solver_class, method = SOLVERS[algorithm]
+            solver = solver_class(maze, set_color)
+            _, metrics = getattr(solver, method)()
+
+            totals[algorithm][0] += metrics.expansions
+            totals[algorithm][1] += metrics.compute
+            totals[algorithm][2] += len(path) + 1
+
+            # Jump Point Search counts the cells passed over by its scans between jump points
+            if hasattr(solver, "scanned"):
+                totals[algorithm][3] += solver.scanned
+                scanning.add(algorithm)
+
+    means = {algorithm: [total / count for total in algorithm_totals] for algorithm, algorithm_totals in totals.items()}
+
+    for algorithm in algorithms:
+        if algorithm not in scanning:
+            means[algorithm][3] = None
+
+    return loops / count, dead_ends / count, means
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.braiding", description="Benchmark solvers on braided mazes."
+    )
+    parser.add_argument("--size", type=int, default=100, help="length of the mazes (default: %(default)s)")
+    parser.add_argument("--count", type=int, default=10, help="number of mazes per braid factor (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first maze (default: %(default)s)")
+    parser.add_argument(
+        "--braids", type=float, nargs="+", default=[0.0, 0.25, 0.5, 0.75, 1.0],
+        help="braid factors to compare (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--algorithms", nargs="+", default=["dfs", "bfs", "a_star", "jps"], choices=list(SOLVERS),
+        help="solvers to compare (default: %(default)s)"
+    )
+    arguments = parser.parse_args()
+
+    print("{} mazes of {}x{} per braid factor".format(arguments.count, arguments.size, arguments.size))
+    print()
+    print("{:>8}{:>9}{:>11}  {:18}{:>12}{:>13}{:>8}{:>10}".format(
+        "braid", "loops", "dead ends", "solver", "expansions", "compute", "path", "scanned"
+    ))
+
+    for braid in arguments.braids:
+        loops, dead_ends, means = run_solvers(
+            arguments.size, arguments.count, arguments.seed, braid, arguments.algorithms
+        )
+
+        for k, (algorithm, (expansions, compute, path, scanned)) in enumerate(means.items()):
+            # Only label the first row of each braid factor
+            if k == 0:
+                print("{:8.2f}{:9.1f}{:11.1f}  ".format(braid, loops, dead_ends), end="")
+            else:
+                print(" " * 30, end="")
+
+            print("{:18}{:12.1f}{:11.2f}ms{:8.1f}{:>10}".format(
+                algorithm, expansions, compute * 1000, path, "-" if scanned is None else "{:.1f}".format(scanned)
+            ))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  hierarchy.py
+#
+#  Benchmark for hierarchical pathfinding: builds a HierarchicalIndex for a large maze, then answers a set of random
+#  queries with flat A* and with the index, reporting the index's build time and memory and the speedup per query.
+#  Queries are answered twice with the index, since later queries reuse the refined segments of earlier ones. Loops
+#  can be added to the maze by braiding it, or by opening a fraction of its closed walls at random.
+#
+#  Example:
+#      python -m benchmarks.hierarchy --size 300 --cluster 32 --queries 200 --braid 0.5
+# ----------------------------------------------------------------------------------------------------------------------
+
+import argparse
+import random
+from time import perf_counter
+from maze import Maze
+from maze.Maze import EAST, SOUTH
+from traversals import MazeGenerator
+from traversals.hierarchy import HierarchicalIndex, find_path
+
+def open_walls(length, walls, fraction, seed):
+    """
+    Opens a fraction of the closed walls between cells at random, adding loops to the maze.
+    :return: The new wall encoding
+    """
+    rng = random.Random(seed)
+    walls = bytearray(walls)
+
+    for cell in range(length * length):
+        x, y = cell % length, cell // length
+
+        if x + 1 < length and not walls[cell] & EAST and rng.random() < fraction:
+            walls[cell] |= EAST
+        if y + 1 < length and not walls[cell] & SOUTH and rng.random() < fraction:
+            walls[cell] |= SOUTH
+
+    return bytes(walls)
+
+def time_queries(function, queries):
+    """
+    :return: The paths found for each query, the mean time per query (in seconds), and the total number of expansions
+    """
+    paths = []
+    expansions = 0
+
+    start_time = perf_counter()
+    for start, end in queries:
+        path, query_expansions = function(start, end)
+        paths.append(path)
+        expansions += query_expansions
+
+    return paths, (perf_counter() - start_time) / len(queries), expansions
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.hierarchy", description="Benchmark hierarchical pathfinding."
+    )
+    parser.add_argument("--size", type=int, default=300, help="length of the maze (default: %(default)s)")
+    parser.add_argument("--cluster", type=int, default=32, help="length of each cluster (default: %(default)s)")
+    parser.add_argument("--queries", type=int, default=100, help="number of random queries (default: %(default)s)")
+    parser.add_argument(
+        "--braid", type=float, default=0.0, help="fraction of dead ends to remove (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--loops", type=float, default=0.0, help="fraction of closed walls to open (default: %(default)s)"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed of the maze and queries (default: %(default)s)")
+    arguments = parser.parse_args()
+
+    length = arguments.size
+    cells = length * length
+
+    maze = Maze(length)
+    MazeGenerator(maze, seed=arguments.seed, braid=arguments.braid).generate_maze_dfs()
+    walls = open_walls(length, maze.get_walls(), arguments.loops, arguments.seed)
+
+    start_time = perf_counter()
+    index = HierarchicalIndex(length, walls, arguments.cluster)
+    build_time = perf_counter() - start_time
+
+    rng = random.Random(arguments.seed)
+    queries = [(rng.randrange(cells), rng.randrange(cells)) for _ in range(arguments.queries)]
+
+    flat_paths, flat_time, flat_expansions = time_queries(lambda s, e: find_path(length, walls, s, e), queries)
+    first_paths, first_time, first_expansions = time_queries(index.find_path, queries)
+    repeat_paths, repeat_time, repeat_expansions = time_queries(index.find_path, queries)
+
+    # Both searches find shortest paths, so only their lengths have to match
+    mismatches = sum(len(flat) != len(hierarchical) for flat, hierarchical in zip(flat_paths, first_paths))
+    graph_memory, segment_memory = index.memory
+
+    print("{}x{} maze, {:.0%} of dead ends removed, {:.0%} of closed walls opened, {}x{} clusters".format(
+        length, length, arguments.braid, arguments.loops, arguments.cluster, arguments.cluster
+    ))
+    print("{:22}{:10.3f}s".format("Index build:", build_time))
+    print("{:22}{:>10}".format("Entrances:", len(index.entrances)))
+    print("{:22}{:>10}".format("Abstract edges:", len(index.targets)))
+    print("{:22}{:10.1f} KiB".format("Abstract graph:", graph_memory / 1024))
+    print("{:22}{:10.1f} KiB".format("Refined segments:", segment_memory / 1024))
+    print()
+
+    print("{:22}{:>12}{:>14}{:>10}".format("Per query:", "time", "expansions", "speedup"))
+    for name, time, expansions in (
+        ("Flat A*", flat_time, flat_expansions),
+        ("HPA* (first)", first_time, first_expansions),
+        ("HPA* (repeated)", repeat_time, repeat_expansions)
+    ):
+        print("{:22}{:10.2f}ms{:14.0f}{:9.1f}x".format(
+            name, time * 1000, expansions / len(queries), flat_time / time
+        ))
+
+    print()
+    print("{:22}{:>10}".format("Length mismatches:", mismatches))
+    print("{:22}{:10.1f}".format("Queries to repay:", build_time / max(flat_time - first_time, 1e-9)))
+
+if __name__ == '__main__':
+    main()
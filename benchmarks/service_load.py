@@ -0,0 +1,171 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  service_load.py
+#
+#  Load generator for the maze service: opens a number of keep-alive connections, sends a mix of generate and solve
+#  requests over them, and reports throughput, latency percentiles, and error counts by status.
+#
+#  Example (start a service with four workers, then run 2000 requests over 32 connections):
+#      python -m benchmarks.service_load --spawn --workers 4 --concurrency 32 --requests 2000
+# ----------------------------------------------------------------------------------------------------------------------
+
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+from collections import Counter
+from time import perf_counter
+
+# Share of each kind of request in the mix
+REQUEST_MIX = {
+    "generate": 0.3,
+    "generate_binary": 0.2,
+    "solve": 0.4,
+    "batch_solve": 0.1
+}
+
+def build_request(kind, size, seed, host):
+    """
+    :return: The raw bytes of a request of the given kind
+    """
+    if kind == "generate":
+        target, body = "/generate", {"size": size, "seed": seed}
+    elif kind == "generate_binary":
+        target, body = "/generate?format=binary", {"size": size, "seed": seed}
+    elif kind == "solve":
+        target, body = "/solve", {"size": size, "seed": seed, "algorithm": random.choice(["dfs", "bfs", "a_star"])}
+    else:
+        target, body = "/batch-solve", {"size": size, "seeds": [seed, seed + 1], "algorithms": ["bfs", "a_star"]}
+
+    body = json.dumps(body).encode()
+    head = "POST {} HTTP/1.1\r\nHost: {}\r\nContent-Type: application/json\r\nContent-Length: {}\r\n\r\n"
+
+    return head.format(target, host, len(body)).encode() + body
+
+async def read_response(reader):
+    """
+    Reads one response from a connection, including chunked bodies.
+    :return: The response status and body
+    """
+    status = int((await reader.readline()).split()[1])
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get("transfer-encoding") == "chunked":
+        body = bytearray()
+        while True:
+            size = int(await reader.readline(), 16)
+            chunk = await reader.readexactly(size + 2)
+            if size == 0:
+                break
+            body.extend(chunk[:-2])
+    else:
+        body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+    return status, bytes(body)
+
+async def run_connection(host, port, kinds, size, latencies, statuses):
+    reader, writer = await asyncio.open_connection(host, port)
+
+    try:
+        for kind in kinds:
+            request = build_request(kind, size, random.randrange(1 << 30), host)
+
+            start_time = perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status, _ = await read_response(reader)
+
+            latencies.append(perf_counter() - start_time)
+            statuses[status] += 1
+    finally:
+        writer.close()
+
+async def run_load(arguments):
+    kinds = random.choices(list(REQUEST_MIX), list(REQUEST_MIX.values()), k=arguments.requests)
+    latencies = []
+    statuses = Counter()
+
+    # Split the requests evenly over the connections
+    connections = [
+        run_connection(
+            arguments.host, arguments.port, kinds[k::arguments.concurrency], arguments.size, latencies, statuses
+        )
+        for k in range(arguments.concurrency)
+    ]
+
+    start_time = perf_counter()
+    await asyncio.gather(*connections)
+    elapsed = perf_counter() - start_time
+
+    latencies.sort()
+
+    def percentile(fraction):
+        return latencies[min(len(latencies) - 1, max(0, int(fraction * len(latencies) + 0.5) - 1))] * 1000
+
+    print("{} requests over {} connections, {}x{} mazes".format(
+        arguments.requests, arguments.concurrency, arguments.size, arguments.size
+    ))
+    print("{:14}{:10.1f} requests/s".format("Throughput:", len(latencies) / elapsed))
+    print("{:14}{:10.2f} ms".format("p50 latency:", percentile(0.5)))
+    print("{:14}{:10.2f} ms".format("p99 latency:", percentile(0.99)))
+    print("{:14}{:10.2f} ms".format("Max latency:", latencies[-1] * 1000))
+    print("{:14}{}".format("Statuses:", ", ".join("{}: {}".format(s, n) for s, n in sorted(statuses.items()))))
+    print("{:14}{:10}".format("Errors:", sum(n for s, n in statuses.items() if s != 200)))
+
+async def wait_for_service(host, port, process):
+    while process.poll() is None:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.1)
+
+    raise RuntimeError("The service exited before accepting connections")
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.service_load", description="Load test the maze service."
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="address of the service (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=8080, help="port of the service (default: %(default)s)")
+    parser.add_argument("--concurrency", type=int, default=16, help="open connections (default: %(default)s)")
+    parser.add_argument("--requests", type=int, default=1000, help="total requests (default: %(default)s)")
+    parser.add_argument("--size", type=int, default=25, help="length of the mazes (default: %(default)s)")
+    parser.add_argument("--spawn", action="store_true", help="start a service for the test and stop it afterwards")
+    parser.add_argument("--workers", type=int, help="worker processes of a spawned service")
+    parser.add_argument("--queue", type=int, default=64, help="queue size of a spawned service (default: %(default)s)")
+    arguments = parser.parse_args()
+
+    process = None
+    if arguments.spawn:
+        command = [
+            sys.executable, "-m", "service", "--host", arguments.host, "--port", str(arguments.port),
+            "--queue", str(arguments.queue)
+        ]
+        if arguments.workers:
+            command += ["--workers", str(arguments.workers)]
+
+        process = subprocess.Popen(command)
+
+    try:
+        if process is not None:
+            asyncio.run(wait_for_service(arguments.host, arguments.port, process))
+
+        asyncio.run(run_load(arguments))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+if __name__ == '__main__':
+    main()
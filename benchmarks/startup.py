@@ -0,0 +1,101 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  startup.py
+#
+#  Benchmark for startup cost: the time to import the headless packages (maze, traversals, history) in a fresh
+#  interpreter, and the time from launching the GUI to its first shown window. Each is measured in fresh processes,
+#  and the benchmark fails when a median exceeds its budget, so it can guard startup time in CI.
+#
+#  Example:
+#      python -m benchmarks.startup --runs 20 --import-budget 30
+# ----------------------------------------------------------------------------------------------------------------------
+
+import argparse
+import importlib.util
+import os
+import statistics
+import subprocess
+import sys
+from time import perf_counter
+
+# Project root, where the packages and MazeSolver.py live
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEADLESS_IMPORT = "import maze, traversals, history"
+
+def time_process(arguments, runs):
+    """
+    Times fresh Python processes from launch to exit.
+    :param arguments: The arguments passed to the Python interpreter
+    :param runs: The number of processes to time
+    :return: A list of wall-clock times (in seconds)
+    """
+    times = []
+
+    for _ in range(runs):
+        start = perf_counter()
+        subprocess.run([sys.executable, *arguments], cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+        times.append(perf_counter() - start)
+
+    return times
+
+def check_headless_modules():
+    """
+    Checks that importing the headless packages does not load Qt, NumPy or multiprocessing.
+    :return: The heavy modules that were loaded
+    """
+    script = "{}; import sys; print(' '.join(m for m in ('PyQt6', 'numpy', 'multiprocessing') if m in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", script.format(HEADLESS_IMPORT)], cwd=ROOT, check=True,
+                            capture_output=True, text=True).stdout
+
+    return output.split()
+
+def report(name, times, budget):
+    """
+    Prints the median and spread of a set of times, and checks the median against a budget.
+    :return: True if the median is within budget
+    """
+    median = statistics.median(times) * 1000
+    within = budget is None or median <= budget
+
+    print("{:24}{:9.1f}ms  (min {:.1f}ms, max {:.1f}ms){}".format(
+        name, median, min(times) * 1000, max(times) * 1000,
+        "" if budget is None else "  budget {:.0f}ms: {}".format(budget, "ok" if within else "OVER")
+    ))
+
+    return within
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup", description="Benchmark startup time.")
+    parser.add_argument("--runs", type=int, default=10, help="processes to time for each measurement")
+    parser.add_argument("--import-budget", type=float, default=50,
+                        help="budget for the headless import, over a bare interpreter (in ms, default: %(default)s)")
+    parser.add_argument("--window-budget", type=float, default=1500,
+                        help="budget for launching the GUI to its first window (in ms, default: %(default)s)")
+    arguments = parser.parse_args()
+
+    passed = True
+
+    # Interpreter startup alone, which is subtracted from the import time
+    baseline = time_process(["-c", "pass"], arguments.runs)
+    report("Interpreter:", baseline, None)
+
+    imports = time_process(["-c", HEADLESS_IMPORT], arguments.runs)
+    offset = statistics.median(baseline)
+    passed &= report("Headless import:", [t - offset for t in imports], arguments.import_budget)
+
+    loaded = check_headless_modules()
+    if loaded:
+        print("Headless import loaded: {}".format(", ".join(loaded)))
+        passed = False
+
+    # Time to first window needs Qt and a display
+    if importlib.util.find_spec("PyQt6") is None:
+        print("{:24}skipped (PyQt6 is not installed)".format("First window:"))
+    else:
+        window = time_process(["MazeSolver.py", "--exit-on-show"], arguments.runs)
+        passed &= report("First window:", window, arguments.window_budget)
+
+    sys.exit(0 if passed else 1)
+
+if __name__ == '__main__':
+    main()
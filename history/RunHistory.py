@@ -0,0 +1,232 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  RunHistory.py
+#
+#  Python class for a persistent SQLite store of generation and solving runs, with queries and aggregation for tracking
+#  performance across sizes, machines, and time.
+# ----------------------------------------------------------------------------------------------------------------------
+
+import sqlite3
+from contextlib import closing
+from time import time
+
+DEFAULT_PATH = "run_history.sqlite3"
+
+# Run fields that can be aggregated
+FIELDS = ("total", "compute", "render", "pacing", "expansions")
+
+# Structural statistics stored for each generated maze (see maze.analysis.MazeStats)
+MAZE_FIELDS = ("dead_ends", "junctions", "loops", "branching_factor", "mean_corridor", "diameter", "solution_length")
+
+# Columns that runs can be grouped by
+GROUPS = ("algorithm", "size", "machine", "measure_only")
+
+def median(values):
+    # Imported on first use, since the statistics module is slow to import
+    import statistics
+    return statistics.median(values)
+
+def mean(values):
+    import statistics
+    return statistics.mean(values)
+
+# Statistics that can be computed over a group of runs
+STATISTICS = {
+    "median": median,
+    "mean": mean,
+    "min": min,
+    "max": max
+}
+
+class RunHistory:
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+
+        # Create the runs table if this is a new store
+        with closing(self.__connect()) as connection, connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS runs (
+                    id INTEGER PRIMARY KEY,
+                    timestamp REAL NOT NULL,
+                    algorithm TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    seed INTEGER,
+                    total REAL NOT NULL,
+                    compute REAL NOT NULL,
+                    render REAL NOT NULL,
+                    pacing REAL NOT NULL,
+                    expansions INTEGER NOT NULL,
+                    measure_only INTEGER NOT NULL,
+                    machine TEXT NOT NULL
+                )
+            """)
+
+            # Mazes are identified by size, seed and braid factor, since generation is deterministic for a seed and
+            # braid factor
+            columns = [row["name"] for row in connection.execute("PRAGMA table_info(mazes)")]
+
+            # Stores from before braiding keyed mazes by size and seed only, and held perfect mazes
+            if columns and "braid" not in columns:
+                connection.execute("ALTER TABLE mazes RENAME TO perfect_mazes")
+
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS mazes (
+                    size INTEGER NOT NULL,
+                    seed INTEGER NOT NULL,
+                    braid REAL NOT NULL,
+                    dead_ends INTEGER NOT NULL,
+                    junctions INTEGER NOT NULL,
+                    loops INTEGER NOT NULL,
+                    branching_factor REAL NOT NULL,
+                    mean_corridor REAL NOT NULL,
+                    diameter INTEGER NOT NULL,
+                    solution_length INTEGER NOT NULL,
+                    PRIMARY KEY (size, seed, braid)
+                )
+            """)
+
+            if columns and "braid" not in columns:
+                connection.execute(
+                    "INSERT INTO mazes (size, seed, braid, loops, {0}) SELECT size, seed, 0.0, 0, {0} "
+                    "FROM perfect_mazes".format(", ".join(field for field in MAZE_FIELDS if field != "loops"))
+                )
+                connection.execute("DROP TABLE perfect_mazes")
+
+    def __connect(self):
+        connection = sqlite3.connect(self.path)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def record(self, algorithm, size, seed, metrics, measure_only=False):
+        """
+        Appends a run to the store.
+        :param algorithm: The name of the run's function (e.g. "a_star")
+        :param size: The length of the maze
+        :param seed: The seed the maze was generated from
+        :param metrics: The RunMetrics object for the run
+        :param measure_only: Whether the run had no observers or pacing
+        """
+        # Imported on first use, since the platform module is slow to import
+        import platform
+
+        with closing(self.__connect()) as connection, connection:
+            connection.execute(
+                "INSERT INTO runs (timestamp, algorithm, size, seed, total, compute, render, pacing, expansions, "
+                "measure_only, machine) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (time(), algorithm, size, seed, metrics.total, metrics.compute, metrics.render, metrics.pacing,
+                 metrics.expansions, int(measure_only), platform.node())
+            )
+
+    def record_maze(self, size, seed, stats, braid=0.0):
+        """
+        Stores the structural statistics of a generated maze, replacing any earlier statistics for the same maze.
+        :param size: The length of the maze
+        :param seed: The seed the maze was generated from
+        :param stats: The MazeStats object for the maze
+        :param braid: The fraction of dead ends removed from the maze
+        """
+        self.record_mazes(size, [(seed, stats)], braid)
+
+    def record_mazes(self, size, mazes, braid=0.0):
+        """
+        Stores the structural statistics of a batch of generated mazes in one transaction.
+        :param size: The length of the mazes
+        :param mazes: A list of (seed, MazeStats) pairs
+        :param braid: The fraction of dead ends removed from the mazes
+        """
+        with closing(self.__connect()) as connection, connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO mazes (size, seed, braid, {}) VALUES (?, ?, ?, {})".format(
+                    ", ".join(MAZE_FIELDS), ", ".join("?" * len(MAZE_FIELDS))
+                ),
+                [(size, seed, braid, *(getattr(stats, field) for field in MAZE_FIELDS)) for seed, stats in mazes]
+            )
+
+    def summarize_mazes(self, size=None, braid=None):
+        """
+        Averages the statistics of stored mazes by size and braid factor.
+        :param size: Only include mazes of this length
+        :param braid: Only include mazes with this braid factor
+        :return: A list of sqlite3.Row objects with the size, the braid factor, the number of mazes, and the mean of
+        each of MAZE_FIELDS
+        """
+        statement = "SELECT size, braid, COUNT(*) AS count, {} FROM mazes".format(
+            ", ".join("AVG({0}) AS {0}".format(field) for field in MAZE_FIELDS)
+        )
+        conditions = []
+        parameters = []
+
+        if size is not None:
+            conditions.append("size = ?")
+            parameters.append(size)
+        if braid is not None:
+            conditions.append("braid = ?")
+            parameters.append(braid)
+
+        if conditions:
+            statement += " WHERE " + " AND ".join(conditions)
+        statement += " GROUP BY size, braid ORDER BY size, braid"
+
+        with closing(self.__connect()) as connection:
+            return connection.execute(statement, parameters).fetchall()
+
+    def query(self, algorithm=None, size=None, machine=None, measure_only=None, days=None):
+        """
+        Gets the stored runs matching all given filters, oldest first.
+        :param algorithm: The name of the run's function
+        :param size: The length of the maze
+        :param machine: The machine the run was recorded on
+        :param measure_only: Whether the run had no observers or pacing
+        :param days: Only include runs from this many days back
+        :return: A list of sqlite3.Row objects for the matching runs
+        """
+        conditions = []
+        parameters = []
+
+        for column, value in (("algorithm", algorithm), ("size", size), ("machine", machine)):
+            if value is not None:
+                conditions.append("{} = ?".format(column))
+                parameters.append(value)
+
+        if measure_only is not None:
+            conditions.append("measure_only = ?")
+            parameters.append(int(measure_only))
+
+        if days is not None:
+            conditions.append("timestamp >= ?")
+            parameters.append(time() - days * 86400)
+
+        statement = "SELECT * FROM runs"
+        if conditions:
+            statement += " WHERE " + " AND ".join(conditions)
+        statement += " ORDER BY timestamp"
+
+        with closing(self.__connect()) as connection:
+            return connection.execute(statement, parameters).fetchall()
+
+    def aggregate(self, field="compute", statistic="median", group_by=("algorithm", "size"), **filters):
+        """
+        Computes a statistic of a run field over groups of stored runs, e.g. median A* compute time by maze size.
+        :param field: The run field to aggregate (one of FIELDS)
+        :param statistic: The statistic to compute (one of STATISTICS)
+        :param group_by: The columns to group runs by (from GROUPS)
+        :param filters: Filters passed on to query()
+        :return: A list of (group, value, count) tuples sorted by group, where group is a tuple of column values
+        """
+        if field not in FIELDS:
+            raise ValueError("Unknown field: {}".format(field))
+        if statistic not in STATISTICS:
+            raise ValueError("Unknown statistic: {}".format(statistic))
+        for column in group_by:
+            if column not in GROUPS:
+                raise ValueError("Unknown group: {}".format(column))
+
+        # Collect field values for each group
+        groups = {}
+        for run in self.query(**filters):
+            group = tuple(run[column] for column in group_by)
+            groups.setdefault(group, []).append(run[field])
+
+        return [
+            (group, STATISTICS[statistic](values), len(values))
+            for group, values in sorted(groups.items())
+        ]
@@ -0,0 +1,2 @@
+# Import modules
+from .RunHistory import RunHistory
@@ -0,0 +1,59 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  __main__.py
+#
+#  Command line interface for querying and aggregating the run history store.
+#
+#  Example (median A* compute time by maze size over the last week):
+#      python -m history --algorithm a_star --days 7 --group-by size
+# ----------------------------------------------------------------------------------------------------------------------
+
+import argparse
+from history.RunHistory import RunHistory, DEFAULT_PATH, FIELDS, GROUPS, STATISTICS, MAZE_FIELDS
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m history", description="Query the maze run history.")
+    parser.add_argument("--db", default=DEFAULT_PATH, help="path to the history store (default: %(default)s)")
+    parser.add_argument("--algorithm", help="only include runs of this function (e.g. a_star, generate_maze_dfs)")
+    parser.add_argument("--size", type=int, help="only include runs on mazes of this length")
+    parser.add_argument("--machine", help="only include runs recorded on this machine")
+    parser.add_argument("--measure-only", action="store_true", help="only include runs without observers or pacing")
+    parser.add_argument("--days", type=float, help="only include runs from this many days back")
+    parser.add_argument("--field", choices=FIELDS, default="compute", help="field to aggregate (default: %(default)s)")
+    parser.add_argument("--stat", choices=STATISTICS, default="median", help="statistic (default: %(default)s)")
+    parser.add_argument("--group-by", nargs="+", choices=GROUPS, default=["algorithm", "size"],
+                        help="columns to group by (default: algorithm size)")
+    parser.add_argument("--list", action="store_true", help="list matching runs instead of aggregating")
+    parser.add_argument("--mazes", action="store_true",
+                        help="summarize stored maze statistics by size and braid factor instead")
+    parser.add_argument("--braid", type=float, help="only include mazes with this braid factor (with --mazes)")
+    arguments = parser.parse_args()
+
+    history = RunHistory(arguments.db)
+
+    if arguments.mazes:
+        print("{:<8}{:>8}{:>8}".format("size", "braid", "mazes") +
+              "".join("{:>18}".format(field) for field in MAZE_FIELDS))
+        for row in history.summarize_mazes(arguments.size, arguments.braid):
+            print("{:<8}{:>8.2f}{:>8}".format(row["size"], row["braid"], row["count"]) +
+                  "".join("{:18.2f}".format(row[field]) for field in MAZE_FIELDS))
+        return
+    filters = {
+        "algorithm": arguments.algorithm,
+        "size": arguments.size,
+        "machine": arguments.machine,
+        "measure_only": True if arguments.measure_only else None,
+        "days": arguments.days
+    }
+
+    if arguments.list:
+        for run in history.query(**filters):
+            print("{:20}{:<8}{:<12}{:10.4f}s{:10.4f}s{:10}".format(
+                run["algorithm"], run["size"], str(run["seed"]), run["total"], run["compute"], run["expansions"]
+            ))
+        return
+
+    for group, value, count in history.aggregate(arguments.field, arguments.stat, arguments.group_by, **filters):
+        print("{:30}{:12.4f}   (n={})".format(" ".join(str(column) for column in group), value, count))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,540 @@
+import math
+import sys
+from time import perf_counter
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QMainWindow
+from interface.userinterface import MazeWidget
+from history import RunHistory
+from maze import MazeWalls
+from maze.export import export_png, export_text
+from maze.terrain import generate_costs
+from traversals import RunMetrics, Solution, SolutionCache, Trace
+
+# Short display names for run history entries
+HISTORY_NAMES = {
+    "generate_maze_dfs": "Generation",
+    "dfs": "DFS",
+    "bfs": "BFS",
+    "a_star": "A*",
+    "dijkstra": "Dijkstra",
+    "weighted_a_star": "Weighted A*",
+    "jps": "JPS"
+}
+
+# Solver function names for each algorithm selection
+SOLVER_FUNCTIONS = {
+    "Depth First Search": "dfs",
+    "Breadth First Search": "bfs",
+    "A*": "a_star",
+    "Dijkstra": "dijkstra",
+    "Weighted A*": "weighted_a_star",
+    "Jump Point Search": "jps"
+}
+
+class MainWindow(QMainWindow):
+    def __init__(self, size, profile_dir="profiles", profile=False, history_path="run_history.sqlite3"):
+        super().__init__()
+        self.setWindowTitle("Maze Solver")
+        self.setGeometry(600, 200, 824, 618)
+
+        # Initialize view (the maze is created on first generation, so the window appears sooner)
+        self.maze = None
+        self.maze_widget = MazeWidget(size)
+        self.setCentralWidget(self.maze_widget)
+
+        # Directory for output from opt-in profiling of generation and solving runs
+        self.profile_dir = profile_dir
+        self.maze_widget.set_profile_enabled(profile)
+
+        # Persistent store of generation and solving runs
+        self.history = RunHistory(history_path)
+
+        # Assign button functions
+        self.maze_widget.assign_generate_button(self.generate_maze)
+        self.maze_widget.assign_solve_button(self.solve_maze)
+        self.maze_widget.assign_exit_button(sys.exit)
+        self.maze_widget.assign_history_button(self.show_history)
+        self.maze_widget.assign_save_trace_button(self.save_trace)
+        self.maze_widget.assign_load_trace_button(self.load_trace)
+        self.maze_widget.assign_load_maze_button(self.load_maze)
+        self.maze_widget.assign_race_button(self.race_solvers)
+        self.maze_widget.assign_export_button(self.export_maze)
+
+        # Initialize generation flag
+        self.maze_generated = False
+
+        # Flag for running without observers
+        self.measure_only = False
+
+        # Trace of the most recent run
+        self.trace = None
+
+        # Recent solutions, replayed instead of solving an unchanged maze again
+        self.solution_cache = SolutionCache()
+
+        # Backend running generation and solving in a worker process (created on the first run, since it pulls in
+        # multiprocessing)
+        self.backend = None
+
+        # Function called with the result message of the running job, and the job's algorithm
+        self.job_finished = None
+        self.job_algorithm = None
+
+        # Timer for collecting progress and results from the backend, once per frame
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(1000 // self.maze_widget.refresh_rate)
+        self.poll_timer.timeout.connect(self.poll_backend)
+
+    def generate_maze(self):
+        self.maze_generated = False
+
+        # Stop replaying the previous run
+        self.maze_widget.stop_replay()
+
+        # Get the maze size from slider
+        size = self.maze_widget.get_size_value()
+
+        # Recreate the view if the size has changed
+        if self.maze is None or self.maze.length != size:
+            self.maze_widget.update_maze_size(size)
+            self.maze_widget.reset_view()
+
+        # The window only holds the maze's wall encoding (the worker builds the graph of nodes, which takes seconds for
+        # large mazes)
+        self.maze = MazeWalls(size)
+
+        # Get measure only value, which applies until the run completes
+        self.measure_only = self.maze_widget.get_measure_only()
+
+        # Get the braid factor of the new maze
+        self.maze.braid = self.maze_widget.get_braid_value()
+
+        # Hide the previous maze's terrain while generating
+        self.maze_widget.set_terrain(None)
+
+        # Start the trace from a blank maze
+        self.trace = Trace(size, "generate_maze_dfs")
+        self.trace.reset_colors("lightgray")
+        self.set_endpoint_colors()
+        self.trace.mark_start()
+
+        # Disable the buttons
+        self.disable_buttons()
+
+        # Generate the maze in the worker process, without observers when only measuring (the generator runs at full
+        # speed, and the recorded trace is replayed at the slow factor instead)
+        self.start_job("generate_maze_dfs", self.finish_generation)
+
+        # Replay the trace while it is being recorded
+        if not self.measure_only:
+            self.maze_widget.play_trace(self.trace)
+
+    def finish_generation(self, message):
+        # Copy the generated maze from shared memory
+        _, _, result, seed, stats = message
+        self.maze.set_walls(self.backend.shared.read())
+        self.maze.seed = seed
+
+        # Lay terrain over the new maze, seeded by the maze, and share it with the solvers
+        costs = generate_costs(self.maze.length, seed) if self.maze_widget.get_terrain_enabled() else None
+        self.maze.set_costs(costs)
+        self.backend.shared.write_costs(costs)
+        self.maze_widget.set_terrain(costs)
+
+        # Walls are not recorded during generation when only measuring, so trace them from the maze's wall encoding
+        if self.measure_only:
+            self.trace = self.create_maze_trace("generate_maze_dfs")
+        else:
+            # Reset tile colors
+            self.trace.reset_colors("lightgray")
+            self.set_endpoint_colors()
+
+        # Set maze generated flag
+        self.maze_generated = True
+
+        self.log_runtime(result)
+        self.log_maze_stats(stats)
+
+    def log_maze_stats(self, stats):
+        self.maze_widget.print_to_log("{:18}{:>8}".format("  Dead ends:", stats.dead_ends))
+        self.maze_widget.print_to_log("{:18}{:>8}".format("  Path length:", stats.solution_length))
+
+        self.history.record_maze(self.maze.length, self.maze.seed, stats, self.maze.braid)
+
+    def complete_trace(self):
+        self.trace.complete = True
+
+        # Show the final state of runs that were not replayed
+        if self.measure_only:
+            self.maze_widget.play_trace(self.trace, len(self.trace))
+
+    def create_maze_trace(self, algorithm):
+        """
+        Creates a trace that starts from the current maze, with all of its walls and its endpoint colors.
+        :param algorithm: The name of the function to be traced
+        :return: The trace
+        """
+        self.trace = Trace(self.maze.length, algorithm)
+        self.trace.open_walls(self.maze.walls)
+        self.trace.reset_colors("lightgray")
+        self.set_endpoint_colors()
+        self.trace.mark_start()
+
+        return self.trace
+
+    def save_trace(self):
+        if self.trace is None or not self.trace.complete:
+            return
+
+        path = self.maze_widget.get_save_trace_path()
+
+        if path:
+            self.trace.save(path)
+
+    def load_trace(self):
+        path = self.maze_widget.get_load_trace_path()
+
+        if not path:
+            return
+
+        try:
+            trace = Trace.load(path, self.maze_widget.max_dimension)
+        except ValueError as error:
+            self.maze_widget.print_to_log("Could not load trace:")
+            self.maze_widget.print_to_log("  " + str(error))
+
+            return
+
+        self.maze_widget.stop_replay()
+        self.trace = trace
+
+        # Rebuild the maze from the walls in the trace, so that it can be solved again
+        self.maze = MazeWalls(self.trace.length, self.trace.encode_walls())
+
+        # Traces do not record terrain, so loaded mazes have unit costs
+        self.get_backend().share(self.maze.length, self.maze.walls).write_costs(None)
+        self.maze_widget.set_terrain(None)
+
+        self.maze_generated = True
+        self.maze_widget.update_maze_size(self.trace.length)
+        self.maze_widget.play_trace(self.trace)
+
+    def load_maze(self):
+        path = self.maze_widget.get_load_maze_path()
+
+        if not path:
+            return
+
+        # Wall files hold one byte per cell of a square maze, as written by Maze.get_walls()
+        with open(path, "rb") as file:
+            walls = file.read()
+
+        length = math.isqrt(len(walls))
+
+        try:
+            if length < 2:
+                raise ValueError("Expected the wall encoding of a maze of at least 2x2 cells")
+
+            maze = MazeWalls(length, walls)
+        except ValueError as error:
+            self.maze_widget.print_to_log("Could not load maze:")
+            self.maze_widget.print_to_log("  " + str(error))
+
+            return
+
+        # Show the walls straight from the encoding (solving starts its own trace from the maze)
+        self.maze_widget.stop_replay()
+        self.maze_widget.set_terrain(None)
+        self.maze_widget.update_maze_size(length)
+        self.maze_widget.show_walls(walls)
+        self.trace = None
+
+        if length > self.maze_widget.max_dimension:
+            # Too large for the worker to build a graph of nodes for, so the maze is only shown
+            self.maze = None
+            self.maze_generated = False
+            self.maze_widget.print_to_log("Loaded {0}x{0} maze (view only)".format(length))
+
+            return
+
+        # Share the maze with the worker, so that it can be solved
+        self.maze = maze
+        self.get_backend().share(length, walls).write_costs(None)
+        self.maze_generated = True
+        self.maze_widget.print_to_log("Loaded {0}x{0} maze".format(length))
+
+    def export_maze(self):
+        # Check that the maze has been generated
+        if not self.maze_generated:
+            self.display_error()
+
+            return
+
+        path = self.maze_widget.get_export_path()
+
+        if not path:
+            return
+
+        # Export the explored cells and solution path of the last run, if it was a solve
+        colors = self.trace.get_cell_colors() if self.trace is not None else {}
+        explored = [cell for cell, color in colors.items() if color == "skyblue"]
+        solution = [cell for cell, color in colors.items() if color == "green"]
+
+        if path.lower().endswith(".txt"):
+            export_text(self.maze, path, explored, solution)
+        else:
+            export_png(self.maze, path, explored, solution)
+
+    def get_backend(self):
+        if self.backend is None:
+            from traversals import ProcessBackend
+            self.backend = ProcessBackend()
+
+        return self.backend
+
+    def start_job(self, algorithm, finished):
+        """
+        Starts generating or solving the maze in the worker process, recording its progress to the current trace.
+        :param algorithm: "generate_maze_dfs" or a solver function name
+        :param finished: The function called with the job's "done" message
+        """
+        backend = self.get_backend()
+        backend.share(self.maze.length)
+
+        # Only profile when profiling is enabled, so unprofiled runs have no added overhead
+        profile_dir = self.profile_dir if self.maze_widget.get_profile_enabled() else None
+
+        self.job_finished = finished
+        self.job_algorithm = algorithm
+        backend.submit(
+            algorithm, self.trace.colors, observe=not self.measure_only, profile_dir=profile_dir, braid=self.maze.braid
+        )
+        self.poll_timer.start()
+
+    def poll_backend(self):
+        """
+        Applies the messages received from the running job since the last frame.
+        """
+        messages = self.backend.poll()
+
+        # A worker that dies mid-job (killed, or out of memory) never sends its result, and anything it sent before
+        # dying has been collected above
+        if not messages and not self.backend.is_alive():
+            exit_code = self.backend.process.exitcode if self.backend.process is not None else None
+            self.backend.restart()
+            self.fail_job("Worker exited (code {})".format(exit_code))
+
+            return
+
+        for message in messages:
+            kind = message[0]
+
+            if kind == "progress":
+                colors, events = message[2:4]
+                self.trace.extend(colors, events)
+            elif kind == "done":
+                self.job_finished(message)
+                self.finish_job()
+            else:
+                lines = message[2].strip().splitlines()
+                self.fail_job(lines[-1] if lines else "Unknown error", message[2])
+
+    def finish_job(self):
+        self.poll_timer.stop()
+        self.job_finished = None
+        self.complete_trace()
+        self.enable_buttons()
+
+    def fail_job(self, text, details=None):
+        """
+        Ends the running job after it failed, logging the error and giving the controls back to the user.
+        :param text: A one-line description of the error
+        :param details: The full error (e.g. the worker's traceback), shown when hovering over the log line
+        """
+        name = HISTORY_NAMES.get(self.job_algorithm, self.job_algorithm)
+        self.maze_widget.print_to_log("{} failed:".format(name), details)
+        self.maze_widget.print_to_log("  " + text, details)
+
+        self.finish_job()
+
+    def closeEvent(self, event):
+        # Stop the worker process and free the shared maze
+        if self.backend is not None:
+            self.backend.stop()
+
+        super().closeEvent(event)
+
+    def log_runtime(self, function_output):
+        # Unpack function output
+        function_name, metrics = function_output
+
+        log_process = None
+
+        # Set up log information for the relevant function
+        match function_name:
+            case "generate_maze_dfs":
+                log_process = "Maze Generation:"
+            case "dfs":
+                log_process = "DFS:"
+            case "bfs":
+                log_process = "BFS:"
+            case "a_star":
+                log_process = "A*:"
+            case "dijkstra":
+                log_process = "Dijkstra:"
+            case "weighted_a_star":
+                log_process = "Weighted A*:"
+            case "jps":
+                log_process = "JPS:"
+
+        # Format log output, leading with the algorithm's compute time
+        if metrics.cached:
+            log_output = ["{:18}{:8.4f}s".format(log_process, metrics.total), "  (cached solution)"]
+        else:
+            log_output = [
+                "{:18}{:8.4f}s".format(log_process, metrics.compute),
+                "{:18}{:8.4f}s".format("  Recording:", metrics.render)
+            ]
+
+        if metrics.cache_hits or metrics.cache_misses:
+            log_output.append("{:18}{:>3} / {}".format("  Cache hit/miss:", metrics.cache_hits, metrics.cache_misses))
+
+        if log_process:
+            for line in log_output:
+                self.maze_widget.print_to_log(line)
+
+        # Cached runs did not run the algorithm, so they are left out of the history
+        if metrics.cached:
+            return
+
+        # Append the run to the history store
+        self.history.record(function_name, self.maze.length, self.maze.seed, metrics, measure_only=self.measure_only)
+
+    def show_history(self):
+        # Print median compute time by algorithm and size over the last week, with observed and measure-only runs apart,
+        # since recording a run's trace slows the algorithm down
+        self.maze_widget.print_to_log("Median compute (7 days):")
+
+        section = None
+        group_by = ("measure_only", "algorithm", "size")
+
+        for (measure_only, algorithm, size), value, count in self.history.aggregate(group_by=group_by, days=7):
+            if measure_only != section:
+                section = measure_only
+                self.maze_widget.print_to_log("Measure only:" if measure_only else "Observed:")
+
+            name = HISTORY_NAMES.get(algorithm, algorithm)
+            self.maze_widget.print_to_log("  {:12}{:>4}{:8.4f}s".format(name, size, value))
+
+    def disable_buttons(self):
+        self.maze_widget.disable_buttons()
+
+    def enable_buttons(self):
+        self.maze_widget.enable_buttons()
+
+    def set_endpoint_colors(self):
+        (start_x, start_y), (end_x, end_y) = self.maze.get_endpoints()
+        self.set_tile_color(start_x, start_y, "red")
+        self.set_tile_color(end_x, end_y, "blue")
+
+    def solve_maze(self):
+        # Check that the maze has been generated
+        if not self.maze_generated:
+            self.display_error()
+
+            return
+
+        # Get new measure only value
+        self.measure_only = self.maze_widget.get_measure_only()
+
+        function_name = SOLVER_FUNCTIONS[self.maze_widget.get_algorithm()]
+
+        # Stop replaying the previous run
+        self.maze_widget.stop_replay()
+
+        # Replay the cached solution if the maze has already been solved with this algorithm (measured runs always
+        # run the algorithm)
+        if not self.measure_only:
+            start_time = perf_counter()
+            solution = self.solution_cache.get(self.maze, function_name)
+
+            if solution is not None:
+                metrics = RunMetrics()
+                metrics.total = perf_counter() - start_time
+                metrics.cached = True
+                self.log_runtime((function_name, self.count_cache(metrics)))
+
+                self.trace = solution.trace
+                self.maze_widget.play_trace(self.trace)
+
+                return
+
+        # Start a trace from the generated maze
+        self.create_maze_trace(function_name)
+
+        # Disable buttons
+        self.disable_buttons()
+
+        # Solve the maze in the worker process, and print the runtime once it completes
+        self.start_job(function_name, self.finish_solve)
+
+        # Replay the trace while it is being recorded
+        if not self.measure_only:
+            self.maze_widget.play_trace(self.trace)
+
+    def finish_solve(self, message):
+        function_name, metrics = message[2]
+
+        # Only runs with a recorded trace can be replayed from the cache
+        if not self.measure_only:
+            self.solution_cache.put(self.maze, function_name, Solution(self.trace, metrics))
+            self.count_cache(metrics)
+
+        self.log_runtime((function_name, metrics))
+
+    def count_cache(self, metrics):
+        metrics.cache_hits = self.solution_cache.hits
+        metrics.cache_misses = self.solution_cache.misses
+
+        return metrics
+
+    def race_solvers(self):
+        # Check that the maze has been generated
+        if not self.maze_generated:
+            self.display_error()
+
+            return
+
+        algorithms = self.maze_widget.get_race_algorithms()
+
+        if not algorithms:
+            return
+
+        # Race support pulls in multiprocessing, so it is imported on first use
+        from interface.racewindow import RaceWindow
+        from traversals import Race
+
+        # Race runs always record their traces
+        self.measure_only = False
+
+        # Start one trace of the maze per solver, keeping the main trace for saving
+        main_trace = self.trace
+        traces = {algorithm: self.create_maze_trace(algorithm) for algorithm in algorithms}
+        self.trace = main_trace
+
+        # Workers register the colors already used by the traces first, so color indices match
+        race = Race(self.backend.shared, algorithms, traces[algorithms[0]].colors)
+
+        # Keep the maze unchanged until the race window is closed
+        self.disable_buttons()
+
+        race_window = RaceWindow(race, traces, self.maze_widget.refresh_rate, self)
+        race_window.solverFinished.connect(self.log_runtime)
+        race_window.closed.connect(self.enable_buttons)
+        race_window.show()
+
+    def display_error(self):
+        self.maze_widget.display_solve_error()
+
+    def set_tile_color(self, x, y, color):
+        self.trace.set_color(x, y, color)
@@ -0,0 +1,396 @@
+import math
+from PyQt6.QtCore import QRectF, Qt
+from PyQt6.QtGui import QColor, QImage, QPainter
+from PyQt6.QtWidgets import QWidget
+from maze.Maze import EAST, SOUTH
+
+# Palette index reserved for walls
+WALL = 0
+
+# Colors registered up front, so the common tile colors have stable palette indices
+PALETTE = ["lightgray", "red", "blue", "green", "gold", "skyblue"]
+
+# Heatmap colors for unvisited cells of weighted terrain, from the cheapest costly cells to the costliest (cells with
+# the lowest cost keep the plain unvisited color)
+HEATMAP = ["#f3e3b3", "#f1cf8a", "#eeb866", "#e99b4b", "#de7b3c", "#cc5a33", "#b33b2d", "#932426"]
+
+
+class MazeCanvas(QWidget):
+    """
+    Zoomable, pannable view of a maze. Cell colors and wall gaps are kept as palette indices in byte arrays, and each
+    repaint renders only the cells under the repainted region into a palette-indexed QImage, so redraw cost follows
+    the size of the view rather than the size of the maze. When zoomed in, cells are drawn as pixel blocks with one
+    pixel line per wall; when zoomed out past one pixel per cell, cells are downsampled and walls are left out. All
+    methods must be called from the UI thread.
+    """
+
+    def __init__(self, dimension, view_size, parent=None):
+        super().__init__(parent)
+        self.view_size = view_size
+        self.setFixedSize(view_size, view_size)
+
+        # Largest zoom (in screen pixels per cell)
+        self.max_zoom = 40
+
+        # Palette of colors, with palette indices for each color name
+        self.color_table = [QColor("gray").rgb()]
+        self.color_indices = {}
+        for color in PALETTE:
+            self.get_color_index(color)
+
+        # Start point of a drag, for panning
+        self.drag_start = None
+        self.drag_offset = None
+
+        self.reset(dimension)
+
+    def get_color_index(self, color):
+        """
+        Gets the palette index for a color name, adding the color to the palette if necessary.
+        :param color: The color name
+        :return: The palette index of the color
+        """
+        index = self.color_indices.get(color)
+
+        if index is None:
+            index = len(self.color_table)
+            self.color_table.append(QColor(color).rgb())
+            self.color_indices[color] = index
+
+        return index
+
+    def reset(self, dimension):
+        """
+        Resets the view for a maze of the given size, with all walls closed and the whole maze in view.
+        :param dimension: The length of the maze
+        """
+        self.dimension = dimension
+
+        # Palette index of each cell, in row-major order
+        self.colors = bytearray([self.get_color_index("lightgray")]) * (dimension * dimension)
+
+        # Palette index of the gap to the east and south of each cell (WALL when the wall is closed)
+        self.east = bytearray(dimension * dimension)
+        self.south = bytearray(dimension * dimension)
+
+        # Palette index of each unvisited cell, shading the maze's terrain (None for mazes without terrain)
+        self.terrain = None
+
+        self.fit()
+
+    def set_terrain(self, costs):
+        """
+        Sets the terrain shown under unvisited cells as a heatmap of their costs. The heatmap is drawn the next time the
+        unvisited color is reset.
+        :param costs: The cost of entering each cell as bytes, in row-major order, or None for no terrain
+        """
+        if costs is None:
+            self.terrain = None
+            return
+
+        low = min(costs)
+        high = max(costs)
+        table = bytearray([self.get_color_index("lightgray")]) * 256
+
+        # Spread the costs above the lowest over the heatmap colors
+        for cost in range(low + 1, high + 1):
+            step = (cost - low - 1) * len(HEATMAP) // (high - low)
+            table[cost] = self.get_color_index(HEATMAP[step])
+
+        self.terrain = bytes(costs).translate(table)
+
+    def fit(self):
+        """
+        Zooms out to show the whole maze.
+        """
+        self.zoom = self.view_size / self.dimension
+        self.min_zoom = min(self.zoom, self.max_zoom)
+
+        # Cell coordinates at the top-left corner of the view
+        self.offset_x = 0.0
+        self.offset_y = 0.0
+
+        self.update()
+
+    def redraw(self):
+        self.update()
+
+    def __update_cell_region(self, x, y, width=1, height=1):
+        """
+        Schedules a repaint of the view region covering a block of cells and their walls.
+        """
+        region = QRectF((x - self.offset_x) * self.zoom, (y - self.offset_y) * self.zoom,
+                        width * self.zoom, height * self.zoom)
+        self.update(region.toAlignedRect().adjusted(-1, -1, 1, 1))
+
+    def set_cell_color(self, x, y, color):
+        self.__paint_cell(x, y, color)
+        self.__update_cell_region(x, y)
+
+    def __paint_cell(self, x, y, color):
+        index = self.get_color_index(color)
+        n = self.dimension
+        i = y * n + x
+
+        self.colors[i] = index
+
+        # Open walls take the color of the most recently colored cell next to them
+        if self.east[i] != WALL:
+            self.east[i] = index
+        if x > 0 and self.east[i - 1] != WALL:
+            self.east[i - 1] = index
+        if self.south[i] != WALL:
+            self.south[i] = index
+        if y > 0 and self.south[i - n] != WALL:
+            self.south[i - n] = index
+
+    def open_wall(self, x1, y1, x2, y2):
+        if not self.__paint_wall(x1, y1, x2, y2):
+            return False
+
+        self.__update_cell_region(min(x1, x2), min(y1, y2), 2, 2)
+
+        return True
+
+    def __paint_wall(self, x1, y1, x2, y2):
+        # Order the cells so that the second cell is east or south of the first
+        if (x2, y2) < (x1, y1):
+            x1, y1, x2, y2 = x2, y2, x1, y1
+
+        i = y1 * self.dimension + x1
+
+        if x2 == x1 + 1 and y2 == y1:
+            self.east[i] = self.colors[i]
+        elif x2 == x1 and y2 == y1 + 1:
+            self.south[i] = self.colors[i]
+        else:
+            return False
+
+        return True
+
+    def apply_updates(self, walls, colors):
+        """
+        Applies a batch of wall and color changes, repainting the region covering all of them once.
+        :param walls: A list of (x1, y1, x2, y2) walls to open
+        :param colors: A dictionary of tile colors keyed by (x, y)
+        """
+        if not walls and not colors:
+            return
+
+        min_x = min_y = self.dimension
+        max_x = max_y = 0
+
+        # Open walls first, so that the new colors spread into the opened gaps
+        for x1, y1, x2, y2 in walls:
+            self.__paint_wall(x1, y1, x2, y2)
+            min_x, min_y = min(min_x, x1, x2), min(min_y, y1, y2)
+            max_x, max_y = max(max_x, x1, x2), max(max_y, y1, y2)
+
+        for (x, y), color in colors.items():
+            self.__paint_cell(x, y, color)
+            min_x, min_y = min(min_x, x), min(min_y, y)
+            max_x, max_y = max(max_x, x), max(max_y, y)
+
+        self.__update_cell_region(min_x, min_y, max_x - min_x + 1, max_y - min_y + 1)
+
+    def set_walls(self, walls):
+        """
+        Opens every wall given by a compact wall encoding at once, with translation tables rather than per-wall calls,
+        so that mazes too large to trace can still be shown. Cells keep their colors, and the new gaps are unvisited.
+        :param walls: The encoded edges of a maze of the view's size, as returned by Maze.get_walls()
+        """
+        index = self.get_color_index("lightgray")
+
+        self.east = bytearray(walls).translate(bytes(index if cell & EAST else WALL for cell in range(256)))
+        self.south = bytearray(walls).translate(bytes(index if cell & SOUTH else WALL for cell in range(256)))
+
+        self.update()
+
+    def reset_walls(self):
+        self.east = bytearray(len(self.east))
+        self.south = bytearray(len(self.south))
+        self.update()
+
+    def reset_colors(self, color):
+        # Unvisited cells show the terrain, if any
+        if color == "lightgray" and self.terrain is not None:
+            self.__reset_terrain()
+            return
+
+        index = self.get_color_index(color)
+        self.colors = bytearray([index]) * len(self.colors)
+
+        # Recolor open walls, leaving closed walls alone
+        gaps = bytes([WALL]) + bytes([index]) * 255
+        self.east = self.east.translate(gaps)
+        self.south = self.south.translate(gaps)
+
+        self.update()
+
+    def __reset_terrain(self):
+        self.colors = bytearray(self.terrain)
+        size = len(self.colors)
+
+        # Open walls take the color of the cell to their west or north, selected for every gap at once by masking the
+        # cell colors with the open gaps as big integers (one byte per gap)
+        open_gaps = bytes([0]) + bytes([0xFF]) * 255
+        colors = int.from_bytes(self.colors, "little")
+
+        for gaps in (self.east, self.south):
+            mask = int.from_bytes(gaps.translate(open_gaps), "little")
+            gaps[:] = (colors & mask).to_bytes(size, "little")
+
+        self.update()
+
+    def __create_image(self, width, height):
+        """
+        Creates a palette-indexed image, along with a writable view of its pixel data.
+        """
+        image = QImage(width, height, QImage.Format.Format_Indexed8)
+        image.setColorTable(self.color_table)
+
+        bits = image.bits()
+        bits.setsize(image.sizeInBytes())
+
+        return image, memoryview(bits), image.bytesPerLine()
+
+    def render_detail(self, x0, y0, x1, y1, pitch):
+        """
+        Renders a block of cells with pitch - 1 pixels per cell and one pixel line per wall.
+        :return: The rendered image
+        """
+        n = self.dimension
+        cell_size = pitch - 1
+        width = (x1 - x0) * pitch + 1
+        height = (y1 - y0) * pitch + 1
+        image, pixels, bytes_per_line = self.__create_image(width, height)
+
+        def write_row(image_row, data):
+            start = image_row * bytes_per_line
+            pixels[start:start + width] = data
+
+        # Walls above the block
+        wall_row = bytearray(width)
+        if y0 > 0:
+            for k in range(cell_size):
+                wall_row[1 + k::pitch] = self.south[(y0 - 1) * n + x0:(y0 - 1) * n + x1]
+        write_row(0, wall_row)
+
+        for y in range(y0, y1):
+            base = y * n
+            top = (y - y0) * pitch
+
+            # Row through the cells, with the gaps between horizontally adjacent cells
+            row = bytearray(width)
+            for k in range(cell_size):
+                row[1 + k::pitch] = self.colors[base + x0:base + x1]
+            row[pitch:width - 1:pitch] = self.east[base + x0:base + x1 - 1]
+            row[0] = self.east[base + x0 - 1] if x0 > 0 else WALL
+            row[width - 1] = self.east[base + x1 - 1]
+
+            for r in range(cell_size):
+                write_row(top + 1 + r, row)
+
+            # Row below the cells, with the gaps between vertically adjacent cells
+            wall_row = bytearray(width)
+            for k in range(cell_size):
+                wall_row[1 + k::pitch] = self.south[base + x0:base + x1]
+
+            write_row(top + pitch, wall_row)
+
+        return image
+
+    def render_overview(self, x0, y0, x1, y1, step):
+        """
+        Renders a block of cells downsampled to one pixel per step x step cells, without walls.
+        :return: The rendered image
+        """
+        n = self.dimension
+        width = math.ceil((x1 - x0) / step)
+        height = math.ceil((y1 - y0) / step)
+        image, pixels, bytes_per_line = self.__create_image(width, height)
+
+        for row, y in enumerate(range(y0, y1, step)):
+            start = row * bytes_per_line
+            pixels[start:start + width] = self.colors[y * n + x0:y * n + x1:step]
+
+        return image
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        exposed = event.rect()
+        painter.fillRect(exposed, QColor("gray"))
+
+        n = self.dimension
+
+        # Range of cells under the region being repainted
+        x0 = max(0, math.floor(exposed.left() / self.zoom + self.offset_x))
+        y0 = max(0, math.floor(exposed.top() / self.zoom + self.offset_y))
+        x1 = min(n, math.ceil((exposed.right() + 1) / self.zoom + self.offset_x))
+        y1 = min(n, math.ceil((exposed.bottom() + 1) / self.zoom + self.offset_y))
+
+        if x0 < x1 and y0 < y1:
+            if self.zoom >= 1:
+                pitch = max(2, int(self.zoom))
+                image = self.render_detail(x0, y0, x1, y1, pitch)
+                pixel_size = self.zoom / pitch
+            else:
+                step = math.ceil(1 / self.zoom)
+                image = self.render_overview(x0, y0, x1, y1, step)
+                pixel_size = self.zoom * step
+
+            target = QRectF((x0 - self.offset_x) * self.zoom, (y0 - self.offset_y) * self.zoom,
+                            image.width() * pixel_size, image.height() * pixel_size)
+
+            # Keep downsampled blocks at the edge of the maze from spilling past it
+            painter.setClipRect(QRectF(-self.offset_x * self.zoom, -self.offset_y * self.zoom,
+                                       n * self.zoom, n * self.zoom))
+            painter.drawImage(target, image)
+
+        painter.end()
+
+    def zoom_at(self, x, y, factor):
+        """
+        Zooms the view by a factor, keeping the point under the given view position fixed.
+        """
+        cell_x = x / self.zoom + self.offset_x
+        cell_y = y / self.zoom + self.offset_y
+
+        self.zoom = min(max(self.zoom * factor, self.min_zoom), self.max_zoom)
+        self.offset_x = cell_x - x / self.zoom
+        self.offset_y = cell_y - y / self.zoom
+
+        self.__clamp_offset()
+        self.update()
+
+    def __clamp_offset(self):
+        # Keep the view over the maze
+        limit = max(0.0, self.dimension - self.view_size / self.zoom)
+        self.offset_x = min(max(self.offset_x, 0.0), limit)
+        self.offset_y = min(max(self.offset_y, 0.0), limit)
+
+    def wheelEvent(self, event):
+        position = event.position()
+        self.zoom_at(position.x(), position.y(), 1.25 ** (event.angleDelta().y() / 120))
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self.drag_start = event.position()
+            self.drag_offset = (self.offset_x, self.offset_y)
+
+    def mouseMoveEvent(self, event):
+        if self.drag_start is None:
+            return
+
+        # Pan so that the point under the cursor follows the cursor
+        self.offset_x = self.drag_offset[0] - (event.position().x() - self.drag_start.x()) / self.zoom
+        self.offset_y = self.drag_offset[1] - (event.position().y() - self.drag_start.y()) / self.zoom
+
+        self.__clamp_offset()
+        self.update()
+
+    def mouseReleaseEvent(self, event):
+        self.drag_start = None
+
+    def mouseDoubleClickEvent(self, event):
+        self.fit()
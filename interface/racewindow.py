@@ -0,0 +1,188 @@
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QFont
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QGridLayout, QLabel, QTableWidget, QTableWidgetItem, \
+    QHeaderView
+from interface.mazecanvas import MazeCanvas
+from interface.traceplayer import TracePlayer
+
+
+class RaceWindow(QWidget):
+    """
+    Split view of a race between solvers, with one maze view per solver and a table of each solver's expansions and
+    elapsed time. Progress from the race's worker processes is polled once per frame and appended to each solver's
+    trace, which is replayed onto its view as it arrives.
+    """
+
+    # Emitted with each solver's (function name, metrics) result when it finishes
+    solverFinished = pyqtSignal(object)
+
+    # Emitted when the window is closed (not when it is destroyed along with its parent, whose widgets may already be
+    # gone)
+    closed = pyqtSignal()
+
+    # Display names for each solver function name
+    NAMES = {
+        "dfs": "DFS",
+        "bfs": "BFS",
+        "a_star": "A*",
+        "jps": "JPS"
+    }
+
+    def __init__(self, race, traces, refresh_rate=60, parent=None):
+        """
+        :param race: The race to be shown (started by the window)
+        :param traces: A dictionary of traces of the maze to be solved, keyed by solver function name
+        :param refresh_rate: Rate at which progress is polled and drawn (in frames per second)
+        """
+        super().__init__(parent, Qt.WindowType.Window)
+        self.setWindowTitle("Solver Race")
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+
+        self.race = race
+        self.traces = traces
+        self.font = QFont("Cascadia Code", 10)
+
+        # Split the views into at most two columns
+        self.view_size = 380 if len(traces) > 1 else 780
+        columns = min(2, len(traces))
+
+        self.players = {}
+        self.rows = {}
+
+        # Labels under each view for errors from the solver's worker
+        self.error_labels = {}
+        self.running = set(traces)
+
+        self.view_layout = QGridLayout()
+
+        self.table = QTableWidget(len(traces), 4, self)
+        self.table.setFont(self.font)
+        self.table.setHorizontalHeaderLabels(["Solver", "Expansions", "Elapsed", "Status"])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setSelectionMode(QTableWidget.SelectionMode.NoSelection)
+
+        for i, (algorithm, trace) in enumerate(traces.items()):
+            view = MazeCanvas(trace.length, self.view_size, self)
+
+            label = QLabel(self.NAMES.get(algorithm, algorithm), self)
+            label.setFont(self.font)
+            label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+            error_label = QLabel(self)
+            error_label.setFont(self.font)
+            error_label.setWordWrap(True)
+            error_label.setMaximumWidth(self.view_size)
+            error_label.setStyleSheet("color: #E74C3C;")
+            error_label.hide()
+            self.error_labels[algorithm] = error_label
+
+            layout = QVBoxLayout()
+            layout.addWidget(label)
+            layout.addWidget(view)
+            layout.addWidget(error_label)
+            self.view_layout.addLayout(layout, i // columns, i % columns)
+
+            # Replay each solver's events as soon as they arrive
+            player = TracePlayer(view, refresh_rate, self)
+            player.play(trace)
+            self.players[algorithm] = player
+
+            self.rows[algorithm] = i
+            self.set_row(algorithm, 0, 0.0, "Running")
+
+        self.table.setFixedHeight(self.table.verticalHeader().length() + self.table.horizontalHeader().height() + 4)
+
+        self.top_level_layout = QVBoxLayout()
+        self.top_level_layout.addLayout(self.view_layout)
+        self.top_level_layout.addWidget(self.table)
+        self.setLayout(self.top_level_layout)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(1000 // refresh_rate)
+        self.timer.timeout.connect(self.poll)
+
+        self.race.start()
+        self.timer.start()
+
+    def set_row(self, algorithm, expansions, elapsed, status):
+        row = self.rows[algorithm]
+        values = [self.NAMES.get(algorithm, algorithm), str(expansions), "{:.4f}s".format(elapsed), status]
+
+        for column, value in enumerate(values):
+            self.table.setItem(row, column, QTableWidgetItem(value))
+
+    def poll(self):
+        """
+        Applies the messages received from the race since the last frame, and fails solvers whose workers died.
+        """
+        # Workers that had exited before their messages are collected have sent everything they will send
+        exited = self.race.get_exited()
+
+        for message in self.race.poll():
+            kind, algorithm = message[:2]
+            trace = self.traces[algorithm]
+
+            if kind == "progress":
+                colors, events, expansions, elapsed = message[2:]
+
+                # Workers share the parent's color indices, and register new colors in the same order
+                trace.extend(colors, events)
+                self.set_row(algorithm, expansions, elapsed, "Running")
+            elif kind == "done":
+                result = message[2]
+                metrics = result[1]
+                trace.complete = True
+                self.set_row(algorithm, metrics.expansions, metrics.compute, "Done")
+                self.finish(algorithm)
+                self.solverFinished.emit(result)
+            elif kind == "error":
+                self.fail(algorithm, message[2], "Error")
+
+        # Solvers still running after all of their messages were applied died without a result
+        for algorithm in sorted(self.running & exited.keys()):
+            self.fail(algorithm, "Worker exited (code {})".format(exited[algorithm]), "Failed")
+
+    def fail(self, algorithm, details, status):
+        """
+        Ends a solver's lane after its run failed.
+        :param algorithm: The solver function name
+        :param details: The error shown under the solver's view (e.g. the worker's traceback)
+        :param status: The status shown in the solver's row of the table
+        """
+        self.traces[algorithm].complete = True
+        self.show_error(algorithm, details)
+        self.table.setItem(self.rows[algorithm], 3, QTableWidgetItem(status))
+        self.finish(algorithm)
+
+    def show_error(self, algorithm, details):
+        """
+        Shows an error under a solver's view, with the last line of the worker's traceback as the message and the full
+        traceback as its tooltip.
+        :param algorithm: The solver function name
+        :param details: The formatted traceback from the worker
+        """
+        lines = details.strip().splitlines()
+        label = self.error_labels[algorithm]
+
+        label.setText(lines[-1] if lines else "Unknown error")
+        label.setToolTip(details)
+        label.show()
+
+    def finish(self, algorithm):
+        self.running.discard(algorithm)
+
+        if not self.running:
+            self.timer.stop()
+
+    def closeEvent(self, event):
+        # Stop any solvers still running
+        self.timer.stop()
+        self.race.stop()
+
+        for player in self.players.values():
+            player.stop()
+
+        super().closeEvent(event)
+        self.closed.emit()
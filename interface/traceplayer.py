@@ -0,0 +1,159 @@
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from traversals.trace import COLOR, WALL, RESET
+
+
+class TracePlayer(QObject):
+    """
+    Replays a recorded Trace onto a MazeCanvas from the UI thread, applying the events due in each frame as one batch.
+    A trace can be played while it is still being recorded, and can be paused and seeked to any event.
+    """
+
+    # Emitted with the current event position and the number of recorded events
+    positionChanged = pyqtSignal(int, int)
+
+    # Emitted with True when playback starts and False when it stops
+    playingChanged = pyqtSignal(bool)
+
+    def __init__(self, canvas, refresh_rate, parent=None):
+        super().__init__(parent)
+        self.canvas = canvas
+        self.trace = None
+        self.position = 0
+        self.playing = False
+
+        # Delay between events (in seconds), where 0 plays everything recorded so far in one frame
+        self.seconds_per_event = 0.0
+
+        # Fraction of an event carried over between frames at slow speeds
+        self.budget = 0.0
+
+        self.frame_time = 1 / refresh_rate
+        self.timer = QTimer(self)
+        self.timer.setInterval(1000 // refresh_rate)
+        self.timer.timeout.connect(self.advance)
+
+    def play(self, trace, position=None):
+        """
+        Starts playing a trace, drawing its state up to the given position immediately.
+        :param trace: The trace to be played
+        :param position: The event to start from (defaults to the start of the traced run)
+        """
+        self.trace = trace
+        self.budget = 0.0
+
+        self.__reset_canvas()
+        self.seek(trace.start if position is None else position)
+        self.resume()
+
+    def resume(self):
+        if self.trace is None:
+            return
+
+        self.playing = True
+        self.timer.start()
+        self.playingChanged.emit(True)
+
+    def pause(self):
+        self.playing = False
+        self.timer.stop()
+        self.playingChanged.emit(False)
+
+    def toggle(self):
+        if self.playing:
+            self.pause()
+        else:
+            # Restart from the beginning of the run if playback already reached the end
+            if self.trace is not None and self.trace.complete and self.position >= len(self.trace):
+                self.seek(self.trace.start)
+
+            self.resume()
+
+    def stop(self):
+        self.pause()
+        self.trace = None
+
+    def set_speed(self, seconds_per_event):
+        self.seconds_per_event = seconds_per_event
+
+    def seek(self, position):
+        """
+        Draws the state of the trace at an event position.
+        :param position: The number of events to have applied
+        """
+        if self.trace is None:
+            return
+
+        position = max(0, min(position, len(self.trace)))
+
+        # Seeking backward redraws from a blank maze
+        if position < self.position:
+            self.__reset_canvas()
+
+        self.__apply(self.position, position)
+        self.position = position
+        self.positionChanged.emit(self.position, len(self.trace))
+
+    def __reset_canvas(self):
+        if self.canvas.dimension != self.trace.length:
+            self.canvas.reset(self.trace.length)
+        else:
+            self.canvas.reset_walls()
+            self.canvas.reset_colors("lightgray")
+
+        self.position = 0
+
+    def advance(self):
+        """
+        Applies the events due in the current frame.
+        """
+        recorded = len(self.trace)
+
+        if self.seconds_per_event > 0:
+            self.budget += self.frame_time / self.seconds_per_event
+            end = min(recorded, self.position + int(self.budget))
+            self.budget -= int(self.budget)
+        else:
+            end = recorded
+
+        # Do not build up a burst of events while waiting for the recording
+        if end == recorded:
+            self.budget = 0.0
+
+        if end > self.position:
+            self.__apply(self.position, end)
+            self.position = end
+            self.positionChanged.emit(self.position, recorded)
+
+        if self.trace.complete and self.position >= recorded:
+            self.pause()
+
+    def __apply(self, start, end):
+        """
+        Applies a range of trace events to the canvas, coalescing repeated color changes to the same tile.
+        """
+        trace = self.trace
+        walls = []
+        colors = {}
+
+        # Traces that start from a whole maze draw it from its wall encoding at once, rather than wall by wall
+        if start == 0 and trace.walls is not None and end >= trace.wall_events:
+            self.canvas.set_walls(trace.walls)
+            start = trace.wall_events
+
+        for i in range(start, end):
+            kind, a, b = trace.get_event(i)
+
+            if kind == COLOR:
+                tile = trace.get_coordinates(a)
+                colors.pop(tile, None)
+                colors[tile] = trace.colors[b]
+            elif kind == WALL:
+                walls.append(trace.get_coordinates(a) + trace.get_coordinates(b))
+            elif kind == RESET:
+                # Draw earlier changes before resetting colors
+                self.canvas.apply_updates(walls, colors)
+                walls = []
+                colors = {}
+                self.canvas.reset_colors(trace.colors[a])
+
+        self.canvas.apply_updates(walls, colors)
@@ -1,27 +1,28 @@
-from PyQt6 import QtCore
-from PyQt6.QtCore import Qt, QRectF, pyqtSignal, QObject
-from PyQt6.QtGui import QBrush, QColor, QFont
-from PyQt6.QtWidgets import QGraphicsItem, QGraphicsScene, QGraphicsView, QWidget, QVBoxLayout, QListWidget, \
-    QHBoxLayout, QPushButton, QSpacerItem, QSizePolicy, QComboBox, QSlider, QLabel, QErrorMessage
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QFont
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QListWidget, QListWidgetItem, QHBoxLayout, QPushButton, QSpacerItem, \
+    QSizePolicy, QComboBox, QSlider, QLabel, QErrorMessage, QCheckBox, QFileDialog, QSpinBox
+from interface.mazecanvas import MazeCanvas
+from interface.traceplayer import TracePlayer
 
 
 class MazeWidget(QWidget):
     def __init__(self, size):
         super().__init__()
         self.dimension = size
-        self.max_dimension = 50
-        self.tile_size = 15
-        self.view_size = self.tile_size * (self.max_dimension + 2)
-        self.tiles = {}
+        self.max_dimension = 1000
+        self.view_size = 780
         self.initial_slow_value = 50
 
+        # Rate at which replayed tile changes are pushed to the view (in frames per second)
+        self.refresh_rate = 60
+
         self.font = QFont("Cascadia Code", 10)
 
-        self.scene = QGraphicsScene()
-        self.view = QGraphicsView(self.scene, self)
-        self.view.setMaximumSize(self.view_size, self.view_size)
-        self.view.setMinimumSize(self.view_size, self.view_size)
-        self.view.setBackgroundBrush(QBrush(QColor("gray")))
+        self.view = MazeCanvas(self.dimension, self.view_size, self)
+
+        # Runs are recorded as traces and replayed onto the view in batches once per frame
+        self.player = TracePlayer(self.view, self.refresh_rate, self)
 
         self.generate_button = QPushButton("Generate Maze", self)
         self.generate_button.setFont(self.font)
@@ -33,8 +34,11 @@ class MazeWidget(QWidget):
         self.size_slider.setMaximum(self.max_dimension)
         self.size_slider.setTickInterval(1)
 
-        self.size_value = QLabel(self)
+        # Entry field for exact sizes, which the slider is too coarse to pick at large sizes
+        self.size_value = QSpinBox(self)
         self.size_value.setFont(self.font)
+        self.size_value.setRange(self.size_slider.minimum(), self.max_dimension)
+        self.size_value.valueChanged.connect(self.size_slider.setValue)
 
         self.size_label = QLabel("Maze Size:", self)
         self.size_label.setFont(self.font)
@@ -45,7 +49,10 @@ class MazeWidget(QWidget):
         self.algorithm_selection.addItems([
             "Depth First Search",
             "Breadth First Search",
-            "A*"
+            "A*",
+            "Dijkstra",
+            "Weighted A*",
+            "Jump Point Search"
         ])
 
         self.size_slider_layout = QHBoxLayout()
@@ -57,6 +64,27 @@ class MazeWidget(QWidget):
         self.selection_layout.addLayout(self.size_slider_layout, stretch=1)
         self.selection_layout.addWidget(self.algorithm_selection, stretch=1)
 
+        # Percentage of dead ends removed from generated mazes, adding loops
+        self.braid_slider = QSlider(Qt.Orientation.Horizontal, self)
+        self.braid_slider.setMinimum(0)
+        self.braid_slider.setMaximum(100)
+        self.braid_slider.setTickInterval(1)
+        self.braid_slider.setToolTip("Share of dead ends to remove from generated mazes (0% makes a perfect maze)")
+
+        self.braid_value = QLabel(self)
+        self.braid_value.setFont(self.font)
+        self.braid_value.setMinimumWidth(40)
+        self.braid_value.setAlignment((Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignCenter))
+
+        self.braid_label = QLabel("Braid Factor:", self)
+        self.braid_label.setFont(self.font)
+        self.braid_slider.valueChanged.connect(self.update_braid_label)
+
+        self.braid_layout = QHBoxLayout()
+        self.braid_layout.addWidget(self.braid_label)
+        self.braid_layout.addWidget(self.braid_value)
+        self.braid_layout.addWidget(self.braid_slider)
+
         self.button_layout = QHBoxLayout()
         self.button_layout.addWidget(self.generate_button, stretch=1)
         self.button_layout.addWidget(self.solve_button, stretch=1)
@@ -88,6 +116,77 @@ class MazeWidget(QWidget):
         self.slow_layout.addWidget(self.slow_value)
         self.slow_layout.addWidget(self.slow_slider)
 
+        self.play_button = QPushButton("Pause", self)
+        self.play_button.setFont(self.font)
+        self.play_button.setMinimumWidth(70)
+        self.play_button.clicked.connect(self.player.toggle)
+        self.player.playingChanged.connect(self.update_play_button)
+
+        self.replay_slider = QSlider(Qt.Orientation.Horizontal, self)
+        self.replay_slider.setMinimum(0)
+        self.replay_slider.setMaximum(0)
+        self.replay_slider.sliderMoved.connect(self.player.seek)
+        self.player.positionChanged.connect(self.update_replay_slider)
+
+        self.save_trace_button = QPushButton("Save Trace", self)
+        self.save_trace_button.setFont(self.font)
+        self.load_trace_button = QPushButton("Load Trace", self)
+        self.load_trace_button.setFont(self.font)
+        self.load_maze_button = QPushButton("Load Maze", self)
+        self.load_maze_button.setFont(self.font)
+        self.load_maze_button.setToolTip(
+            "Load a maze from a wall encoding file (one byte per cell). Mazes larger than {0}x{0} are shown but not "
+            "solved".format(self.max_dimension)
+        )
+        self.export_button = QPushButton("Export", self)
+        self.export_button.setFont(self.font)
+        self.export_button.setToolTip("Export the maze and its solution to a PNG image or a text file")
+
+        self.replay_layout = QHBoxLayout()
+        self.replay_layout.addWidget(self.play_button)
+        self.replay_layout.addWidget(self.replay_slider, stretch=1)
+        self.replay_layout.addWidget(self.save_trace_button)
+        self.replay_layout.addWidget(self.load_trace_button)
+        self.replay_layout.addWidget(self.load_maze_button)
+        self.replay_layout.addWidget(self.export_button)
+
+        self.profile_checkbox = QCheckBox("Profile Runs", self)
+        self.profile_checkbox.setFont(self.font)
+
+        self.measure_checkbox = QCheckBox("Measure Only", self)
+        self.measure_checkbox.setFont(self.font)
+        self.measure_checkbox.setToolTip("Run without animation or slow factor to measure pure compute time")
+
+        self.terrain_checkbox = QCheckBox("Weighted Terrain", self)
+        self.terrain_checkbox.setFont(self.font)
+        self.terrain_checkbox.setToolTip("Generate mazes with cells that cost more to cross, shown as a heatmap")
+
+        self.options_layout = QHBoxLayout()
+        self.options_layout.addWidget(self.profile_checkbox)
+        self.options_layout.addWidget(self.measure_checkbox)
+        self.options_layout.addWidget(self.terrain_checkbox)
+
+        self.race_label = QLabel("Race:", self)
+        self.race_label.setFont(self.font)
+
+        # Solvers to race, keyed by solver function name
+        self.race_checkboxes = {}
+        for algorithm, name in [("dfs", "DFS"), ("bfs", "BFS"), ("a_star", "A*"), ("jps", "JPS")]:
+            checkbox = QCheckBox(name, self)
+            checkbox.setFont(self.font)
+            checkbox.setChecked(True)
+            self.race_checkboxes[algorithm] = checkbox
+
+        self.race_button = QPushButton("Race Solvers", self)
+        self.race_button.setFont(self.font)
+        self.race_button.setToolTip("Run the selected solvers at the same time, each in its own process")
+
+        self.race_layout = QHBoxLayout()
+        self.race_layout.addWidget(self.race_label)
+        for checkbox in self.race_checkboxes.values():
+            self.race_layout.addWidget(checkbox)
+        self.race_layout.addWidget(self.race_button, stretch=1)
+
         self.log = QListWidget(self)
         self.log.setFont(self.font)
         self.log.setViewportMargins(10, 10, 10, 10)
@@ -103,37 +202,45 @@ class MazeWidget(QWidget):
         self.log_reset_button.setFont(self.font)
         self.log_reset_button.clicked.connect(self.reset_log)
 
+        self.history_button = QPushButton("Show History", self)
+        self.history_button.setFont(self.font)
+
         self.maze_layout = QVBoxLayout()
         self.maze_layout.addWidget(self.view)
         self.maze_layout.addLayout(self.selection_layout)
+        self.maze_layout.addLayout(self.braid_layout)
         self.maze_layout.addLayout(self.button_layout)
         self.maze_layout.addLayout(self.slow_layout)
+        self.maze_layout.addLayout(self.replay_layout)
+        self.maze_layout.addLayout(self.options_layout)
+        self.maze_layout.addLayout(self.race_layout)
         self.maze_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
         self.log_layout = QVBoxLayout()
         self.log_layout.addWidget(self.log_label)
         self.log_layout.addWidget(self.log)
         self.log_layout.addWidget(self.log_reset_button)
+        self.log_layout.addWidget(self.history_button)
         self.log_layout.addWidget(self.exit_button)
 
+        # Layouts take ownership of their spacers and delete them with the window, so each side needs its own spacer
         self.interface_layout = QHBoxLayout()
-        self.h_spacer = QSpacerItem(10000, 0, QSizePolicy.Policy.Maximum, QSizePolicy.Policy.Expanding)
-        self.interface_layout.addItem(self.h_spacer)
+        self.left_spacer = QSpacerItem(10000, 0, QSizePolicy.Policy.Maximum, QSizePolicy.Policy.Expanding)
+        self.right_spacer = QSpacerItem(10000, 0, QSizePolicy.Policy.Maximum, QSizePolicy.Policy.Expanding)
+        self.interface_layout.addItem(self.left_spacer)
         self.interface_layout.addLayout(self.maze_layout)
         self.interface_layout.addLayout(self.log_layout)
-        self.interface_layout.addItem(self.h_spacer)
+        self.interface_layout.addItem(self.right_spacer)
         self.interface_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
         self.top_level_layout = QVBoxLayout()
-        self.v_spacer = QSpacerItem(0, 10000, QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Maximum)
-        self.top_level_layout.addItem(self.v_spacer)
+        self.top_spacer = QSpacerItem(0, 10000, QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Maximum)
+        self.bottom_spacer = QSpacerItem(0, 10000, QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Maximum)
+        self.top_level_layout.addItem(self.top_spacer)
         self.top_level_layout.addLayout(self.interface_layout)
-        self.top_level_layout.addItem(self.v_spacer)
+        self.top_level_layout.addItem(self.bottom_spacer)
         self.setLayout(self.top_level_layout)
 
-        # Initialize the maze tiles
-        self.initialize_tiles()
-
         # Initialize size slider and label
         self.size_slider.setValue(self.dimension)
         self.update_size_label()
@@ -142,37 +249,112 @@ class MazeWidget(QWidget):
         self.slow_slider.setValue(self.initial_slow_value)
         self.update_slow_label()
 
-        # Connect tile changes to view updates
-        self.connect_tile_updates()
+        # Initialize braid slider and label
+        self.update_braid_label()
 
     def update_maze_size(self, size):
         self.dimension = size
 
     def reset_view(self):
-        # Create new scene and view
-        self.scene = QGraphicsScene()
-        self.view.setScene(self.scene)
+        # Recreate the maze image for the current size
+        self.view.reset(self.dimension)
+
+    def show_walls(self, walls):
+        """
+        Shows a maze straight from its wall encoding, without a trace, with the entrance and exit in the top-left and
+        bottom-right corners as in generated mazes.
+        :param walls: The encoded edges of a maze of the current size
+        """
+        self.view.reset(self.dimension)
+        self.view.set_walls(walls)
+        self.view.set_cell_color(0, 0, "red")
+        self.view.set_cell_color(self.dimension - 1, self.dimension - 1, "blue")
+
+    def set_terrain(self, costs):
+        self.view.set_terrain(costs)
 
-        # Recreate maze tiles
-        self.tiles = {}
+    def play_trace(self, trace, position=None):
+        self.player.set_speed(self.get_slow_value())
+        self.player.play(trace, position)
 
-        self.initialize_tiles()
-        self.connect_tile_updates()
+    def stop_replay(self):
+        self.player.stop()
+
+    def update_play_button(self, playing):
+        self.play_button.setText("Pause" if playing else "Play")
+
+    def update_replay_slider(self, position, recorded):
+        self.replay_slider.setMaximum(recorded)
+
+        # Leave the slider alone while the user is dragging it
+        if not self.replay_slider.isSliderDown():
+            self.replay_slider.setValue(position)
+
+    def get_save_trace_path(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Save Trace", "", "Maze traces (*.mtrace)")
+        return path
+
+    def get_load_trace_path(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Load Trace", "", "Maze traces (*.mtrace)")
+        return path
+
+    def get_load_maze_path(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Load Maze", "", "Maze walls (*.bin *.walls);;All files (*)")
+        return path
+
+    def get_export_path(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Maze", "", "PNG images (*.png);;Text files (*.txt)")
+        return path
 
     def get_size_value(self):
         return self.size_slider.value()
 
     def update_size_label(self):
-        self.size_value.setText(str(self.size_slider.value()))
+        self.size_value.setValue(self.size_slider.value())
 
     def get_slow_value(self):
         return self.slow_slider.value() * 0.0001
 
+    def get_braid_value(self):
+        return self.braid_slider.value() / 100
+
+    def update_braid_label(self):
+        self.braid_value.setText("{}%".format(self.braid_slider.value()))
+
     def update_slow_label(self):
         self.slow_value.setText(str(self.slow_slider.value()))
 
-    def print_to_log(self, text):
-        self.log.addItem(text)
+        # Apply the new delay to any replay in progress
+        self.player.set_speed(self.get_slow_value())
+
+    def get_profile_enabled(self):
+        return self.profile_checkbox.isChecked()
+
+    def set_profile_enabled(self, enabled):
+        self.profile_checkbox.setChecked(enabled)
+
+    def get_measure_only(self):
+        return self.measure_checkbox.isChecked()
+
+    def get_terrain_enabled(self):
+        return self.terrain_checkbox.isChecked()
+
+    def get_race_algorithms(self):
+        return [algorithm for algorithm, checkbox in self.race_checkboxes.items() if checkbox.isChecked()]
+
+    def print_to_log(self, text, details=None):
+        """
+        Adds a line to the runtime log.
+        :param text: The line to be added
+        :param details: Text shown when hovering over the line (e.g. the traceback of an error), if any
+        """
+        item = QListWidgetItem(text)
+
+        if details is not None:
+            item.setToolTip(details)
+
+        self.log.addItem(item)
+        self.log.scrollToBottom()
 
     def reset_log(self):
         self.log.clear()
@@ -189,117 +371,43 @@ class MazeWidget(QWidget):
     def assign_exit_button(self, function):
         self.exit_button.clicked.connect(function)
 
+    def assign_history_button(self, function):
+        self.history_button.clicked.connect(function)
+
+    def assign_save_trace_button(self, function):
+        self.save_trace_button.clicked.connect(function)
+
+    def assign_load_trace_button(self, function):
+        self.load_trace_button.clicked.connect(function)
+
+    def assign_load_maze_button(self, function):
+        self.load_maze_button.clicked.connect(function)
+
+    def assign_export_button(self, function):
+        self.export_button.clicked.connect(function)
+
+    def assign_race_button(self, function):
+        self.race_button.clicked.connect(function)
+
     def disable_buttons(self):
         self.generate_button.setEnabled(False)
         self.solve_button.setEnabled(False)
+        self.race_button.setEnabled(False)
+        self.save_trace_button.setEnabled(False)
+        self.load_trace_button.setEnabled(False)
+        self.load_maze_button.setEnabled(False)
+        self.export_button.setEnabled(False)
 
     def enable_buttons(self):
         self.generate_button.setEnabled(True)
         self.solve_button.setEnabled(True)
+        self.race_button.setEnabled(True)
+        self.save_trace_button.setEnabled(True)
+        self.load_trace_button.setEnabled(True)
+        self.load_maze_button.setEnabled(True)
+        self.export_button.setEnabled(True)
 
     def display_solve_error(self):
         error_dialog = QErrorMessage(self)
         error_dialog.setWindowTitle("Error")
         error_dialog.showMessage("Error: Please generate a maze before solving.")
-
-    def connect_tile_updates(self):
-        for x in range(self.dimension):
-            for y in range(self.dimension):
-                tile = self.tiles.get((x, y))
-
-                # Connect tileChanged signal to the update method
-                tile.com.tileChanged.connect(self.update_view)
-
-    @QtCore.pyqtSlot()
-    def update_view(self):
-        self.view.viewport().update()
-
-    def initialize_tiles(self):
-        for x in range(self.dimension):
-            for y in range(self.dimension):
-                x_pos = x * self.tile_size
-                y_pos = y * self.tile_size
-                tile = MazeTile(x, y, self.tile_size)
-                tile.setBrush(QBrush(QColor("lightgray")))
-                tile.setPos(x_pos, y_pos)
-                self.scene.addItem(tile)
-
-                # Add tile to dictionary with coordinates
-                self.tiles[(x, y)] = tile
-
-    def get_tile(self, x, y):
-        return self.tiles[(x, y)]
-
-class MazeTile(QGraphicsItem):
-    # Define signal as class variable
-    class Communicate(QObject):
-        tileChanged = pyqtSignal()
-
-    def __init__(self, x, y, tile_size):
-        super().__init__()
-        self.x = x
-        self.y = y
-        self.tile = QRectF(0, 0, tile_size, tile_size)
-        self.wall_color = QColor("gray")
-        self.wall_width = 1
-
-        self.top_wall = QRectF(0, 0, tile_size, self.wall_width)
-        self.bottom_wall = QRectF(0, tile_size - self.wall_width, tile_size, self.wall_width)
-        self.left_wall = QRectF(0, 0, self.wall_width, tile_size)
-        self.right_wall = QRectF(tile_size - self.wall_width, 0, self.wall_width, tile_size)
-
-        self.top_wall_visible = True
-        self.bottom_wall_visible = True
-        self.left_wall_visible = True
-        self.right_wall_visible = True
-
-        self._brush = QBrush(QColor("black"))
-
-        self.com = self.Communicate()
-
-    def setBrush(self, brush):
-        self._brush = brush
-        self.com.tileChanged.emit()
-
-    def toggleWallVisible(self, wall=None):
-        match wall:
-            case "top":
-                self.top_wall_visible = not self.top_wall_visible
-            case "bottom":
-                self.bottom_wall_visible = not self.bottom_wall_visible
-            case "left":
-                self.left_wall_visible = not self.left_wall_visible
-            case "right":
-                self.right_wall_visible = not self.right_wall_visible
-            case _:
-                pass
-        self.com.tileChanged.emit()
-
-    def enableAllWalls(self):
-        self.top_wall_visible = True
-        self.bottom_wall_visible = True
-        self.left_wall_visible = True
-        self.right_wall_visible = True
-
-    def isAdjacent(self, other_tile):
-        if self.x == other_tile.x:
-            if self.y == other_tile.y - 1 or self.y == other_tile.y + 1:
-                return True
-        if self.y == other_tile.y:
-            if self.x == other_tile.x - 1 or self.x == other_tile.x + 1:
-                return True
-        return False
-
-    def boundingRect(self):
-        return self.tile
-
-    def paint(self, painter=None, style=None, widget=None):
-        painter.fillRect(self.tile, self._brush)
-        if self.top_wall_visible:
-            painter.fillRect(self.top_wall, QBrush(self.wall_color))
-        if self.bottom_wall_visible:
-            painter.fillRect(self.bottom_wall, QBrush(self.wall_color))
-        if self.left_wall_visible:
-            painter.fillRect(self.left_wall, QBrush(self.wall_color))
-        if self.right_wall_visible:
-            painter.fillRect(self.right_wall, QBrush(self.wall_color))
@@ -4,8 +4,53 @@
 #  Python class for a maze represented by a graph. The graph is made up of Node objects.
 # ----------------------------------------------------------------------------------------------------------------------
 
+import gc
+import hashlib
 from maze import Node
 
+# Bits set in the compact wall encoding for nodes with an edge to their east and south neighbors
+EAST = 1
+SOUTH = 2
+
+# Order of the neighbor slots in generation graph lists, for nodes above, on and below the diagonal. This is the order
+# the neighbors were first listed in, which the generator's random choices depend on, so each seed keeps producing the
+# same maze.
+GENERATION_ORDER = (
+    (Node.WEST, Node.NORTH, Node.SOUTH, Node.EAST),
+    (Node.WEST, Node.NORTH, Node.EAST, Node.SOUTH),
+    (Node.EAST, Node.WEST, Node.NORTH, Node.SOUTH)
+)
+
+def get_fingerprint(walls):
+    """
+    Gets a content hash of a maze's edges from their compact wall encoding, which hashes a 1000x1000 maze in about a
+    millisecond, so that mazes held only as their encoding can be fingerprinted without building their graph.
+    :param walls: The encoded edges, as returned by Maze.get_walls()
+    :return: The hash as a 64-bit integer
+    """
+    return int.from_bytes(hashlib.blake2b(walls, digest_size=8).digest(), "little")
+
+def check_walls(length, walls):
+    """
+    Checks that a compact wall encoding describes a maze of the given length, so that every edge it encodes joins two
+    nodes of the maze.
+    :param length: The length of the maze
+    :param walls: The encoded edges, as returned by Maze.get_walls()
+    :raises ValueError: If the encoding is the wrong size, has bits other than EAST and SOUTH, or has edges leaving the
+    east or south side of the maze
+    """
+    if len(walls) != length * length:
+        raise ValueError("Expected {} bytes of maze walls, got {}".format(length * length, len(walls)))
+
+    if bytes(walls).translate(None, bytes((0, EAST, SOUTH, EAST | SOUTH))):
+        raise ValueError("Maze walls may only set the EAST and SOUTH bits")
+
+    if any(cell & EAST for cell in walls[length - 1::length]):
+        raise ValueError("Maze walls have an east edge from the last column")
+
+    if any(cell & SOUTH for cell in walls[(length - 1) * length:]):
+        raise ValueError("Maze walls have a south edge from the last row")
+
 class Maze:
     def __init__(self, length):
         # Start and End nodes
@@ -18,26 +63,49 @@ class Maze:
         # Graph for maze generation
         self.generation_graph = {}
 
+        # Nodes by ID (row-major order)
+        self.nodes = []
+
         # Length and width of maze
         self.length = length
 
-        # Initialize maze nodes
-        self.__initialize_nodes()
+        # Seed the maze was generated from, and the fraction of its dead ends removed (set by the generator)
+        self.seed = None
+        self.braid = 0.0
+
+        # Content hash of the carved edges, computed when first needed after they change (see get_fingerprint())
+        self.__fingerprint = None
+
+        # Cost of entering each node, with one byte per node in row-major order (None when every step costs 1)
+        self.costs = None
+
+        # Pause garbage collection while the nodes are created, since collections triggered by the allocations would
+        # repeatedly scan the growing graph without freeing anything
+        collecting = gc.isenabled()
+        gc.disable()
+
+        try:
+            # Initialize maze nodes
+            self.__initialize_nodes()
 
-        # Add all edges for adjacent nodes
-        self.initialize_generation_graph()
+            # Add all edges for adjacent nodes
+            self.initialize_generation_graph()
+        finally:
+            if collecting:
+                gc.enable()
 
     def __initialize_nodes(self):
         """
         Initializes all graph nodes and populates their neighbor lists.
         """
-        grid = {}
+        length = self.length
+        nodes = self.nodes = [None] * (length * length)
 
-        # Create nodes
-        for x in range(self.length):
-            for y in range(self.length):
+        # Create nodes (column by column, which sets the order of the graph's keys that braiding shuffles)
+        for x in range(length):
+            for y in range(length):
                 # Create node
-                node = Node(x, y)
+                node = Node(x, y, y * length + x)
 
                 # Save start and end nodes
                 if x == 0 and y == 0:
@@ -45,70 +113,147 @@ class Maze:
                 if x == self.length - 1 and y == self.length - 1:
                     self.end = node
 
-                # Initialize adjacency list for both graphs
+                # Initialize adjacency list (the generation graph's lists are filled in once neighbors are linked)
                 self.graph[node] = []
-                self.generation_graph[node] = []
 
-                # Add node to the temporary grid
-                grid[(x, y)] = node
+                # Add node to the list
+                nodes[node.id] = node
 
         # Initialize neighbors for each node
-        self.__initialize_neighbors(grid)
+        self.__initialize_neighbors(nodes)
 
-    def __initialize_neighbors(self, grid):
+    def __initialize_neighbors(self, nodes):
         """
-        Initializes neighbor lists for all graph nodes.
-        :param grid: a dictionary grid of all graph nodes.
+        Initializes neighbor slots for all graph nodes, by linking each node with its west and north neighbors.
+        :param nodes: a list of all graph nodes by ID.
         """
-        for x in range(1, self.length):
-            col = x
-            row = 0
+        length = self.length
+
+        for node in nodes:
+            if node.x > 0:
+                west = nodes[node.id - 1]
+                node.neighbors[Node.WEST] = west
+                west.neighbors[Node.EAST] = node
 
-            # Add neighbors downward until diagonal is reached
-            while row < col:
-                # Bi-directionally connect with left node
-                grid[(col, row)].add_neighbor(grid[(col - 1, row)])
-                grid[(col - 1, row)].add_neighbor(grid[(col, row)])
+            if node.y > 0:
+                north = nodes[node.id - length]
+                node.neighbors[Node.NORTH] = north
+                north.neighbors[Node.SOUTH] = node
 
-                # Bi-directionally connect with upper node
-                if row > 0:
-                    grid[(col, row)].add_neighbor(grid[(col, row - 1)])
-                    grid[(col, row - 1)].add_neighbor(grid[(col, row)])
+    def initialize_generation_graph(self):
+        for node in self.nodes:
+            neighbors = node.neighbors
+            order = GENERATION_ORDER[(node.y >= node.x) + (node.y > node.x)]
 
-                row += 1
+            self.generation_graph[node] = [neighbors[slot] for slot in order if neighbors[slot] is not None]
 
-            # Add diagonal's neighbors
-            grid[(col, row)].add_neighbor(grid[(col - 1, row)])
-            grid[(col - 1, row)].add_neighbor(grid[(col, row)])
-            grid[(col, row)].add_neighbor(grid[(col, row - 1)])
-            grid[(col, row - 1)].add_neighbor(grid[(col, row)])
+    @property
+    def fingerprint(self):
+        if self.__fingerprint is None:
+            self.__fingerprint = get_fingerprint(self.get_walls())
 
-            col -= 1
+        return self.__fingerprint
 
-            # Add neighbors to the left until edge is reached
-            while col >= 0:
-                # Bi-directionally connect with left node
-                if col > 0:
-                    grid[(col, row)].add_neighbor(grid[(col - 1, row)])
-                    grid[(col - 1, row)].add_neighbor(grid[(col, row)])
+    def get_endpoints(self):
+        """
+        :return: The (x, y) coordinates of the start and end nodes
+        """
+        return self.start.get_coordinates(), self.end.get_coordinates()
 
-                # Bi-directionally connect with upper node
-                grid[(col, row)].add_neighbor(grid[(col, row - 1)])
-                grid[(col, row - 1)].add_neighbor(grid[(col, row)])
+    def get_node(self, x, y):
+        if not (0 <= x < self.length and 0 <= y < self.length):
+            raise KeyError((x, y))
 
-                col -= 1
+        return self.nodes[y * self.length + x]
 
-    def initialize_generation_graph(self):
-        for node in self.generation_graph.keys():
-            for neighbor in node.get_neighbors():
-                if neighbor not in self.generation_graph[node]:
-                    self.generation_graph[node].append(neighbor)
+    def get_cost(self, node):
+        if self.costs is None:
+            return 1
+
+        return self.costs[node.id]
+
+    def set_costs(self, costs):
+        """
+        Sets the cost of entering each node, for weighted terrain.
+        :param costs: The costs as bytes, with one byte per node in row-major order (each between 1 and 255), or None
+        for unit costs
+        """
+        if costs is not None:
+            costs = bytes(costs)
+
+            if len(costs) != self.length * self.length or 0 in costs:
+                raise ValueError("Expected a cost between 1 and 255 for each of the {} nodes".format(len(self.nodes)))
+
+        self.costs = costs
 
     def add_edge(self, node1, node2):
         # Add edge in both directions
         self.graph[node1].append(node2)
         self.graph[node2].append(node1)
 
+        self.__fingerprint = None
+
     def reset_graph(self):
         for node in self.graph.keys():
             self.graph[node] = []
+
+        self.__fingerprint = None
+
+    def get_walls(self):
+        """
+        Gets a compact encoding of the maze's edges, with one byte per node in row-major order. The EAST bit is set if
+        the node has an edge to its east neighbor, and the SOUTH bit if it has an edge to its south neighbor.
+        :return: The encoded edges as bytes
+        """
+        return b"".join(self.get_wall_row(y) for y in range(self.length))
+
+    def get_wall_row(self, y):
+        """
+        Gets the compact encoding of the edges of one row of the maze, so that large mazes can be read a row at a time.
+        :param y: The row to be encoded
+        :return: The encoded edges of the row as bytes, with one byte per node
+        """
+        row = bytearray(self.length)
+
+        for x in range(self.length):
+            node = self.nodes[y * self.length + x]
+
+            for neighbor in self.graph[node]:
+                if neighbor.x == x + 1:
+                    row[x] |= EAST
+                elif neighbor.y == y + 1:
+                    row[x] |= SOUTH
+
+        return bytes(row)
+
+    @classmethod
+    def from_walls(cls, length, walls):
+        """
+        Creates a maze from the compact encoding of its edges.
+        :param length: The length of the maze
+        :param walls: The encoded edges, as returned by get_walls()
+        :return: The maze
+        """
+        maze = cls(length)
+        maze.set_walls(walls)
+
+        return maze
+
+    def set_walls(self, walls):
+        """
+        Replaces the maze's edges with those in a compact encoding.
+        :param walls: The encoded edges, as returned by get_walls()
+        :raises ValueError: If the encoding does not describe a maze of this length
+        """
+        check_walls(self.length, walls)
+
+        self.reset_graph()
+
+        nodes = self.nodes
+
+        for i, cell in enumerate(walls):
+            if cell:
+                if cell & EAST:
+                    self.add_edge(nodes[i], nodes[i + 1])
+                if cell & SOUTH:
+                    self.add_edge(nodes[i], nodes[i + self.length])
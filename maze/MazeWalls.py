@@ -0,0 +1,78 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  MazeWalls.py
+#
+#  Python class for a maze held only as its compact wall encoding, without a graph of nodes. Building the graph of a
+#  1000x1000 maze takes seconds, so the window keeps its mazes in this form, and only the worker process that generates
+#  and solves them builds their graphs.
+# ----------------------------------------------------------------------------------------------------------------------
+
+from maze.Maze import check_walls, get_fingerprint
+
+class MazeWalls:
+    def __init__(self, length, walls=None):
+        """
+        :param length: The length of the maze
+        :param walls: The encoded edges, as returned by Maze.get_walls() (all walls closed if not given)
+        """
+        self.length = length
+
+        # Encoded edges, with one byte per node in row-major order
+        self.walls = bytes(length * length)
+
+        # Seed the maze was generated from, and the fraction of its dead ends removed
+        self.seed = None
+        self.braid = 0.0
+
+        # Cost of entering each node, with one byte per node in row-major order (None when every step costs 1)
+        self.costs = None
+
+        # Content hash of the walls, computed when first needed after they change
+        self.__fingerprint = None
+
+        if walls is not None:
+            self.set_walls(walls)
+
+    @property
+    def fingerprint(self):
+        if self.__fingerprint is None:
+            self.__fingerprint = get_fingerprint(self.walls)
+
+        return self.__fingerprint
+
+    def get_endpoints(self):
+        """
+        :return: The (x, y) coordinates of the entrance and exit, in the top-left and bottom-right corners as in
+        generated mazes
+        """
+        return (0, 0), (self.length - 1, self.length - 1)
+
+    def get_walls(self):
+        return self.walls
+
+    def get_wall_row(self, y):
+        return self.walls[y * self.length:(y + 1) * self.length]
+
+    def set_walls(self, walls):
+        """
+        Replaces the maze's edges with those in a compact encoding.
+        :param walls: The encoded edges, as returned by Maze.get_walls()
+        :raises ValueError: If the encoding does not describe a maze of this length
+        """
+        check_walls(self.length, walls)
+
+        self.walls = bytes(walls)
+        self.__fingerprint = None
+
+    def set_costs(self, costs):
+        """
+        Sets the cost of entering each node, for weighted terrain.
+        :param costs: The costs as bytes, with one byte per node in row-major order (each between 1 and 255), or None
+        for unit costs
+        """
+        if costs is not None:
+            costs = bytes(costs)
+
+            if len(costs) != self.length * self.length or 0 in costs:
+                raise ValueError("Expected a cost between 1 and 255 for each of the {} nodes".format(len(self.walls)))
+
+        self.costs = costs
@@ -4,36 +4,54 @@
 #  Python class for a node in a graph representation of a maze.
 # ----------------------------------------------------------------------------------------------------------------------
 
-DARKGRAY = (169, 169, 169)
-SIZE = 20
+# Offsets to the neighbor in each of a node's neighbor slots, in slot order
+DIRECTIONS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+
+# Neighbor slot for each offset
+SLOTS = {offset: slot for slot, offset in enumerate(DIRECTIONS)}
 
 class Node:
-    def __init__(self, x, y):
+    # Slots keep nodes small and their attributes quick to read, since mazes hold one node per cell
+    __slots__ = ("x", "y", "id", "neighbors")
+
+    # Neighbor slots
+    NORTH = 0
+    EAST = 1
+    SOUTH = 2
+    WEST = 3
+
+    def __init__(self, x, y, index=0):
+        """
+        :param x: The column of the node
+        :param y: The row of the node
+        :param index: The index of the node in row-major order (y * length + x), for solvers to index arrays of per-node
+        state with
+        """
         # Coordinates
         self.x = x
         self.y = y
 
-        # Color-modifying properties
-        self.visited = False
+        # Dense integer ID
+        self.id = index
 
-        # Dimensions
-        self.width = SIZE
-        self.height = SIZE
-
-        # Initial Color
-        self.color = DARKGRAY
-
-        # Neighboring nodes
-        self.neighbors = []
+        # Neighboring nodes, with one slot per direction (None where the node is on the edge of the maze)
+        self.neighbors = [None, None, None, None]
 
     def add_neighbor(self, neighbor):
         """
-        Adds a neighbor node to this node's list of neighbors if it is not already present.
+        Adds a neighbor node to the slot for its direction from this node, if the slot is empty.
         :param neighbor: the neighbor node
         :return: True if the neighbor node was added, False otherwise
+        :raises ValueError: If the neighbor node is not adjacent to this node
         """
-        if not self.neighbors.__contains__(neighbor):
-            self.neighbors.append(neighbor)
+        slot = SLOTS.get((neighbor.x - self.x, neighbor.y - self.y))
+
+        if slot is None:
+            raise ValueError("Node {} is not adjacent to node {}".format(neighbor.get_coordinates(),
+                                                                         self.get_coordinates()))
+
+        if self.neighbors[slot] is None:
+            self.neighbors[slot] = neighbor
             return True
 
         return False
@@ -41,9 +59,9 @@ class Node:
     def get_neighbors(self):
         """
         Accessor for a node's neighbors.
-        :return: The list of neighboring nodes
+        :return: The list of neighboring nodes, in slot order
         """
-        return self.neighbors
+        return [neighbor for neighbor in self.neighbors if neighbor is not None]
 
     def get_coordinates(self):
         return self.x, self.y
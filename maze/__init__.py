@@ -1,3 +1,4 @@
 # Import modules
 from .Node import Node
-from .Maze import Maze
\ No newline at end of file
+from .Maze import Maze
+from .MazeWalls import MazeWalls
\ No newline at end of file
@@ -0,0 +1,215 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  analysis.py
+#
+#  Structural statistics of mazes for quality control of generated corpora: dead ends, junctions, loops, branching
+#  factor, corridor ("river") lengths, diameter, and solution length. Statistics are computed from the compact wall
+#  encoding in linear passes: node degrees for every cell at once with big-integer arithmetic (one byte lane per cell),
+#  and distances with two breadth-first searches over the encoding.
+# ----------------------------------------------------------------------------------------------------------------------
+
+from array import array
+from collections import Counter, deque
+from maze.Maze import EAST, SOUTH
+
+# Translation tables from a cell's wall byte to its EAST and SOUTH bits
+EAST_BITS = bytes(1 if cell & EAST else 0 for cell in range(256))
+SOUTH_BITS = bytes(1 if cell & SOUTH else 0 for cell in range(256))
+
+# Statistics recorded for each maze, in order
+FIELDS = ("dead_ends", "junctions", "loops", "branching_factor", "mean_corridor", "diameter", "solution_length")
+
+class MazeStats:
+    def __init__(self):
+        # Cells with a single passage
+        self.dead_ends = 0
+
+        # Cells with three or more passages
+        self.junctions = 0
+
+        # Independent loops among the cells reachable from the entrance: the edges beyond a spanning tree of those
+        # cells (0 for perfect mazes, growing with the braid factor)
+        self.loops = 0
+
+        # Mean number of passages leading on from a cell, over cells that are not dead ends
+        self.branching_factor = 0.0
+
+        # Number of corridors of each length, where a corridor runs between two cells that are not simple passages
+        # (dead ends, junctions, or the entrance and exit), and its length is its number of edges
+        self.corridor_lengths = Counter()
+
+        # Length of the longest shortest path between two cells (exact for perfect mazes, a lower bound otherwise)
+        self.diameter = 0
+
+        # Length of the shortest path from the entrance to the exit (-1 if the exit is unreachable)
+        self.solution_length = -1
+
+    @property
+    def mean_corridor(self):
+        count = sum(self.corridor_lengths.values())
+        return sum(length * n for length, n in self.corridor_lengths.items()) / count if count else 0.0
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in FIELDS}
+
+def get_degrees(length, walls):
+    """
+    Counts the passages of every cell at once, by adding the EAST and SOUTH bits of each cell and of its west and north
+    neighbors as big integers with one byte per cell.
+    :param length: The length of the maze
+    :param walls: The compact wall encoding of the maze (see Maze.get_walls())
+    :return: The number of passages of each cell as bytes, in row-major order
+    """
+    cells = length * length
+    east = int.from_bytes(walls.translate(EAST_BITS), "little")
+    south = int.from_bytes(walls.translate(SOUTH_BITS), "little")
+
+    # Each lane is at most 4, so no lane carries into the next
+    degrees = east + south + (east << 8) + (south << (8 * length))
+
+    return degrees.to_bytes(cells + length + 1, "little")[:cells]
+
+def get_distances(length, walls, source):
+    """
+    Finds the distance of every cell from a source cell with a breadth-first search over the wall encoding.
+    :param length: The length of the maze
+    :param walls: The compact wall encoding of the maze
+    :param source: The index of the source cell
+    :return: An array of distances (-1 for unreachable cells) and the index of the farthest cell
+    """
+    distances = array("i", [-1]) * (length * length)
+    distances[source] = 0
+    queue = deque([source])
+    cell = source
+
+    while queue:
+        cell = queue.popleft()
+        distance = distances[cell] + 1
+        passages = walls[cell]
+
+        if passages & EAST and distances[cell + 1] < 0:
+            distances[cell + 1] = distance
+            queue.append(cell + 1)
+        if passages & SOUTH and distances[cell + length] < 0:
+            distances[cell + length] = distance
+            queue.append(cell + length)
+        if cell % length and walls[cell - 1] & EAST and distances[cell - 1] < 0:
+            distances[cell - 1] = distance
+            queue.append(cell - 1)
+        if cell >= length and walls[cell - length] & SOUTH and distances[cell - length] < 0:
+            distances[cell - length] = distance
+            queue.append(cell - length)
+
+    # Cells are dequeued in order of distance, so the last one is the farthest
+    return distances, cell
+
+def get_corridor_lengths(length, walls, degrees, stops):
+    """
+    Walks every corridor once, from its lower-numbered end. A corridor that loops back to the cell it started from
+    (possible in mazes with loops) is walked out of both of that cell's passages into it, and counted from the
+    lower-numbered one.
+    :param stops: Cells that end a corridor even if they are simple passages (the entrance and exit)
+    :return: A Counter of corridor lengths
+    """
+    corridors = Counter()
+
+    def neighbors(cell):
+        if walls[cell] & EAST:
+            yield cell + 1
+        if walls[cell] & SOUTH:
+            yield cell + length
+        if cell % length and walls[cell - 1] & EAST:
+            yield cell - 1
+        if cell >= length and walls[cell - length] & SOUTH:
+            yield cell - length
+
+    for start, degree in enumerate(degrees):
+        if degree == 2 and start not in stops:
+            continue
+
+        for first in neighbors(start):
+            previous = start
+            current = first
+            corridor = 1
+
+            # Follow simple passages until the corridor ends, leaving each one by its other passage
+            while degrees[current] == 2 and current not in stops:
+                passages = walls[current]
+
+                if passages & EAST and current + 1 != previous:
+                    following = current + 1
+                elif passages & SOUTH and current + length != previous:
+                    following = current + length
+                elif current % length and walls[current - 1] & EAST and current - 1 != previous:
+                    following = current - 1
+                else:
+                    following = current - length
+
+                previous, current = current, following
+                corridor += 1
+
+            if start < current or (start == current and first < previous):
+                corridors[corridor] += 1
+
+    return corridors
+
+def analyze_walls(length, walls, start=0, end=None):
+    """
+    Computes the structural statistics of a maze from its wall encoding.
+    :param length: The length of the maze
+    :param walls: The compact wall encoding of the maze
+    :param start: The index of the entrance cell
+    :param end: The index of the exit cell (defaults to the bottom-right cell)
+    :return: A MazeStats object
+    """
+    if end is None:
+        end = length * length - 1
+
+    stats = MazeStats()
+    degrees = get_degrees(length, walls)
+
+    stats.dead_ends = degrees.count(1)
+    stats.junctions = degrees.count(3) + degrees.count(4)
+
+    # Every passage of a cell other than the one it was entered from leads on
+    branching = len(degrees) - degrees.count(0) - stats.dead_ends
+    if branching:
+        stats.branching_factor = (sum(degrees) - stats.dead_ends - branching) / branching
+
+    stats.corridor_lengths = get_corridor_lengths(length, walls, degrees, {start, end})
+
+    # Two searches: the first finds the solution and the cell farthest from the entrance, and the second finds the
+    # cell farthest from that one, whose distance is the diameter of a perfect maze
+    distances, farthest = get_distances(length, walls, start)
+    stats.solution_length = distances[end]
+
+    # Each edge is counted by the degrees of both of its cells. Generated mazes are connected, so the degrees of
+    # unreachable cells only need to be left out for mazes read from elsewhere.
+    unreached = distances.count(-1)
+    if unreached:
+        passages = sum(degree for degree, distance in zip(degrees, distances) if distance >= 0)
+    else:
+        passages = sum(degrees)
+    stats.loops = passages // 2 - (len(degrees) - unreached - 1)
+    stats.diameter = max(get_distances(length, walls, farthest)[0])
+
+    return stats
+
+def analyze(maze):
+    """
+    Computes the structural statistics of a maze.
+    :param maze: The maze to be analyzed
+    :return: A MazeStats object
+    """
+    start_x, start_y = maze.start.get_coordinates()
+    end_x, end_y = maze.end.get_coordinates()
+
+    return analyze_walls(maze.length, maze.get_walls(), start_y * maze.length + start_x, end_y * maze.length + end_x)
+
+def analyze_batch(length, batch):
+    """
+    Computes the structural statistics of a batch of mazes of the same size.
+    :param length: The length of the mazes
+    :param batch: An iterable of wall encodings
+    :return: A list of MazeStats objects
+    """
+    return [analyze_walls(length, walls) for walls in batch]
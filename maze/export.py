@@ -0,0 +1,295 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  export.py
+#
+#  Functions for exporting a maze, with an optional explored set and solution path, to a PNG image or to a compact
+#  text format. Both formats are streamed one maze row at a time from the compact wall encoding (read from a maze, a
+#  shared memory block or a file), with explored and solution cells taken from a stream sorted by cell, so memory use
+#  is bounded by a single row of cells rather than by the size of the maze or the image.
+# ----------------------------------------------------------------------------------------------------------------------
+
+import struct
+import zlib
+from maze.Maze import EAST, SOUTH
+
+# Cell kinds, in order of precedence (an open gap between two cells takes the lower of their kinds)
+WALL = 0
+OPEN = 1
+EXPLORED = 2
+SOLUTION = 3
+START = 4
+END = 5
+
+# PNG palette (RGB) for each cell kind
+PNG_PALETTE = {
+    WALL: (64, 64, 64),
+    OPEN: (211, 211, 211),
+    EXPLORED: (135, 206, 235),
+    SOLUTION: (0, 128, 0),
+    START: (255, 0, 0),
+    END: (0, 0, 255)
+}
+
+# Text characters for each cell kind
+TEXT_CHARACTERS = {
+    WALL: "#",
+    OPEN: " ",
+    EXPLORED: ".",
+    SOLUTION: "o",
+    START: "S",
+    END: "E"
+}
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Ranks of each cell kind for drawing the gaps between cells (gaps connecting a solution to an endpoint are drawn as
+# part of the solution)
+RANKS = bytes([WALL, OPEN, EXPLORED, SOLUTION, SOLUTION, SOLUTION]) + bytes(250)
+
+# Translation table from a pair of ranks packed into one byte (4 * first + second) to the lower of the two
+LOWER_RANK = bytes(min(pair >> 2, pair & 3) for pair in range(16)) + bytes(240)
+
+# Translation tables from a cell's wall byte to a mask selecting its east or south gap when that gap is open
+EAST_MASK = bytes(0xFF if cell & EAST else 0 for cell in range(256))
+SOUTH_MASK = bytes(0xFF if cell & SOUTH else 0 for cell in range(256))
+
+# Size of compressed image data to collect before writing a PNG data chunk (in bytes)
+PNG_CHUNK_SIZE = 1 << 16
+
+def get_gaps(first, second, walls, mask):
+    """
+    Gets the kinds of the gaps between pairs of cells for a whole row at once, as big integers with one byte per gap:
+    each open gap takes the lower rank of its two cells, and closed gaps are WALL.
+    :param first: The ranks of the west or north cell of each pair
+    :param second: The ranks of the east or south cell of each pair
+    :param walls: The wall bytes of the first cells
+    :param mask: EAST_MASK or SOUTH_MASK
+    :return: The kind of each gap as a bytearray
+    """
+    size = len(first)
+
+    # Ranks are at most 3, so packing two of them never carries into the next byte
+    pairs = (int.from_bytes(first, "little") << 2) + int.from_bytes(second, "little")
+    lower = int.from_bytes(pairs.to_bytes(size, "little").translate(LOWER_RANK), "little")
+
+    return bytearray((lower & int.from_bytes(bytes(walls).translate(mask), "little")).to_bytes(size, "little"))
+
+def get_rows(length, wall_rows, marks=(), start=0, end=None):
+    """
+    Generates the cell kinds and wall gaps of each row of a maze, top to bottom.
+    :param length: The length of the maze
+    :param wall_rows: An iterable of the compact wall encoding of each row, top to bottom (see Maze.get_wall_row())
+    :param marks: An iterable of (cell, kind) pairs marking EXPLORED and SOLUTION cells, in increasing order of cell
+    index (y * length + x); a cell marked more than once takes the highest kind
+    :param start: The index of the entrance cell
+    :param end: The index of the exit cell (defaults to the bottom-right cell)
+    :return: A generator of (cells, east, south) bytearrays for each row, holding the kind of each cell and the kind of
+    the gap to its east and south (WALL when the wall is closed)
+    """
+    if end is None:
+        end = length * length - 1
+
+    marks = iter(marks)
+    mark = next(marks, None)
+
+    # Kinds of the previous row, for the gaps between rows
+    previous = None
+    rows = 0
+
+    for walls in wall_rows:
+        if len(walls) != length or rows == length:
+            raise ValueError("Expected {} rows of {} wall bytes".format(length, length))
+
+        base = rows * length
+        rows += 1
+        cells = bytearray([OPEN]) * length
+
+        # Take this row's marks from the stream
+        while mark is not None and mark[0] < base + length:
+            cell, kind = mark
+
+            if cell < base:
+                raise ValueError("Marks must be in increasing order of cell index")
+
+            cells[cell - base] = max(cells[cell - base], kind)
+            mark = next(marks, None)
+
+        for endpoint, kind in ((start, START), (end, END)):
+            if base <= endpoint < base + length:
+                cells[endpoint - base] = kind
+
+        ranks = cells.translate(RANKS)
+        east = get_gaps(ranks[:-1], ranks[1:], walls[:-1], EAST_MASK) + bytes(1)
+
+        # South gaps are only known once the next row's kinds are, so yield each row with the previous row's south gaps
+        # filled in one step later
+        if previous is not None:
+            previous_cells, previous_east, previous_ranks, previous_walls = previous
+            yield previous_cells, previous_east, get_gaps(previous_ranks, ranks, previous_walls, SOUTH_MASK)
+
+        previous = cells, east, ranks, walls
+
+    if rows != length:
+        raise ValueError("Expected {} rows of {} wall bytes".format(length, length))
+
+    if previous is not None:
+        yield previous[0], previous[1], bytearray(length)
+
+def read_wall_rows(file, length):
+    """
+    Reads the compact wall encoding of a maze from a binary file one row at a time, as written by Maze.get_walls() or
+    the maze service's /generate?format=binary.
+    :param file: The binary file, positioned at the start of the encoding
+    :param length: The length of the maze
+    :return: A generator of the wall bytes of each row
+    """
+    for y in range(length):
+        row = file.read(length)
+
+        if len(row) != length:
+            raise ValueError("Wall encoding ended after {} of {} rows".format(y, length))
+
+        yield row
+
+def get_marks(length, explored=(), solution=()):
+    """
+    Sorts explored and solution cells into a mark stream for get_rows(). This holds every mark at once, so it is meant
+    for mazes that are held in memory anyway; larger exports pass their own sorted stream.
+    :param length: The length of the maze
+    :param explored: The (x, y) coordinates of explored cells
+    :param solution: The (x, y) coordinates of cells on the solution path
+    :return: A sorted list of (cell, kind) pairs
+    """
+    marks = [(y * length + x, EXPLORED) for x, y in explored]
+    marks.extend((y * length + x, SOLUTION) for x, y in solution)
+    marks.sort()
+
+    return marks
+
+def get_endpoints(maze):
+    """
+    :return: The indices of a maze's entrance and exit cells
+    """
+    (start_x, start_y), (end_x, end_y) = maze.get_endpoints()
+
+    return start_y * maze.length + start_x, end_y * maze.length + end_x
+
+def write_png(path, length, wall_rows, marks=(), start=0, end=None, cell_size=4, wall_size=1, compression=6):
+    """
+    Writes a maze given by its compact wall encoding to a palette PNG image, one row of cells at a time.
+    :param path: The path of the image file
+    :param length: The length of the maze
+    :param wall_rows: An iterable of the wall bytes of each row (see get_rows())
+    :param marks: A sorted stream of (cell, kind) pairs for explored and solution cells (see get_rows())
+    :param start: The index of the entrance cell
+    :param end: The index of the exit cell (defaults to the bottom-right cell)
+    :param cell_size: The size of each cell (in pixels)
+    :param wall_size: The thickness of each wall (in pixels)
+    :param compression: The zlib compression level
+    """
+    pitch = cell_size + wall_size
+    width = length * pitch + wall_size
+
+    with open(path, "wb") as file:
+        def write_chunk(kind, data):
+            file.write(struct.pack(">I", len(data)))
+            file.write(kind)
+            file.write(data)
+            file.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(kind))))
+
+        file.write(PNG_SIGNATURE)
+
+        # 8-bit palette image
+        write_chunk(b"IHDR", struct.pack(">IIBBBBB", width, width, 8, 3, 0, 0, 0))
+        write_chunk(b"PLTE", b"".join(bytes(PNG_PALETTE[kind]) for kind in sorted(PNG_PALETTE)))
+
+        compressor = zlib.compressobj(compression)
+        pending = bytearray()
+
+        def write_scanline(row, count):
+            # Each scanline starts with its filter type (0: none)
+            scanline = b"\x00" + row
+            for _ in range(count):
+                pending.extend(compressor.compress(scanline))
+
+            if len(pending) >= PNG_CHUNK_SIZE:
+                write_chunk(b"IDAT", bytes(pending))
+                pending.clear()
+
+        # Top border
+        write_scanline(bytes(width), wall_size)
+
+        for cells, east, south in get_rows(length, wall_rows, marks, start, end):
+            # Scanline through the cells, with the gaps between horizontally adjacent cells
+            row = bytearray(width)
+            for k in range(cell_size):
+                row[wall_size + k::pitch] = cells
+            for k in range(wall_size):
+                row[wall_size + cell_size + k::pitch] = east
+
+            write_scanline(row, cell_size)
+
+            # Scanline below the cells, with the gaps between vertically adjacent cells
+            row = bytearray(width)
+            for k in range(cell_size):
+                row[wall_size + k::pitch] = south
+
+            write_scanline(row, wall_size)
+
+        pending.extend(compressor.flush())
+        write_chunk(b"IDAT", bytes(pending))
+        write_chunk(b"IEND", b"")
+
+def write_text(path, length, wall_rows, marks=(), start=0, end=None):
+    """
+    Writes a maze given by its compact wall encoding as text, with one character per cell and per wall, one row of
+    cells at a time.
+    :param path: The path of the text file
+    :param length: The length of the maze
+    :param wall_rows: An iterable of the wall bytes of each row (see get_rows())
+    :param marks: A sorted stream of (cell, kind) pairs for explored and solution cells (see get_rows())
+    :param start: The index of the entrance cell
+    :param end: The index of the exit cell (defaults to the bottom-right cell)
+    """
+    width = 2 * length + 1
+    characters = "".join(TEXT_CHARACTERS[kind] for kind in sorted(TEXT_CHARACTERS)).encode() + bytes(250)
+
+    with open(path, "wb") as file:
+        file.write(b"#" * width + b"\n")
+
+        for cells, east, south in get_rows(length, wall_rows, marks, start, end):
+            row = bytearray(width)
+            row[1::2] = cells
+            row[2::2] = east
+            file.write(row.translate(characters) + b"\n")
+
+            row = bytearray(width)
+            row[1::2] = south
+            file.write(row.translate(characters) + b"\n")
+
+def export_png(maze, path, explored=(), solution=(), cell_size=4, wall_size=1, compression=6):
+    """
+    Writes a maze to a palette PNG image, one row of cells at a time.
+    :param maze: The maze to be exported
+    :param path: The path of the image file
+    :param explored: The (x, y) coordinates of explored cells
+    :param solution: The (x, y) coordinates of cells on the solution path
+    :param cell_size: The size of each cell (in pixels)
+    :param wall_size: The thickness of each wall (in pixels)
+    :param compression: The zlib compression level
+    """
+    wall_rows = (maze.get_wall_row(y) for y in range(maze.length))
+    marks = get_marks(maze.length, explored, solution)
+
+    write_png(path, maze.length, wall_rows, marks, *get_endpoints(maze), cell_size, wall_size, compression)
+
+def export_text(maze, path, explored=(), solution=()):
+    """
+    Writes a maze as text, with one character per cell and per wall, one row of cells at a time.
+    :param maze: The maze to be exported
+    :param path: The path of the text file
+    :param explored: The (x, y) coordinates of explored cells
+    :param solution: The (x, y) coordinates of cells on the solution path
+    """
+    wall_rows = (maze.get_wall_row(y) for y in range(maze.length))
+
+    write_text(path, maze.length, wall_rows, get_marks(maze.length, explored, solution), *get_endpoints(maze))
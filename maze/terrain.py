@@ -0,0 +1,49 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  terrain.py
+#
+#  Generation of weighted terrain for mazes: small integer costs for entering each cell, stored with one byte per cell
+#  in row-major order (see Maze.set_costs()). Terrain is smooth value noise, so costly cells form patches rather than
+#  scattered single cells.
+# ----------------------------------------------------------------------------------------------------------------------
+
+import random
+
+# Highest cost of entering a cell
+MAX_COST = 9
+
+def generate_costs(length, seed=None, max_cost=MAX_COST, scale=8):
+    """
+    Generates terrain costs by interpolating random values on a coarse lattice.
+    :param length: The length of the maze
+    :param seed: The seed for the terrain (chosen at random if not given)
+    :param max_cost: The highest cost of a cell (at most 255)
+    :param scale: The distance between lattice points (in cells), which sets the size of the patches
+    :return: The cost of each cell as bytes, between 1 and max_cost
+    """
+    rng = random.Random(seed)
+    points = length // scale + 2
+    lattice = [[rng.random() for _ in range(points)] for _ in range(points)]
+
+    # Weights of each cell between its two lattice points, smoothed so that patches have no visible seams
+    steps = []
+    for k in range(length):
+        t = (k % scale) / scale
+        steps.append((k // scale, t * t * (3 - 2 * t)))
+
+    costs = bytearray(length * length)
+    i = 0
+
+    for row, v in steps:
+        top = lattice[row]
+        bottom = lattice[row + 1]
+
+        for column, u in steps:
+            upper = top[column] + (top[column + 1] - top[column]) * u
+            lower = bottom[column] + (bottom[column + 1] - bottom[column]) * u
+            value = upper + (lower - upper) * v
+
+            # Square the noise so that most of the maze stays cheap, with a few costly patches
+            costs[i] = 1 + min(max_cost - 1, int(value * value * max_cost))
+            i += 1
+
+    return bytes(costs)
@@ -0,0 +1,2 @@
+# Import modules
+from .server import MazeService
@@ -0,0 +1,52 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  __main__.py
+#
+#  Command line interface for running the maze service.
+#
+#  Example (four workers, at most 32 waiting requests, 10 second timeout):
+#      python -m service --port 8080 --workers 4 --queue 32 --timeout 10
+# ----------------------------------------------------------------------------------------------------------------------
+
+import argparse
+import asyncio
+import signal
+from service import MazeService
+
+async def serve(arguments):
+    service = MazeService(arguments.workers, arguments.queue, arguments.timeout)
+    server = await service.start(arguments.host, arguments.port)
+
+    print("Serving on {}:{} with {} workers".format(arguments.host, arguments.port, service.workers), flush=True)
+
+    # Stop serving on SIGTERM as well as on Ctrl+C, so that the worker processes are shut down with the service
+    task = asyncio.current_task()
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, task.cancel)
+    except NotImplementedError:
+        pass
+
+    try:
+        await server.serve_forever()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        await service.close()
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m service", description="Serve maze generation and solving.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=8080, help="port to listen on (default: %(default)s)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: number of CPUs)")
+    parser.add_argument(
+        "--queue", type=int, default=64, help="requests that can wait for a worker (default: %(default)s)"
+    )
+    parser.add_argument("--timeout", type=float, default=30.0, help="time allowed per request (default: %(default)ss)")
+    arguments = parser.parse_args()
+
+    try:
+        asyncio.run(serve(arguments))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  http.py
+#
+#  Minimal HTTP/1.1 support for the service on top of asyncio streams: request parsing, JSON responses, and chunked
+#  responses for streaming binary payloads.
+# ----------------------------------------------------------------------------------------------------------------------
+
+import json
+from urllib.parse import parse_qsl, urlsplit
+
+# Largest accepted request body (in bytes)
+MAX_BODY = 64 * 1024 * 1024
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    503: "Service Unavailable",
+    504: "Gateway Timeout",
+    500: "Internal Server Error"
+}
+
+class HTTPError(Exception):
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+
+class Request:
+    def __init__(self, method, target, version, headers, body):
+        self.method = method
+        self.version = version
+        self.headers = headers
+        self.body = body
+
+        url = urlsplit(target)
+        self.path = url.path
+        self.query = dict(parse_qsl(url.query))
+
+    @property
+    def keep_alive(self):
+        connection = self.headers.get("connection", "").lower()
+
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+
+        return connection != "close"
+
+    def json(self):
+        if not self.body:
+            return {}
+
+        try:
+            data = json.loads(self.body)
+        except ValueError:
+            raise HTTPError(400, "Request body is not valid JSON")
+
+        if not isinstance(data, dict):
+            raise HTTPError(400, "Request body must be a JSON object")
+
+        return data
+
+async def read_request(reader):
+    """
+    Reads one request from a connection.
+    :return: The request, or None if the connection was closed before a new request started
+    """
+    line = await reader.readline()
+    if not line:
+        return None
+
+    try:
+        method, target, version = line.decode("latin-1").split()
+    except ValueError:
+        raise HTTPError(400, "Malformed request line")
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise HTTPError(400, "Content-Length must be an integer")
+
+    if length < 0:
+        raise HTTPError(400, "Content-Length must not be negative")
+
+    if length > MAX_BODY:
+        raise HTTPError(413, "Request body is too large")
+
+    body = await reader.readexactly(length) if length else b""
+
+    return Request(method, target, version, headers, body)
+
+def format_head(status, headers):
+    lines = ["HTTP/1.1 {} {}".format(status, REASONS.get(status, ""))]
+    lines.extend("{}: {}".format(name, value) for name, value in headers.items())
+
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+async def write_json(writer, status, data, keep_alive=True, headers=None):
+    body = json.dumps(data).encode()
+
+    head = {
+        "Content-Type": "application/json",
+        "Content-Length": len(body),
+        "Connection": "keep-alive" if keep_alive else "close"
+    }
+    head.update(headers or {})
+
+    writer.write(format_head(status, head) + body)
+    await writer.drain()
+
+async def write_stream(writer, chunks, keep_alive=True, headers=None):
+    """
+    Writes a binary response with chunked transfer encoding, waiting for the client to accept each chunk before
+    writing the next, so that at most one chunk is buffered.
+    :param chunks: An iterable of bytes objects
+    """
+    head = {
+        "Content-Type": "application/octet-stream",
+        "Transfer-Encoding": "chunked",
+        "Connection": "keep-alive" if keep_alive else "close"
+    }
+    head.update(headers or {})
+
+    writer.write(format_head(200, head))
+
+    for chunk in chunks:
+        if chunk:
+            writer.write(b"%x\r\n%b\r\n" % (len(chunk), chunk))
+            await writer.drain()
+
+    writer.write(b"0\r\n\r\n")
+    await writer.drain()
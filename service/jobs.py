@@ -0,0 +1,74 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  jobs.py
+#
+#  Generation and solving jobs run by the service's process pool. Jobs are plain functions of picklable arguments
+#  that return picklable results, so they can be sent to worker processes.
+# ----------------------------------------------------------------------------------------------------------------------
+
+from maze import Maze
+from maze.analysis import analyze
+from traversals import MazeGenerator
+from traversals.backend import SOLVERS
+
+def generate(size, seed=None, braid=0.0):
+    """
+    Generates a maze.
+    :param size: The length of the maze
+    :param seed: The seed to generate the maze from (chosen at random if not given)
+    :param braid: The fraction of dead ends to remove
+    :return: A dictionary describing the run and the maze's statistics, and the maze's compact wall encoding
+    """
+    maze = Maze(size)
+    _, metrics = MazeGenerator(maze, seed=seed, braid=braid).generate_maze_dfs()
+
+    summary = {
+        "size": size,
+        "seed": maze.seed,
+        "braid": braid,
+        "compute": metrics.compute,
+        "expansions": metrics.expansions,
+        "stats": analyze(maze).as_dict()
+    }
+
+    return summary, maze.get_walls()
+
+def solve(size, algorithm, seed=None, walls=None, braid=0.0):
+    """
+    Solves a maze, given either its seed or its wall encoding.
+    :param size: The length of the maze
+    :param algorithm: The solver function name (a key of SOLVERS)
+    :param seed: The seed to generate the maze from, if no walls are given
+    :param walls: The compact wall encoding of the maze
+    :param braid: The fraction of dead ends removed from the maze generated from the seed
+    :return: A dictionary describing the run, including the solution path from entrance to exit (empty, with a path
+    length of -1, if the exit cannot be reached from the entrance)
+    """
+    if walls is None:
+        maze = Maze(size)
+        MazeGenerator(maze, seed=seed, braid=braid).generate_maze_dfs()
+    else:
+        maze = Maze.from_walls(size, walls)
+
+    # Solvers color the solution path from the exit back to the entrance
+    path = []
+
+    def set_color(x, y, color):
+        if color == "green":
+            path.append([x, y])
+
+    solver_class, method = SOLVERS[algorithm]
+    _, metrics = getattr(solver_class(maze, set_color), method)()
+
+    if path or maze.end in maze.graph[maze.start]:
+        path = [list(maze.end.get_coordinates())] + path + [list(maze.start.get_coordinates())]
+        path.reverse()
+
+    return {
+        "size": size,
+        "seed": maze.seed,
+        "algorithm": algorithm,
+        "compute": metrics.compute,
+        "expansions": metrics.expansions,
+        "path_length": len(path) - 1 if path else -1,
+        "path": path
+    }
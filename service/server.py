@@ -0,0 +1,378 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  server.py
+#
+#  Local HTTP/JSON service for generating and solving mazes. Requests are served by an asyncio event loop, and the
+#  generation and solving work runs in a bounded process pool. Requests beyond the pool's capacity wait in a bounded
+#  queue, requests beyond that are turned away with 503 (Retry-After), and requests that take longer than the timeout
+#  are answered with 504. A worker that dies (e.g. killed for running out of memory) breaks the whole pool, so the pool
+#  is replaced and the requests it failed are answered with 503 (Retry-After). Maze sizes are limited to those that can
+#  be generated or solved well within the timeout.
+#
+#  Endpoints:
+#      POST /generate      {"size": 25, "seed": 1, "braid": 0.5}  -> run summary and maze statistics (JSON), or with
+#                          ?format=binary, the maze's wall encoding streamed in row chunks
+#      POST /solve         {"size": 25, "seed": 1, "braid": 0.5, "algorithm": "a_star"}, or a binary wall encoding with
+#                          ?size=25&algorithm=a_star  -> run summary and solution path
+#      POST /batch-solve   {"size": 25, "seeds": [1, 2], "algorithms": ["bfs", "a_star"], "braid": 0.5}  -> list of run
+#                          summaries
+#      GET  /stats         -> request counts, queue state, and latency percentiles by endpoint
+# ----------------------------------------------------------------------------------------------------------------------
+
+import asyncio
+import math
+import multiprocessing
+import os
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from time import perf_counter
+from maze.Maze import check_walls
+from service import jobs
+from service.http import HTTPError, read_request, write_json, write_stream
+from traversals.backend import SOLVERS
+
+# Largest maze length accepted, whatever the timeout (generating or solving a 1000x1000 maze takes about 12 seconds and
+# 600 MB in a worker, and both grow with the number of cells)
+MAX_SIZE = 1000
+
+# Approximate worker time per maze cell for generating or solving a maze (in seconds)
+SECONDS_PER_CELL = 1.25e-5
+
+# Size of the row chunks binary mazes are streamed in (in bytes, rounded to whole rows)
+STREAM_CHUNK = 64 * 1024
+
+# Number of recent latencies kept per endpoint for percentiles
+LATENCY_WINDOW = 10000
+
+class StreamResponse:
+    def __init__(self, chunks, headers):
+        self.chunks = chunks
+        self.headers = headers
+
+class MazeService:
+    def __init__(self, workers=None, max_queue=64, timeout=30.0):
+        """
+        :param workers: The number of worker processes (defaults to the number of CPUs)
+        :param max_queue: The number of requests that can wait for a worker before requests are turned away
+        :param timeout: The time allowed for each request (in seconds)
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.timeout = timeout
+
+        # Largest maze length accepted
+        self.max_size = get_max_size(timeout)
+
+        self.pool = None
+        self.slots = None
+        self.server = None
+
+        # Requests admitted and not yet answered
+        self.pending = 0
+
+        # Number of times the pool was replaced after a worker died
+        self.pool_restarts = 0
+
+        # Request counts by endpoint and by response status, and recent latencies by endpoint
+        self.requests = Counter()
+        self.statuses = Counter()
+        self.latencies = {}
+
+        self.routes = {
+            ("POST", "/generate"): self.generate,
+            ("POST", "/solve"): self.solve,
+            ("POST", "/batch-solve"): self.batch_solve,
+            ("GET", "/stats"): self.stats
+        }
+
+    async def start(self, host="127.0.0.1", port=8080):
+        self.pool = self.create_pool()
+        self.slots = asyncio.Semaphore(self.workers)
+
+        # Start every worker before accepting requests, so that the first requests do not pay for process startup
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, jobs.generate, 2, 0) for _ in range(self.workers)))
+
+        self.server = await asyncio.start_server(self.handle_connection, host, port)
+
+        return self.server
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
+    def create_pool(self):
+        # Spawn rather than fork, so that workers do not inherit the event loop
+        return ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def replace_pool(self, pool):
+        """
+        Replaces a pool that a worker died in, which fails its running jobs and every job submitted to it afterwards.
+        :param pool: The broken pool (requests failed by the same pool only replace it once)
+        """
+        if self.pool is pool:
+            pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = self.create_pool()
+            self.pool_restarts += 1
+
+    async def run(self, function, *args):
+        """
+        Runs a job in the process pool once a worker is free. The worker stays reserved until the job finishes, even if
+        the request waiting for it times out, so the pool is never oversubscribed.
+        :return: The job's result
+        :raises HTTPError: 503 if a worker died while the job was waiting or running
+        """
+        await self.slots.acquire()
+        pool = self.pool
+
+        try:
+            try:
+                future = asyncio.get_running_loop().run_in_executor(pool, partial(function, *args))
+            except BaseException:
+                self.slots.release()
+                raise
+
+            future.add_done_callback(lambda _: self.slots.release())
+
+            return await asyncio.shield(future)
+        except BrokenProcessPool:
+            self.replace_pool(pool)
+            raise HTTPError(503, "A worker exited unexpectedly", {"Retry-After": "1"})
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except HTTPError as error:
+                    await write_json(writer, error.status, {"error": error.message}, keep_alive=False)
+                    break
+
+                if request is None:
+                    break
+
+                await self.respond(request, writer)
+
+                if not request.keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, request, writer):
+        start_time = perf_counter()
+        status = 200
+
+        try:
+            response = await self.handle(request)
+
+            if isinstance(response, StreamResponse):
+                await write_stream(writer, response.chunks, request.keep_alive, response.headers)
+            else:
+                await write_json(writer, 200, response, request.keep_alive)
+        except HTTPError as error:
+            status = error.status
+            await write_json(writer, status, {"error": error.message}, request.keep_alive, error.headers)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            raise
+        except Exception as error:
+            status = 500
+            await write_json(writer, status, {"error": repr(error)}, request.keep_alive)
+        finally:
+            latency = perf_counter() - start_time
+            self.statuses[status] += 1
+
+            # Latencies are kept only for the service's own endpoints, so that requests for arbitrary paths cannot grow
+            # the table without bound
+            if any(path == request.path for _, path in self.routes):
+                self.latencies.setdefault(request.path, deque(maxlen=LATENCY_WINDOW)).append(latency)
+
+    async def handle(self, request):
+        """
+        Routes a request, turning it away if the queue is full and timing it out if it takes too long.
+        :return: A JSON-serializable object or a StreamResponse
+        """
+        route = self.routes.get((request.method, request.path))
+
+        if route is None:
+            if any(path == request.path for _, path in self.routes):
+                raise HTTPError(405, "Method not allowed")
+            raise HTTPError(404, "Not found")
+
+        self.requests[request.path] += 1
+
+        # Statistics are served even when the service is saturated
+        if route == self.stats:
+            return await route(request)
+
+        if self.pending >= self.workers + self.max_queue:
+            raise HTTPError(503, "Service is at capacity", {"Retry-After": "1"})
+
+        self.pending += 1
+
+        try:
+            return await asyncio.wait_for(route(request), self.timeout)
+        except asyncio.TimeoutError:
+            raise HTTPError(504, "Request timed out after {}s".format(self.timeout))
+        finally:
+            self.pending -= 1
+
+    async def generate(self, request):
+        data = request.json()
+        size = get_size(data.get("size", 25), self.max_size)
+        seed = get_seed(data.get("seed"))
+        braid = get_braid(data.get("braid", 0.0))
+
+        summary, walls = await self.run(jobs.generate, size, seed, braid)
+
+        if request.query.get("format") != "binary":
+            return summary
+
+        # Stream the wall encoding in chunks of whole rows
+        rows = max(1, STREAM_CHUNK // size)
+        chunks = (walls[start:start + rows * size] for start in range(0, len(walls), rows * size))
+
+        return StreamResponse(chunks, {"X-Maze-Size": size, "X-Maze-Seed": summary["seed"]})
+
+    async def solve(self, request):
+        if request.headers.get("content-type") == "application/octet-stream":
+            size = get_size(parse_int(request.query.get("size"), "Size"), self.max_size)
+            algorithm = get_algorithm(request.query.get("algorithm", "a_star"))
+
+            # Reject encodings with edges leading out of the maze before they reach a worker
+            try:
+                check_walls(size, request.body)
+            except ValueError as error:
+                raise HTTPError(400, str(error))
+
+            return await self.run(jobs.solve, size, algorithm, None, request.body)
+
+        data = request.json()
+        size = get_size(data.get("size", 25), self.max_size)
+        algorithm = get_algorithm(data.get("algorithm", "a_star"))
+
+        if data.get("seed") is None:
+            raise HTTPError(400, "A seed or a binary maze is required")
+
+        seed = get_seed(data["seed"])
+        braid = get_braid(data.get("braid", 0.0))
+
+        return await self.run(jobs.solve, size, algorithm, seed, None, braid)
+
+    async def batch_solve(self, request):
+        data = request.json()
+        size = get_size(data.get("size", 25), self.max_size)
+        seeds = data.get("seeds")
+        algorithms = data.get("algorithms", ["a_star"])
+        braid = get_braid(data.get("braid", 0.0))
+
+        if not isinstance(seeds, list) or not seeds:
+            raise HTTPError(400, "A list of seeds is required")
+
+        if not isinstance(algorithms, list) or not algorithms:
+            raise HTTPError(400, "A list of algorithms is required")
+
+        # Validate every argument before any run is created, so that a bad entry leaves no coroutines behind
+        seeds = [get_seed(seed) for seed in seeds]
+        algorithms = [get_algorithm(algorithm) for algorithm in algorithms]
+
+        # A batch may not queue more runs than the whole service is allowed to queue
+        if len(seeds) * len(algorithms) > self.max_queue:
+            raise HTTPError(400, "A batch may have at most {} runs (seeds x algorithms)".format(self.max_queue))
+
+        runs = [self.run(jobs.solve, size, algorithm, seed, None, braid) for seed in seeds for algorithm in algorithms]
+
+        return await asyncio.gather(*runs)
+
+    async def stats(self, request):
+        latencies = {}
+
+        for path, values in self.latencies.items():
+            ordered = sorted(values)
+            latencies[path] = {
+                "count": len(ordered),
+                "p50": percentile(ordered, 0.5),
+                "p99": percentile(ordered, 0.99),
+                "max": ordered[-1]
+            }
+
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "timeout": self.timeout,
+            "max_size": self.max_size,
+            "pending": self.pending,
+            "pool_restarts": self.pool_restarts,
+            "requests": dict(self.requests),
+            "statuses": {str(status): count for status, count in self.statuses.items()},
+            "latency": latencies
+        }
+
+def percentile(ordered, fraction):
+    """
+    Gets a percentile of sorted values, by the nearest-rank method.
+    """
+    return ordered[min(len(ordered) - 1, max(0, int(fraction * len(ordered) + 0.5) - 1))]
+
+def parse_int(value, name):
+    """
+    Parses an integer from a query string parameter.
+    """
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise HTTPError(400, "{} must be an integer".format(name))
+
+def is_integer(value):
+    # JSON true and false are decoded as bools, which are ints in Python
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def get_max_size(timeout):
+    """
+    Gets the largest maze length that a worker is expected to generate or solve in half of the timeout, leaving the
+    rest for waiting on a busy worker or a slower machine.
+    :param timeout: The time allowed for each request (in seconds)
+    :return: The maze length, between 2 and MAX_SIZE
+    """
+    return max(2, min(MAX_SIZE, math.isqrt(int(timeout / 2 / SECONDS_PER_CELL))))
+
+def get_size(value, max_size=MAX_SIZE):
+    if not is_integer(value):
+        raise HTTPError(400, "Size must be an integer")
+
+    if not 2 <= value <= max_size:
+        raise HTTPError(400, "Size must be between 2 and {}".format(max_size))
+
+    return value
+
+def get_seed(value):
+    if value is None:
+        return None
+
+    if not is_integer(value):
+        raise HTTPError(400, "Seed must be an integer")
+
+    return value
+
+def get_braid(value):
+    if not is_integer(value) and not isinstance(value, float):
+        raise HTTPError(400, "Braid must be a number")
+
+    braid = float(value)
+
+    if not 0 <= braid <= 1:
+        raise HTTPError(400, "Braid must be between 0 and 1")
+
+    return braid
+
+def get_algorithm(value):
+    if not isinstance(value, str) or value not in SOLVERS:
+        raise HTTPError(400, "Algorithm must be one of: {}".format(", ".join(SOLVERS)))
+
+    return value
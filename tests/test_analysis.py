@@ -0,0 +1,104 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  test_analysis.py
+#
+#  Tests for the structural maze statistics, checked against brute-force computations over the maze graph.
+# ----------------------------------------------------------------------------------------------------------------------
+
+from collections import Counter, deque
+import pytest
+from maze import Maze
+from maze.Maze import EAST, SOUTH
+from maze.analysis import analyze, analyze_walls, get_degrees
+from traversals import MazeGenerator
+
+def generate(length, seed, braid=0.0):
+    maze = Maze(length)
+    MazeGenerator(maze, seed=seed, braid=braid).generate_maze_dfs()
+    return maze
+
+def get_distances(maze, source):
+    distances = {source: 0}
+    queue = deque([source])
+
+    while queue:
+        node = queue.popleft()
+        for neighbor in maze.graph[node]:
+            if neighbor not in distances:
+                distances[neighbor] = distances[node] + 1
+                queue.append(neighbor)
+
+    return distances
+
+def get_corridors(maze):
+    """
+    Splits the maze's edges into corridors: two edges belong to the same corridor when they meet at a simple passage
+    (a cell with two passages other than the entrance and exit).
+    """
+    edges = {frozenset((node, neighbor)) for node, neighbors in maze.graph.items() for neighbor in neighbors}
+    stops = {maze.start, maze.end}
+    parent = {edge: edge for edge in edges}
+
+    def find(edge):
+        while parent[edge] != edge:
+            edge = parent[edge]
+        return edge
+
+    for node, neighbors in maze.graph.items():
+        if len(neighbors) == 2 and node not in stops:
+            first, second = (frozenset((node, neighbor)) for neighbor in neighbors)
+            parent[find(first)] = find(second)
+
+    return Counter(Counter(find(edge) for edge in edges).values())
+
+@pytest.mark.parametrize("braid", [0.0, 0.5, 1.0])
+def test_statistics_match_brute_force(braid):
+    for seed in range(40):
+        maze = generate(8, seed, braid)
+        stats = analyze(maze)
+        degrees = Counter(len(neighbors) for neighbors in maze.graph.values())
+
+        assert stats.dead_ends == degrees[1]
+        assert stats.junctions == degrees[3] + degrees[4]
+        assert stats.loops == sum(degrees[degree] * degree for degree in degrees) // 2 - (len(maze.graph) - 1)
+        assert stats.corridor_lengths == get_corridors(maze)
+        assert stats.solution_length == get_distances(maze, maze.start)[maze.end]
+
+        if braid == 0.0:
+            assert stats.diameter == max(max(get_distances(maze, node).values()) for node in maze.graph)
+
+@pytest.mark.parametrize("braid", [0.5, 1.0])
+def test_corridors_cover_every_edge(braid):
+    # Corridors that loop back to their own junction are counted too, so corridor lengths add up to the edge count
+    for seed in range(150):
+        maze = generate(12, seed, braid)
+        edges = sum(len(neighbors) for neighbors in maze.graph.values()) // 2
+        corridors = analyze(maze).corridor_lengths
+
+        assert sum(length * count for length, count in corridors.items()) == edges
+
+def test_loops_only_count_reachable_cells():
+    # Close off the bottom two rows, with a loop there that the entrance cannot reach
+    maze = generate(6, 2, 0.5)
+    walls = bytearray(maze.get_walls())
+    for x in range(6):
+        walls[3 * 6 + x] &= ~SOUTH
+    walls[4 * 6:] = bytes(12)
+    without_loop = bytes(walls)
+    walls[4 * 6] = EAST | SOUTH
+    walls[4 * 6 + 1] = SOUTH
+    walls[5 * 6] = EAST
+    maze.set_walls(bytes(walls))
+
+    reachable = get_distances(maze, maze.start)
+    edges = sum(len(maze.graph[node]) for node in reachable) // 2
+    loops = analyze_walls(6, bytes(walls), end=0).loops
+
+    assert loops == edges - (len(reachable) - 1)
+    assert loops == analyze_walls(6, without_loop, end=0).loops
+
+def test_degrees_match_graph():
+    maze = generate(10, 3, 0.3)
+    degrees = get_degrees(10, maze.get_walls())
+
+    for node, neighbors in maze.graph.items():
+        assert degrees[node.id] == len(neighbors)
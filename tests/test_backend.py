@@ -0,0 +1,98 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  test_backend.py
+#
+#  Tests for the process backend running jobs in a worker process, and for races running one worker per solver.
+# ----------------------------------------------------------------------------------------------------------------------
+
+import os
+import signal
+from time import sleep, perf_counter
+import pytest
+from maze import Maze
+from traversals import MazeGenerator, ProcessBackend, Race
+
+def wait_for_result(backend, timeout=60):
+    """
+    Polls the backend until a job sends its result, returning that message (or None if the worker died first).
+    """
+    start = perf_counter()
+
+    while perf_counter() - start < timeout:
+        messages = backend.poll()
+
+        for message in messages:
+            if message[0] != "progress":
+                return message
+
+        if not messages and not backend.is_alive():
+            return None
+
+        sleep(0.01)
+
+    raise TimeoutError("No result from the worker")
+
+@pytest.fixture
+def backend():
+    backend = ProcessBackend()
+    yield backend
+    backend.stop()
+
+def test_solve_and_error_messages(backend):
+    maze = Maze(20)
+    MazeGenerator(maze, seed=3).generate_maze_dfs()
+    backend.share(20, maze.get_walls()).write_costs(None)
+
+    backend.submit("bfs", [], observe=False)
+    message = wait_for_result(backend)
+    assert message[0] == "done" and message[2][0] == "bfs"
+
+    backend.submit("unknown", [], observe=False)
+    message = wait_for_result(backend)
+    assert message[0] == "error" and "KeyError" in message[2]
+
+def test_restart_after_worker_dies(backend):
+    maze = Maze(20)
+    MazeGenerator(maze, seed=3).generate_maze_dfs()
+    backend.share(20, maze.get_walls()).write_costs(None)
+
+    backend.submit("bfs", [], observe=False)
+    assert wait_for_result(backend)[0] == "done"
+
+    os.kill(backend.process.pid, signal.SIGKILL)
+    backend.process.join()
+    assert not backend.is_alive()
+
+    backend.restart()
+    backend.submit("a_star", [], observe=False)
+    message = wait_for_result(backend)
+    assert message[0] == "done" and message[2][0] == "a_star"
+
+def test_race_reports_workers_that_die(backend):
+    maze = Maze(20)
+    MazeGenerator(maze, seed=3).generate_maze_dfs()
+    shared = backend.share(20, maze.get_walls())
+    shared.write_costs(None)
+
+    race = Race(shared, ["bfs", "a_star"])
+    assert race.get_exited() == {}
+
+    race.start()
+    os.kill(race.processes["a_star"].pid, signal.SIGKILL)
+
+    try:
+        start = perf_counter()
+        results = {}
+
+        while len(race.get_exited()) < 2 and perf_counter() - start < 60:
+            sleep(0.01)
+
+        # Workers that exited have sent everything they will send
+        exited = race.get_exited()
+        for message in race.poll():
+            if message[0] != "progress":
+                results[message[1]] = message[0]
+
+        assert exited == {"bfs": 0, "a_star": -signal.SIGKILL}
+        assert results == {"bfs": "done"}
+    finally:
+        race.stop()
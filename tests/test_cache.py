@@ -0,0 +1,110 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  test_cache.py
+#
+#  Tests for the solution cache: a maze's fingerprint must follow its edges, cached solutions must only be reused for
+#  the same edges, endpoints and algorithm, and the cache must stay within its size bound.
+# ----------------------------------------------------------------------------------------------------------------------
+
+from maze import Maze, MazeWalls
+from traversals import MazeGenerator, RunMetrics, Solution, SolutionCache, Trace
+
+def build_maze(length, seed):
+    maze = Maze(length)
+    MazeGenerator(maze, seed=seed).generate_maze_dfs()
+
+    return maze
+
+def make_solution(maze):
+    trace = Trace(maze.length)
+    trace.open_walls(maze.get_walls())
+
+    return Solution(trace, RunMetrics())
+
+def test_fingerprint_depends_only_on_the_edges():
+    maze = build_maze(15, 1)
+    copy = Maze.from_walls(15, maze.get_walls())
+
+    assert copy.fingerprint == maze.fingerprint
+    assert build_maze(15, 2).fingerprint != maze.fingerprint
+
+    maze.reset_graph()
+    assert maze.fingerprint == MazeWalls(15).fingerprint
+
+def test_cache_misses_after_the_maze_changes():
+    maze = build_maze(15, 1)
+    cache = SolutionCache()
+    solution = make_solution(maze)
+
+    cache.put(maze, "a_star", solution)
+    assert cache.get(maze, "a_star") is solution
+    assert cache.get(maze, "bfs") is None
+
+    # Opening one more wall changes the fingerprint
+    walls = maze.get_walls()
+    node = next(node for node in maze.nodes if node.neighbors[node.EAST] not in maze.graph[node] + [None])
+    maze.add_edge(node, node.neighbors[node.EAST])
+    assert cache.get(maze, "a_star") is None
+
+    # Moving an endpoint of the original maze
+    maze.set_walls(walls)
+    assert cache.get(maze, "a_star") is solution
+
+    end = maze.end
+    maze.end = maze.get_node(0, 0)
+    assert cache.get(maze, "a_star") is None
+
+    maze.end = end
+    assert cache.get(maze, "a_star") is solution
+
+def test_wall_encodings_share_solutions_with_mazes():
+    maze = build_maze(15, 1)
+    walls = MazeWalls(15, maze.get_walls())
+    cache = SolutionCache()
+    solution = make_solution(maze)
+
+    assert walls.fingerprint == maze.fingerprint
+    assert walls.get_endpoints() == maze.get_endpoints()
+
+    cache.put(walls, "bfs", solution)
+    assert cache.get(maze, "bfs") is solution
+
+    walls.set_walls(build_maze(15, 2).get_walls())
+    assert cache.get(walls, "bfs") is None
+
+def test_least_recently_used_solution_is_evicted():
+    mazes = [build_maze(10, seed) for seed in range(3)]
+    solutions = [make_solution(maze) for maze in mazes]
+
+    # Perfect mazes of the same size have as many edges, so their traces are the same size: 99 wall events and the
+    # wall encoding
+    assert {solution.size for solution in solutions} == {99 * 12 + 100}
+    cache = SolutionCache(max_bytes=2 * solutions[0].size)
+
+    cache.put(mazes[0], "bfs", solutions[0])
+    cache.put(mazes[1], "bfs", solutions[1])
+    cache.get(mazes[0], "bfs")
+    cache.put(mazes[2], "bfs", solutions[2])
+
+    assert cache.get(mazes[0], "bfs") is solutions[0]
+    assert cache.get(mazes[1], "bfs") is None
+    assert cache.get(mazes[2], "bfs") is solutions[2]
+    assert cache.size == cache.max_bytes
+
+    # Storing a solution again replaces it without counting it twice
+    cache.put(mazes[2], "bfs", solutions[2])
+    assert (len(cache.solutions), cache.size) == (2, cache.max_bytes)
+
+def test_solutions_larger_than_the_cache_are_not_stored():
+    mazes = [build_maze(10, 1), build_maze(30, 1)]
+    solutions = [make_solution(maze) for maze in mazes]
+    cache = SolutionCache(max_bytes=2 * solutions[0].size)
+
+    cache.put(mazes[0], "bfs", solutions[0])
+    cache.put(mazes[1], "bfs", solutions[1])
+
+    assert cache.get(mazes[0], "bfs") is solutions[0]
+    assert cache.get(mazes[1], "bfs") is None
+    assert cache.size == solutions[0].size
+
+    cache.clear()
+    assert (cache.get(mazes[0], "bfs"), cache.size) == (None, 0)
@@ -0,0 +1,51 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  test_canvas.py
+#
+#  Tests for showing mazes on the maze view straight from their wall encoding (skipped without PyQt6).
+# ----------------------------------------------------------------------------------------------------------------------
+
+import os
+import pytest
+
+pytest.importorskip("PyQt6.QtWidgets")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication
+from maze import Maze
+from traversals import MazeGenerator
+
+@pytest.fixture(scope="module")
+def canvas():
+    application = QApplication.instance() or QApplication([])
+
+    from interface.mazecanvas import MazeCanvas, WALL
+    canvas = MazeCanvas(12, 240)
+
+    yield canvas, WALL
+
+    canvas.deleteLater()
+    application.processEvents()
+
+def test_walls_match_traced_walls(canvas):
+    view, wall = canvas
+    maze = Maze(12)
+    MazeGenerator(maze, seed=32, braid=0.5).generate_maze_dfs()
+
+    # Open the walls one at a time, as a replayed trace does
+    view.reset(12)
+    for node, neighbors in maze.graph.items():
+        for neighbor in neighbors:
+            view.open_wall(*node.get_coordinates(), *neighbor.get_coordinates())
+    east, south = bytes(view.east), bytes(view.south)
+
+    view.reset(12)
+    view.set_walls(maze.get_walls())
+
+    assert bytes(view.east) == east
+    assert bytes(view.south) == south
+
+    # Every edge of the maze is one open gap
+    edges = sum(len(neighbors) for neighbors in maze.graph.values()) // 2
+    assert len(east) - east.count(wall) + len(south) - south.count(wall) == edges
+
+    assert view.render_detail(0, 0, 12, 12, 5).width() == 12 * 5 + 1
@@ -0,0 +1,118 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  test_export.py
+#
+#  Tests for the streaming PNG and text exporters.
+# ----------------------------------------------------------------------------------------------------------------------
+
+import io
+import struct
+import zlib
+import pytest
+from maze import Maze
+from maze.Maze import EAST, SOUTH
+from maze.export import export_png, export_text, get_marks, read_wall_rows, write_png, write_text, EXPLORED, SOLUTION
+from traversals import MazeGenerator
+
+def read_png(path):
+    """
+    Decodes a palette PNG written by the exporter into its size and rows of palette indices.
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+
+    position = 8
+    compressed = b""
+    width = height = None
+
+    while position < len(data):
+        size, kind = struct.unpack(">I4s", data[position:position + 8])
+        chunk = data[position + 8:position + 8 + size]
+        crc, = struct.unpack(">I", data[position + 8 + size:position + 12 + size])
+        assert zlib.crc32(chunk, zlib.crc32(kind)) == crc
+
+        if kind == b"IHDR":
+            width, height = struct.unpack(">II", chunk[:8])
+        elif kind == b"IDAT":
+            compressed += chunk
+
+        position += 12 + size
+
+    pixels = zlib.decompress(compressed)
+    rows = [pixels[y * (width + 1):(y + 1) * (width + 1)] for y in range(height)]
+
+    # Every scanline uses filter type 0
+    assert all(row[0] == 0 for row in rows)
+
+    return width, height, [row[1:] for row in rows]
+
+def test_text_export_cells(tmp_path):
+    walls = bytes([EAST | SOUTH, 0, 0, 0])
+    path = str(tmp_path / "maze.txt")
+
+    write_text(path, 2, [walls[:2], walls[2:]], [(1, SOLUTION), (2, EXPLORED)])
+
+    with open(path) as file:
+        lines = file.read().splitlines()
+
+    # The gap from the entrance to the solution is drawn as solution, and the gap to the explored cell as explored
+    assert lines == ["#####", "#Soo#", "#.###", "#.#E#", "#####"]
+
+def test_maze_and_wall_stream_exports_match(tmp_path):
+    maze = Maze(12)
+    MazeGenerator(maze, seed=4, braid=0.5).generate_maze_dfs()
+
+    explored = [(x, y) for x in range(12) for y in range(12) if (x + y) % 3 == 0]
+    solution = [(x, 0) for x in range(12)]
+
+    export_png(maze, str(tmp_path / "maze.png"), explored, solution)
+    write_png(str(tmp_path / "walls.png"), 12, read_wall_rows(io.BytesIO(maze.get_walls()), 12),
+              iter(get_marks(12, explored, solution)))
+
+    assert (tmp_path / "maze.png").read_bytes() == (tmp_path / "walls.png").read_bytes()
+
+def test_png_pixels(tmp_path):
+    maze = Maze(5)
+    MazeGenerator(maze, seed=1).generate_maze_dfs()
+    export_png(maze, str(tmp_path / "maze.png"), cell_size=2, wall_size=1)
+
+    width, height, rows = read_png(str(tmp_path / "maze.png"))
+    walls = maze.get_walls()
+
+    assert width == height == 5 * 3 + 1
+
+    for y in range(5):
+        for x in range(5):
+            # Each cell's top-left pixel, and the gap to its east
+            assert rows[1 + 3 * y][1 + 3 * x] != 0
+            if x < 4:
+                assert (rows[1 + 3 * y][3 + 3 * x] != 0) == bool(walls[y * 5 + x] & EAST)
+            if y < 4:
+                assert (rows[3 + 3 * y][1 + 3 * x] != 0) == bool(walls[y * 5 + x] & SOUTH)
+
+def test_unsorted_marks_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        write_text(str(tmp_path / "maze.txt"), 2, [bytes(2), bytes(2)], [(3, EXPLORED), (1, EXPLORED)])
+
+@pytest.mark.parametrize("rows", [[bytes(2)], [bytes(2)] * 3, [bytes(2), bytes(1)]])
+def test_wrong_wall_rows_are_rejected(tmp_path, rows):
+    with pytest.raises(ValueError):
+        write_png(str(tmp_path / "maze.png"), 2, rows)
+
+def test_short_wall_file_is_rejected():
+    with pytest.raises(ValueError):
+        list(read_wall_rows(io.BytesIO(bytes(5)), 3))
+
+def test_text_export_matches_maze_walls(tmp_path):
+    maze = Maze(6)
+    MazeGenerator(maze, seed=9).generate_maze_dfs()
+    export_text(maze, str(tmp_path / "maze.txt"))
+
+    with open(str(tmp_path / "maze.txt")) as file:
+        lines = file.read().splitlines()
+
+    walls = maze.get_walls()
+    for y in range(6):
+        for x in range(5):
+            assert (lines[1 + 2 * y][2 + 2 * x] != "#") == bool(walls[y * 6 + x] & EAST)
@@ -0,0 +1,65 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  test_hierarchy.py
+#
+#  Tests for the hierarchical (HPA*) pathfinding index: paths must be valid and as short as breadth-first search's, on
+#  perfect and braided mazes, for cluster sizes that do and do not divide the maze.
+# ----------------------------------------------------------------------------------------------------------------------
+
+import random
+from collections import deque
+import pytest
+from maze import Maze
+from traversals import HierarchicalIndex, MazeGenerator
+
+def get_distances(maze, source):
+    """
+    Gets the breadth-first distance of every node reachable from the source node, by node ID.
+    """
+    distances = {source.id: 0}
+    queue = deque([source])
+
+    while queue:
+        node = queue.popleft()
+
+        for neighbor in maze.graph[node]:
+            if neighbor.id not in distances:
+                distances[neighbor.id] = distances[node.id] + 1
+                queue.append(neighbor)
+
+    return distances
+
+def is_passage(maze, first, second):
+    return maze.nodes[second] in maze.graph[maze.nodes[first]]
+
+@pytest.mark.parametrize("cluster_size", [4, 7, 16])
+@pytest.mark.parametrize("braid", [0.0, 0.5, 1.0])
+def test_paths_are_as_short_as_breadth_first_search(cluster_size, braid):
+    rng = random.Random(42)
+
+    for seed in range(4):
+        length = rng.randrange(10, 40)
+        maze = Maze(length)
+        MazeGenerator(maze, seed=seed, braid=braid).generate_maze_dfs()
+
+        index = HierarchicalIndex(length, maze.get_walls(), cluster_size)
+
+        for _ in range(10):
+            start, end = rng.randrange(length * length), rng.randrange(length * length)
+            distances = get_distances(maze, maze.nodes[start])
+
+            # Ask twice, so that the second query reuses the refined steps of the first
+            for _ in range(2):
+                path, _ = index.find_path(start, end)
+
+                assert path[0] == start
+                assert path[-1] == end
+                assert len(path) - 1 == distances[end]
+                assert all(is_passage(maze, a, b) for a, b in zip(path, path[1:]))
+
+def test_unreachable_end_has_no_path():
+    length = 12
+    index = HierarchicalIndex(length, bytes(length * length), 4)
+
+    path, _ = index.find_path(0, length * length - 1)
+
+    assert path is None
@@ -0,0 +1,142 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  test_history.py
+#
+#  Tests for the run history: runs are recorded, filtered and aggregated by group, and the command line only accepts
+#  known fields and statistics. Maze statistics are keyed by size, seed and braid factor, and stores from before
+#  braiding are migrated.
+# ----------------------------------------------------------------------------------------------------------------------
+
+import sqlite3
+import sys
+from contextlib import closing
+import pytest
+from maze import Maze
+from maze.analysis import analyze
+from history import RunHistory
+from history.__main__ import main
+from traversals import MazeGenerator, RunMetrics
+
+def get_stats(length, seed, braid):
+    maze = Maze(length)
+    MazeGenerator(maze, seed=seed, braid=braid).generate_maze_dfs()
+
+    return analyze(maze)
+
+def make_metrics(compute, expansions=0):
+    metrics = RunMetrics()
+    metrics.total = compute
+    metrics.expansions = expansions
+
+    return metrics
+
+def record_runs(path):
+    """
+    Records observed and measure-only A* and BFS runs, with one A* run from ten days ago.
+    :return: The history
+    """
+    history = RunHistory(path)
+
+    for compute in (1.0, 2.0, 6.0):
+        history.record("a_star", 50, 1, make_metrics(compute, 100), measure_only=True)
+    history.record("a_star", 50, 2, make_metrics(9.0, 100))
+    history.record("a_star", 100, 3, make_metrics(4.0, 400), measure_only=True)
+    history.record("bfs", 50, 4, make_metrics(3.0, 200), measure_only=True)
+    history.record("a_star", 50, 5, make_metrics(100.0), measure_only=True)
+
+    with closing(sqlite3.connect(path)) as connection, connection:
+        connection.execute("UPDATE runs SET timestamp = timestamp - 10 * 86400 WHERE seed = 5")
+
+    return history
+
+def test_runs_are_queried_by_filter(tmp_path):
+    history = record_runs(str(tmp_path / "history.sqlite3"))
+
+    assert len(history.query()) == 7
+    assert [run["seed"] for run in history.query(days=7)] == [1, 1, 1, 2, 3, 4]
+    assert [run["seed"] for run in history.query(algorithm="a_star", size=50, measure_only=False)] == [2]
+    assert [run["seed"] for run in history.query(algorithm="bfs", measure_only=True)] == [4]
+
+    run = history.query(algorithm="bfs")[0]
+    assert (run["size"], run["compute"], run["expansions"], run["measure_only"]) == (50, 3.0, 200, 1)
+
+def test_runs_are_aggregated_by_group(tmp_path):
+    history = record_runs(str(tmp_path / "history.sqlite3"))
+
+    assert history.aggregate(days=7, measure_only=True) == [
+        (("a_star", 50), 2.0, 3), (("a_star", 100), 4.0, 1), (("bfs", 50), 3.0, 1)
+    ]
+
+    # Observed and measure-only runs are kept apart when grouped by measure_only
+    assert history.aggregate(group_by=("measure_only", "algorithm"), days=7) == [
+        ((0, "a_star"), 9.0, 1), ((1, "a_star"), 3.0, 4), ((1, "bfs"), 3.0, 1)
+    ]
+
+    assert history.aggregate("expansions", "max", ("size",)) == [((50,), 200, 6), ((100,), 400, 1)]
+
+def test_unknown_fields_and_statistics_are_rejected(tmp_path, monkeypatch, capsys):
+    path = str(tmp_path / "history.sqlite3")
+    history = record_runs(path)
+
+    for arguments in (("runs",), ("compute", "mode"), ("compute", "median", ("seed",))):
+        with pytest.raises(ValueError):
+            history.aggregate(*arguments)
+
+    for option in ("--field", "--stat"):
+        monkeypatch.setattr(sys, "argv", ["history", "--db", path, option, "runs"])
+
+        with pytest.raises(SystemExit) as error:
+            main()
+
+        assert error.value.code == 2
+        assert "invalid choice" in capsys.readouterr().err
+
+    monkeypatch.setattr(sys, "argv", ["history", "--db", path, "--field", "expansions", "--stat", "min", "--days", "7"])
+    main()
+
+    assert capsys.readouterr().out.split() == [
+        "a_star", "50", "100.0000", "(n=4)", "a_star", "100", "400.0000", "(n=1)", "bfs", "50", "200.0000", "(n=1)"
+    ]
+
+def test_braided_mazes_do_not_replace_perfect_mazes(tmp_path):
+    history = RunHistory(str(tmp_path / "history.sqlite3"))
+
+    history.record_maze(15, 1, get_stats(15, 1, 0.0))
+    history.record_maze(15, 1, get_stats(15, 1, 1.0), 1.0)
+    history.record_mazes(15, [(seed, get_stats(15, seed, 1.0)) for seed in (2, 3)], 1.0)
+
+    perfect, braided = history.summarize_mazes(15)
+
+    assert (perfect["braid"], perfect["count"], perfect["loops"]) == (0.0, 1, 0)
+    assert (braided["braid"], braided["count"]) == (1.0, 3)
+    assert braided["loops"] > 0 and braided["dead_ends"] < perfect["dead_ends"]
+    assert [row["count"] for row in history.summarize_mazes(braid=1.0)] == [3]
+
+def test_stores_from_before_braiding_are_migrated(tmp_path):
+    path = str(tmp_path / "history.sqlite3")
+
+    with closing(sqlite3.connect(path)) as connection, connection:
+        connection.execute("""
+            CREATE TABLE mazes (
+                size INTEGER NOT NULL,
+                seed INTEGER NOT NULL,
+                dead_ends INTEGER NOT NULL,
+                junctions INTEGER NOT NULL,
+                branching_factor REAL NOT NULL,
+                mean_corridor REAL NOT NULL,
+                diameter INTEGER NOT NULL,
+                solution_length INTEGER NOT NULL,
+                PRIMARY KEY (size, seed)
+            )
+        """)
+        connection.execute("INSERT INTO mazes VALUES (25, 7, 40, 30, 1.2, 3.5, 120, 80)")
+
+    history = RunHistory(path)
+    history.record_maze(25, 7, get_stats(25, 7, 0.5), 0.5)
+
+    perfect, braided = history.summarize_mazes(25)
+
+    assert (perfect["braid"], perfect["loops"], perfect["dead_ends"], perfect["diameter"]) == (0.0, 0, 40, 120)
+    assert braided["braid"] == 0.5
+
+    # Opening the store again leaves the migrated table alone
+    assert len(RunHistory(path).summarize_mazes()) == 2
@@ -0,0 +1,46 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  test_maze.py
+#
+#  Tests for building mazes: neighbor slots of nodes, and the garbage collector's state around node creation.
+# ----------------------------------------------------------------------------------------------------------------------
+
+import gc
+import pytest
+from maze import Maze, Node
+
+def test_add_neighbor_fills_the_slot_for_its_direction():
+    node = Node(1, 1, index=4)
+
+    for x, y, slot in ((1, 0, Node.NORTH), (2, 1, Node.EAST), (1, 2, Node.SOUTH), (0, 1, Node.WEST)):
+        neighbor = Node(x, y)
+
+        assert node.add_neighbor(neighbor)
+        assert node.neighbors[slot] is neighbor
+        assert not node.add_neighbor(Node(x, y))
+
+    assert node.id == 4
+
+def test_add_neighbor_rejects_nodes_that_are_not_adjacent():
+    node = Node(1, 1)
+
+    for x, y in ((1, 1), (2, 2), (3, 1), (1, -1)):
+        with pytest.raises(ValueError, match="not adjacent"):
+            node.add_neighbor(Node(x, y))
+
+    assert node.neighbors == [None, None, None, None]
+
+def test_building_a_maze_restores_the_collector_state():
+    collecting = gc.isenabled()
+
+    try:
+        gc.enable()
+        Maze(10)
+        assert gc.isenabled()
+
+        # A caller that disabled the collector keeps it disabled
+        gc.disable()
+        Maze(10)
+        assert not gc.isenabled()
+    finally:
+        if collecting:
+            gc.enable()
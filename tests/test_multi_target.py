@@ -0,0 +1,79 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  test_multi_target.py
+#
+#  Tests for multi-source, multi-goal search: the pair found must be the nearest start-goal pair, by breadth-first
+#  distance, on perfect and braided mazes.
+# ----------------------------------------------------------------------------------------------------------------------
+
+import random
+from collections import deque
+import pytest
+from maze import Maze
+from traversals import MazeGenerator, MultiTargetSearch
+
+def get_distances(maze, sources):
+    """
+    Gets the breadth-first distance of every node reachable from the nearest of the source nodes.
+    """
+    distances = {source: 0 for source in sources}
+    queue = deque(sources)
+
+    while queue:
+        node = queue.popleft()
+
+        for neighbor in maze.graph[node]:
+            if neighbor not in distances:
+                distances[neighbor] = distances[node] + 1
+                queue.append(neighbor)
+
+    return distances
+
+@pytest.mark.parametrize("method", ["multi_bfs", "multi_a_star"])
+@pytest.mark.parametrize("braid", [0.0, 0.5, 1.0])
+def test_nearest_pair_matches_breadth_first_search(method, braid):
+    rng = random.Random(40)
+
+    for seed in range(10):
+        maze = Maze(rng.randrange(5, 30))
+        MazeGenerator(maze, seed=seed, braid=braid).generate_maze_dfs()
+
+        nodes = maze.nodes
+        starts = rng.sample(nodes, rng.randrange(1, 5))
+        goals = rng.sample(nodes, rng.randrange(1, 5))
+
+        search = MultiTargetSearch(maze, starts, goals)
+        getattr(search, method)()
+
+        distances = get_distances(maze, starts)
+        nearest = min(distances[goal] for goal in goals)
+
+        assert search.start in starts
+        assert search.goal in goals
+        assert len(search.path) - 1 == nearest
+
+        # The path is a walk through the maze from the start to the goal
+        assert search.path[0] is search.start
+        assert search.path[-1] is search.goal
+        assert all(b in maze.graph[a] for a, b in zip(search.path, search.path[1:]))
+
+def test_defaults_to_the_maze_endpoints():
+    maze = Maze(20)
+    MazeGenerator(maze, seed=3).generate_maze_dfs()
+
+    search = MultiTargetSearch(maze)
+    search.multi_bfs()
+
+    assert (search.start, search.goal) == (maze.start, maze.end)
+    assert len(search.path) - 1 == get_distances(maze, [maze.start])[maze.end]
+
+@pytest.mark.parametrize("method", ["multi_bfs", "multi_a_star"])
+def test_empty_starts_or_goals_find_no_path(method):
+    maze = Maze(10)
+    MazeGenerator(maze, seed=3).generate_maze_dfs()
+
+    for starts, goals in (([maze.start], []), ([], [maze.end]), ([], [])):
+        search = MultiTargetSearch(maze, starts, goals)
+        _, metrics = getattr(search, method)()
+
+        assert (search.start, search.goal, search.path) == (None, None, [])
+        assert metrics.expansions == 0
@@ -0,0 +1,20 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  test_profiling.py
+#
+#  Tests for the run profiler's output files.
+# ----------------------------------------------------------------------------------------------------------------------
+
+from traversals.profiling import RunProfiler
+
+def test_profile_returns_result(tmp_path):
+    assert RunProfiler(str(tmp_path)).profile(sum, "sum", [1, 2, 3]) == 6
+
+def test_runs_with_same_tag_keep_separate_files(tmp_path):
+    profiler = RunProfiler(str(tmp_path))
+
+    # Back-to-back runs with the same tag finish within the same second
+    for _ in range(3):
+        profiler.profile(sum, "bfs_10x10", [1, 2])
+
+    assert len(list(tmp_path.glob("bfs_10x10_*.pstats"))) == 3
+    assert len(list(tmp_path.glob("bfs_10x10_*.collapsed"))) == 3
@@ -0,0 +1,185 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  test_service.py
+#
+#  Tests for the HTTP service: request validation, the error statuses of malformed requests, solving mazes whose exit
+#  cannot be reached, size limits that fit the timeout, and recovering from workers that die.
+# ----------------------------------------------------------------------------------------------------------------------
+
+import asyncio
+import json
+import os
+import warnings
+import pytest
+from maze import Maze
+from maze.Maze import EAST, SOUTH, check_walls
+from service import MazeService, jobs
+from service.server import MAX_SIZE, get_braid, get_max_size, get_seed, get_size
+from service.http import HTTPError
+
+async def send(port, method, target, body=b"", headers=None):
+    """
+    Sends one request to the service and reads the response.
+    :return: The status and the decoded JSON body
+    """
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+    head = {"Content-Length": len(body), "Connection": "close"}
+    head.update(headers or {})
+    lines = ["{} {} HTTP/1.1".format(method, target)] + ["{}: {}".format(name, value) for name, value in head.items()]
+
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+
+    response = await reader.read()
+    writer.close()
+
+    head, _, content = response.partition(b"\r\n\r\n")
+    status = int(head.split()[1])
+
+    return status, json.loads(content) if content else None
+
+def run_service(requests, **options):
+    """
+    Starts a service with one worker, sends it each (method, target, body, headers) request in turn, and then asks it
+    for its statistics.
+    :return: The (status, data) responses, followed by the statistics
+    """
+    async def main():
+        service = MazeService(workers=1, **options)
+        server = await service.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+
+        try:
+            responses = [await send(port, *request) for request in requests]
+            _, stats = await send(port, "GET", "/stats")
+        finally:
+            await service.close()
+
+        return responses, stats
+
+    return asyncio.run(main())
+
+def get_solvable_walls(size):
+    return Maze.from_walls(size, jobs.generate(size, 1)[1]).get_walls()
+
+def test_check_walls_rejects_edges_leaving_the_maze():
+    size = 4
+    walls = bytearray(get_solvable_walls(size))
+
+    check_walls(size, bytes(walls))
+
+    for cell, bit in ((size - 1, EAST), ((size - 1) * size, SOUTH), (0, 4)):
+        broken = bytearray(walls)
+        broken[cell] |= bit
+
+        with pytest.raises(ValueError):
+            check_walls(size, bytes(broken))
+
+    with pytest.raises(ValueError):
+        check_walls(size, bytes(walls[:-1]))
+
+def test_parameters_require_json_integers():
+    assert get_size(25) == 25
+    assert get_seed(7) == 7
+    assert get_braid(1) == 1.0
+
+    for getter, value in ((get_size, "25"), (get_size, 2.5), (get_size, True), (get_size, 1), (get_seed, "7"),
+                          (get_seed, False), (get_braid, "0.5"), (get_braid, 2)):
+        with pytest.raises(HTTPError) as error:
+            getter(value)
+
+        assert error.value.status == 400
+
+def test_sizes_fit_the_timeout():
+    # Sizes beyond MAX_SIZE take too much memory, whatever the timeout
+    assert get_max_size(30.0) == get_max_size(1000.0) == MAX_SIZE == 1000
+    assert get_max_size(10.0) == 632
+    assert get_max_size(0.0) == 2
+
+    assert get_size(632, get_max_size(10.0)) == 632
+    with pytest.raises(HTTPError, match="between 2 and 632"):
+        get_size(633, get_max_size(10.0))
+
+    requests = [
+        ("POST", "/generate", json.dumps({"size": 633, "seed": 1}).encode()),
+        ("POST", "/solve?size=633&algorithm=bfs", bytes(633 * 633), {"Content-Type": "application/octet-stream"})
+    ]
+
+    responses, stats = run_service(requests, timeout=10.0)
+
+    assert [status for status, _ in responses] == [400, 400]
+    assert stats["max_size"] == 632
+
+def test_unreachable_exit_has_no_path():
+    for algorithm in ("dfs", "bfs", "a_star", "dijkstra", "weighted_a_star", "jps"):
+        result = jobs.solve(5, algorithm, walls=bytes(25))
+
+        assert result["path_length"] == -1
+        assert result["path"] == []
+
+def test_malformed_requests_are_rejected():
+    size = 5
+    walls = bytearray(get_solvable_walls(size))
+    walls[size - 1] |= EAST
+    binary = {"Content-Type": "application/octet-stream"}
+
+    requests = [
+        ("POST", "/solve?size=5", bytes(walls), binary),
+        ("POST", "/solve?size=5", bytes(size * size - 1), binary),
+        ("POST", "/solve?size=five", bytes(size * size), binary),
+        ("POST", "/solve", json.dumps({"size": "5", "seed": 1}).encode()),
+        ("POST", "/batch-solve", json.dumps({"size": 5, "seeds": [1, "x"]}).encode()),
+        ("POST", "/batch-solve", json.dumps({"size": 5, "seeds": [1, 2], "algorithms": ["bfs", "dfs"]}).encode()),
+        ("POST", "/batch-solve", json.dumps({"size": 5, "seeds": [1], "algorithms": [["bfs"]]}).encode()),
+        ("POST", "/generate", b"", {"Content-Length": "-1"}),
+        ("POST", "/generate", b"", {"Content-Length": "many"}),
+        ("POST", "/generate", b"", {"Content-Length": str(1 << 30)})
+    ]
+
+    with warnings.catch_warnings():
+        # A batch rejected part way through validation must not leave unawaited runs behind
+        warnings.simplefilter("error", RuntimeWarning)
+        responses, stats = run_service(requests, max_queue=3)
+
+    assert [status for status, _ in responses] == [400] * 9 + [413]
+    assert all("error" in data for _, data in responses)
+    assert stats["pending"] == 0
+
+def test_unreachable_exit_is_solved_over_http():
+    requests = [
+        ("POST", "/solve?size=5&algorithm=bfs", bytes(25), {"Content-Type": "application/octet-stream"}),
+        ("GET", "/missing"),
+        ("GET", "/solve")
+    ]
+
+    responses, stats = run_service(requests)
+
+    assert [status for status, _ in responses] == [200, 404, 405]
+    assert responses[0][1]["path_length"] == -1
+
+    # Only the service's own endpoints have latencies
+    assert set(stats["latency"]) == {"/solve"}
+
+def test_pool_is_replaced_after_a_worker_dies():
+    async def main():
+        service = MazeService(workers=1)
+        server = await service.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+
+        try:
+            # The only worker exits mid-job, breaking the pool
+            with pytest.raises(HTTPError) as error:
+                await service.run(os._exit, 1)
+
+            response = await send(port, "POST", "/generate", json.dumps({"size": 5, "seed": 1}).encode())
+            _, stats = await send(port, "GET", "/stats")
+        finally:
+            await service.close()
+
+        return error.value, response, stats
+
+    error, (status, data), stats = asyncio.run(main())
+
+    assert (error.status, error.headers) == (503, {"Retry-After": "1"})
+    assert (status, data["size"]) == (200, 5)
+    assert (stats["pool_restarts"], stats["pending"]) == (1, 0)
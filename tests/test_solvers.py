@@ -0,0 +1,69 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  test_solvers.py
+#
+#  Tests for the solvers on perfect and braided mazes: every solver must find a path from the entrance to the exit, and
+#  the shortest-path solvers must find one as short as breadth-first search's.
+# ----------------------------------------------------------------------------------------------------------------------
+
+import random
+from collections import deque
+import pytest
+from maze import Maze
+from traversals import MazeGenerator
+from traversals.backend import SOLVERS
+
+# Solvers that may find longer paths than necessary on mazes with loops: depth-first search, and the original A*, whose
+# path cost grows by only 0.01 per step, so that it is led almost entirely by the distance to the exit
+UNGUARANTEED = {"dfs", "a_star"}
+
+def get_distance(maze):
+    """
+    Gets the breadth-first distance from the maze's entrance to its exit.
+    """
+    distances = {maze.start: 0}
+    queue = deque([maze.start])
+
+    while queue:
+        node = queue.popleft()
+
+        for neighbor in maze.graph[node]:
+            if neighbor not in distances:
+                distances[neighbor] = distances[node] + 1
+                queue.append(neighbor)
+
+    return distances[maze.end]
+
+def solve(maze, algorithm):
+    """
+    Solves a maze.
+    :return: The nodes of the solution path from the entrance to the exit
+    """
+    path = []
+
+    def set_color(x, y, color):
+        if color == "green":
+            path.append(maze.get_node(x, y))
+
+    solver_class, method = SOLVERS[algorithm]
+    getattr(solver_class(maze, set_color), method)()
+
+    # Solvers color the path between the endpoints from the exit back to the entrance
+    return [maze.start] + path[::-1] + [maze.end]
+
+@pytest.mark.parametrize("algorithm", sorted(SOLVERS))
+@pytest.mark.parametrize("braid", [0.0, 0.25, 0.5, 1.0])
+def test_paths_match_breadth_first_search(algorithm, braid):
+    rng = random.Random(43)
+
+    for seed in range(15):
+        maze = Maze(rng.randrange(3, 30))
+        MazeGenerator(maze, seed=seed, braid=braid).generate_maze_dfs()
+
+        path = solve(maze, algorithm)
+
+        assert all(b in maze.graph[a] for a, b in zip(path, path[1:]))
+        assert len(set(path)) == len(path)
+
+        # Perfect mazes have a single path, so every solver finds the shortest
+        if algorithm not in UNGUARANTEED or braid == 0.0:
+            assert len(path) - 1 == get_distance(maze)
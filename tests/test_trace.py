@@ -0,0 +1,153 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  test_trace.py
+#
+#  Tests for run traces: a saved trace must load back with the same events, so that replaying it rebuilds the same maze
+#  and solution, and damaged files must be rejected.
+# ----------------------------------------------------------------------------------------------------------------------
+
+import pytest
+from maze import Maze
+from traversals import BreadthFirstSearch, MazeGenerator, Trace
+from traversals.trace import COLOR, HEADER, MAGIC, RESET, WALL
+
+def record(length, seed):
+    """
+    Records the generation of a braided maze and its solution.
+    :return: The maze and the trace
+    """
+    maze = Maze(length)
+    trace = Trace(length, "bfs")
+    trace.reset_colors("lightgray")
+    trace.mark_start()
+
+    MazeGenerator(maze, seed=seed, braid=0.5).generate_maze_dfs()
+    for node, neighbors in maze.graph.items():
+        for neighbor in neighbors:
+            if neighbor.id > node.id:
+                trace.open_wall(*node.get_coordinates(), *neighbor.get_coordinates())
+
+    trace.reset_colors("lightgray")
+    BreadthFirstSearch(maze, trace.set_color).bfs()
+
+    return maze, trace
+
+def test_saved_trace_loads_unchanged(tmp_path):
+    maze, trace = record(20, 31)
+    path = str(tmp_path / "run.trace")
+
+    trace.save(path)
+    loaded = Trace.load(path)
+
+    assert (loaded.length, loaded.algorithm, loaded.start) == (trace.length, trace.algorithm, trace.start)
+    assert loaded.colors == trace.colors
+    assert loaded.events == trace.events
+    assert loaded.complete
+
+    # Replaying the loaded trace rebuilds the maze and its solution
+    replayed = Maze(20)
+    for x1, y1, x2, y2 in loaded.get_walls():
+        replayed.add_edge(replayed.get_node(x1, y1), replayed.get_node(x2, y2))
+
+    assert replayed.fingerprint == maze.fingerprint
+    assert loaded.encode_walls() == maze.get_walls()
+    assert loaded.get_cell_colors() == trace.get_cell_colors()
+    assert "green" in loaded.get_cell_colors().values()
+
+def test_whole_maze_is_opened_from_its_walls(tmp_path):
+    maze = Maze(12)
+    MazeGenerator(maze, seed=5, braid=0.5).generate_maze_dfs()
+    edges = [
+        node.get_coordinates() + neighbor.get_coordinates()
+        for node, neighbors in maze.graph.items() for neighbor in neighbors if neighbor.id > node.id
+    ]
+
+    trace = Trace(12, "bfs")
+    trace.open_walls(maze.get_walls())
+    trace.reset_colors("lightgray")
+    trace.mark_start()
+
+    assert sorted(trace.get_walls()) == sorted(edges)
+    assert (trace.walls, trace.wall_events) == (maze.get_walls(), len(edges))
+    assert trace.encode_walls() == trace.encode_walls(len(edges)) == maze.get_walls()
+
+    # Loaded traces keep the maze they start from, for replaying
+    path = str(tmp_path / "solve.trace")
+    trace.save(path)
+    loaded = Trace.load(path)
+
+    assert (loaded.walls, loaded.wall_events) == (trace.walls, trace.wall_events)
+
+def test_trace_without_colors_loads(tmp_path):
+    trace = Trace(5)
+    trace.open_wall(0, 0, 1, 0)
+    path = str(tmp_path / "walls.trace")
+
+    trace.save(path)
+    loaded = Trace.load(path)
+
+    assert loaded.colors == []
+    assert loaded.get_walls() == [(0, 0, 1, 0)]
+
+def test_damaged_files_are_rejected(tmp_path):
+    _, trace = record(10, 1)
+    path = tmp_path / "run.trace"
+    trace.save(str(path))
+    data = path.read_bytes()
+
+    path.write_bytes(data[:-4])
+    with pytest.raises(ValueError, match="Truncated"):
+        Trace.load(str(path))
+
+    path.write_bytes(b"NOTATRCE" + data[8:])
+    with pytest.raises(ValueError, match="Not a maze trace"):
+        Trace.load(str(path))
+
+def test_truncated_header_is_rejected(tmp_path):
+    path = tmp_path / "short.trace"
+    path.write_bytes(MAGIC + bytes(HEADER.size - 1))
+
+    with pytest.raises(ValueError, match="Truncated"):
+        Trace.load(str(path))
+
+@pytest.mark.parametrize("event", [
+    (COLOR, 25, 0),
+    (COLOR, -1, 0),
+    (COLOR, 3, 7),
+    (WALL, 24, 25),
+    (WALL, 4, 5),
+    (WALL, 0, 6),
+    (RESET, 9, 0),
+    (7, 0, 0)
+])
+def test_events_outside_the_maze_are_rejected(tmp_path, event):
+    trace = Trace(5)
+    trace.reset_colors("lightgray")
+    trace.open_wall(0, 0, 1, 0)
+    trace.events.extend(event)
+    path = str(tmp_path / "bad.trace")
+    trace.save(path)
+
+    with pytest.raises(ValueError, match="invalid event 2"):
+        Trace.load(path)
+
+def test_start_past_the_events_is_rejected(tmp_path):
+    trace = Trace(5)
+    trace.open_wall(0, 0, 0, 1)
+    trace.start = 2
+    path = str(tmp_path / "start.trace")
+    trace.save(path)
+
+    with pytest.raises(ValueError, match="starts at event 2 of 1"):
+        Trace.load(path)
+
+def test_oversized_and_empty_mazes_are_rejected(tmp_path):
+    path = str(tmp_path / "large.trace")
+    Trace(5000).save(path)
+
+    with pytest.raises(ValueError, match="larger than 1000x1000"):
+        Trace.load(path, 1000)
+    assert Trace.load(path).length == 5000
+
+    Trace(0).save(path)
+    with pytest.raises(ValueError, match="invalid maze length"):
+        Trace.load(path)
@@ -0,0 +1,100 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  test_weighted.py
+#
+#  Tests for weighted terrain: the bucket-queue Dijkstra and A* must find the cheapest path found by a heap-based
+#  Dijkstra, and cached solutions must not be reused once a maze's terrain changes.
+# ----------------------------------------------------------------------------------------------------------------------
+
+import heapq
+import random
+import pytest
+from maze import Maze
+from maze.terrain import generate_costs
+from traversals import MazeGenerator, RunMetrics, Solution, SolutionCache, Trace, WeightedSearch
+
+def get_cheapest_cost(maze):
+    """
+    Gets the cost of the cheapest path from the maze's start to its end, with a heap-based Dijkstra.
+    """
+    distances = {maze.start: 0}
+    open_list = [(0, maze.start.id, maze.start)]
+
+    while open_list:
+        distance, _, node = heapq.heappop(open_list)
+
+        if node == maze.end:
+            return distance
+
+        if distance > distances[node]:
+            continue
+
+        for neighbor in maze.graph[node]:
+            g_new = distance + maze.get_cost(neighbor)
+
+            if g_new < distances.get(neighbor, float("inf")):
+                distances[neighbor] = g_new
+                heapq.heappush(open_list, (g_new, neighbor.id, neighbor))
+
+    return -1
+
+def build_maze(length, seed, braid, max_cost):
+    maze = Maze(length)
+    MazeGenerator(maze, seed=seed, braid=braid).generate_maze_dfs()
+    maze.set_costs(generate_costs(length, seed, max_cost, scale=4))
+
+    return maze
+
+@pytest.mark.parametrize("method", ["dijkstra", "weighted_a_star"])
+@pytest.mark.parametrize("braid", [0.0, 0.5, 1.0])
+def test_cheapest_path_matches_heap_dijkstra(method, braid):
+    rng = random.Random(41)
+
+    for seed in range(10):
+        maze = build_maze(rng.randrange(5, 30), seed, braid, rng.choice([1, 2, 9, 255]))
+
+        path = []
+
+        def set_color(x, y, color):
+            if color == "green":
+                path.append(maze.get_node(x, y))
+
+        search = WeightedSearch(maze, set_color)
+        getattr(search, method)()
+
+        assert search.path_cost == get_cheapest_cost(maze)
+
+        # The colored path, together with the end, costs exactly the reported path cost
+        assert len(set(path)) == len(path)
+        assert sum(maze.get_cost(node) for node in path) + maze.get_cost(maze.end) == search.path_cost
+
+def test_unit_costs_match_path_length():
+    maze = Maze(20)
+    MazeGenerator(maze, seed=5, braid=0.5).generate_maze_dfs()
+
+    search = WeightedSearch(maze)
+    search.dijkstra()
+
+    assert search.path_cost == get_cheapest_cost(maze)
+
+def test_cache_misses_after_the_terrain_changes():
+    maze = build_maze(12, 1, 0.5, 9)
+    cache = SolutionCache()
+    solution = Solution(Trace(maze.length, "dijkstra"), RunMetrics())
+
+    cache.put(maze, "dijkstra", solution)
+    assert cache.get(maze, "dijkstra") is solution
+
+    costs = maze.costs
+    changed = bytearray(costs)
+    changed[0] = changed[0] % 9 + 1
+
+    maze.set_costs(changed)
+    assert cache.get(maze, "dijkstra") is None
+
+    maze.set_costs(None)
+    assert cache.get(maze, "dijkstra") is None
+
+    # Restoring the terrain finds the original solution again
+    maze.set_costs(costs)
+    assert cache.get(maze, "dijkstra") is solution
+    assert (cache.hits, cache.misses) == (2, 2)
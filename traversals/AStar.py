@@ -5,15 +5,16 @@
 # ----------------------------------------------------------------------------------------------------------------------
 
 import heapq
-from time import sleep
-from traversals import runtime
+from traversals import runtime, RunMetrics
 
 class AStar:
-    def __init__(self, maze, set_color, slow_factor=None):
+    def __init__(self, maze, set_color=None, slow_factor=None):
         self.maze = maze.graph
+        self.nodes = maze.nodes
         self.start = maze.start
         self.end = maze.end
-        self.set_color = set_color
+        self.metrics = RunMetrics()
+        self.set_color = self.metrics.observe(set_color)
         self.slow_factor = slow_factor
 
     def calculate_h_value(self, node):
@@ -26,39 +27,35 @@ class AStar:
         # Calculate Euclidean distance to destination node
         return ((x_node - x_dest) ** 2 + (y_node - y_dest) ** 2) ** 0.5
 
-    def trace_path(self, node_details):
+    def trace_path(self, parent):
         # Set current node to the destination node's parent
-        current = node_details[self.end].parent
+        current = parent[self.end.id]
 
-        while node_details[current].parent is not None:
+        while parent[current.id] is not None:
             # Get node coordinates
             x, y = current.get_coordinates()
 
-            if current != self.start:
+            if (self.set_color is not None) & (current != self.start):
                 self.set_color(x, y, "green")
             if self.slow_factor is not None:
-                sleep(self.slow_factor)
+                self.metrics.pace(self.slow_factor)
 
             # Set current to next node
-            current = node_details[current].parent
+            current = parent[current.id]
 
     @runtime
     def a_star(self):
-        # Initialize closed list (for visited nodes)
-        closed_list = {}
-        for node in self.maze.keys():
-            closed_list[node] = False
+        # Initialize closed list (for visited nodes), indexed by node ID
+        closed_list = bytearray(len(self.nodes))
 
-        # Initialize node details
-        node_details = {}
-
-        for node in self.maze.keys():
-            node_details[node] = Node()
+        # Initialize node details (f and g values and parent nodes), indexed by node ID
+        f_values = [float("inf")] * len(self.nodes)
+        g_values = [float("inf")] * len(self.nodes)
+        parent = [None] * len(self.nodes)
 
         # Initialize details for source node
-        node_details[self.start].f = 0
-        node_details[self.start].g = 0
-        node_details[self.start].h = 0
+        f_values[self.start.id] = 0
+        g_values[self.start.id] = 0
 
         # Initialize counter for breaking ties for pushing to heap
         counter = 0
@@ -73,50 +70,43 @@ class AStar:
             node = heapq.heappop(open_list)[2]
 
             # Mark the node as visited
-            closed_list[node] = True
+            closed_list[node.id] = True
+            self.metrics.expansions += 1
 
             # Toggle tile color
             x, y = node.get_coordinates()
-            if (node != self.start) & (node != self.end):
+            if (self.set_color is not None) & (node != self.start) & (node != self.end):
                 self.set_color(x, y, "skyblue")
 
             if self.slow_factor is not None:
-                sleep(self.slow_factor)
+                self.metrics.pace(self.slow_factor)
 
             # Check neighbor nodes
             for neighbor in self.maze[node]:
                 # If the neighbor has not been visited
-                if not closed_list[neighbor]:
+                if not closed_list[neighbor.id]:
                     # If the node is the destination
                     if neighbor == self.end:
                         # Set the parent of the destination node
-                        node_details[neighbor].parent = node
+                        parent[neighbor.id] = node
 
                         # Trace path from source to destination
-                        self.trace_path(node_details)
+                        self.trace_path(parent)
 
                         return
                     else:
                         # Calculate new f, g, and h values
-                        g_new = node_details[node].g + 0.01
+                        g_new = g_values[node.id] + 0.01
                         h_new = self.calculate_h_value(neighbor)
                         f_new = g_new + h_new
 
                         # If the node is not in the open list or the new f value is smaller
-                        if node_details[neighbor].f == float("inf") or node_details[neighbor].f > f_new:
+                        if f_values[neighbor.id] > f_new:
                             # Add node to the open list
                             heapq.heappush(open_list, (f_new, counter, neighbor))
                             counter += 1
 
                             # Update node details
-                            node_details[neighbor].g = g_new
-                            node_details[neighbor].h = h_new
-                            node_details[neighbor].f = f_new
-                            node_details[neighbor].parent = node
-
-class Node:
-    def __init__(self):
-        self.parent = None
-        self.f = float("inf")
-        self.g = float("inf")
-        self.h = 0
+                            g_values[neighbor.id] = g_new
+                            f_values[neighbor.id] = f_new
+                            parent[neighbor.id] = node
@@ -5,50 +5,47 @@
 # ----------------------------------------------------------------------------------------------------------------------
 
 from collections import deque
-from time import sleep
-from traversals import runtime
+from traversals import runtime, RunMetrics
 
 class BreadthFirstSearch:
-    def __init__(self, maze, set_color, slow_factor=None):
+    def __init__(self, maze, set_color=None, slow_factor=None):
         self.maze = maze.graph
+        self.nodes = maze.nodes
         self.start = maze.start
         self.end = maze.end
         self.reached = False
-        self.set_color = set_color
+        self.metrics = RunMetrics()
+        self.set_color = self.metrics.observe(set_color)
         self.slow_factor = slow_factor
 
     @runtime
     def bfs(self):
-        # Create a boolean visited dictionary
-        visited = {}
-        for vertex in self.maze.keys():
-            visited[vertex] = False
-
-        # Create a dictionary for storing parent nodes
-        parent = {}
-        for vertex in self.maze.keys():
-            parent[vertex] = None
+        # Create a visited flag and a parent node for each node, indexed by node ID
+        visited = bytearray(len(self.nodes))
+        parent = [None] * len(self.nodes)
 
         # Create a queue for nodes
         queue = deque()
 
         # Visit the starting node and enqueue
-        visited[self.start] = True
+        visited[self.start.id] = True
         queue.append(self.start)
 
         current = None
 
-        # Iterate through the queue, visiting nodes and enqueuing neighbors
-        while not self.reached:
+        # Iterate through the queue, visiting nodes and enqueuing neighbors, until the goal is found or every reachable
+        # node has been visited
+        while len(queue) > 0:
             current = queue.popleft()
+            self.metrics.expansions += 1
 
             # Toggle tile color
             x, y = current.get_coordinates()
-            if (current != self.start) & (current != self.end):
+            if (self.set_color is not None) & (current != self.start) & (current != self.end):
                 self.set_color(x, y, "skyblue")
 
             if self.slow_factor is not None:
-                sleep(self.slow_factor)
+                self.metrics.pace(self.slow_factor)
 
             # Check if the node is the goal
             if current == self.end:
@@ -59,21 +56,25 @@ class BreadthFirstSearch:
             # Visit neighboring nodes
             for neighbor in self.maze[current]:
                 # If neighbor has not been visited
-                if not visited[neighbor]:
+                if not visited[neighbor.id]:
                     # Mark parent node for this neighbor
-                    parent[neighbor] = current
+                    parent[neighbor.id] = current
                     # Visit neighbor and enqueue
-                    visited[neighbor] = True
+                    visited[neighbor.id] = True
                     queue.append(neighbor)
 
+        # The goal is unreachable, so there is no path to backtrack along
+        if not self.reached:
+            return
+
         # Backtrack along the path
-        while parent[current] is not None:
-            current = parent[current]
+        while parent[current.id] is not None:
+            current = parent[current.id]
 
             # Get tile coordinates
             x, y = current.get_coordinates()
 
-            if current != self.start:
+            if (self.set_color is not None) & (current != self.start):
                 self.set_color(x, y, "green")
             if self.slow_factor is not None:
-                sleep(self.slow_factor)
+                self.metrics.pace(self.slow_factor)
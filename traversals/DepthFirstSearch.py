@@ -4,55 +4,72 @@
 #  Python class for performing a Depth First Search (DFS) on an adjacency list graph.
 # ----------------------------------------------------------------------------------------------------------------------
 
-from time import sleep
-from traversals import runtime
+from traversals import runtime, RunMetrics
 
 class DepthFirstSearch:
-    def __init__(self, maze, set_color, slow_factor=None):
+    def __init__(self, maze, set_color=None, slow_factor=None):
         self.maze = maze.graph
+        self.nodes = maze.nodes
         self.start = maze.start
         self.end = maze.end
         self.reached = [False]
-        self.set_color = set_color
+        self.metrics = RunMetrics()
+        self.set_color = self.metrics.observe(set_color)
         self.slow_factor = slow_factor
 
     @runtime
     def dfs(self):
-        # Create a boolean visited dictionary
-        visited = {}
-        for vertex in self.maze.keys():
-            visited[vertex] = False
+        # Create a visited flag for each node, indexed by node ID
+        visited = bytearray(len(self.nodes))
 
-        # Traverse the graph using the recursive function
+        # Traverse the graph from the start node
         self.__traverse(self.maze, visited, self.start)
 
-    def __traverse(self, graph, visited, current):
+    def __visit(self, visited, current):
         # Visit the current node
-        visited[current] = True
+        visited[current.id] = True
+        self.metrics.expansions += 1
 
         # Toggle tile color
         x, y = current.get_coordinates()
-        if (current != self.start) & (current != self.end):
+        if (self.set_color is not None) & (current != self.start) & (current != self.end):
             self.set_color(x, y, "skyblue")
 
         if self.slow_factor is not None:
-            sleep(self.slow_factor)
+            self.metrics.pace(self.slow_factor)
 
         # Check if the node is the goal
         if current == self.end:
             self.reached[0] = True
 
+    def __traverse(self, graph, visited, start):
+        # Stack of nodes on the current path, each with an iterator over its remaining neighbors (used instead of
+        # recursion, so large mazes do not hit the recursion limit)
+        self.__visit(visited, start)
+        stack = [(start, iter(graph[start]))]
+
+        while len(stack) > 0 and not self.reached[0]:
+            current, neighbors = stack[-1]
+
+            # Traverse the next unvisited neighbor, or backtrack once all neighbors are visited
+            neighbor = next((neighbor for neighbor in neighbors if not visited[neighbor.id]), None)
+
+            if neighbor is None:
+                stack.pop()
+            else:
+                self.__visit(visited, neighbor)
+                stack.append((neighbor, iter(graph[neighbor])))
+
+        if not self.reached[0]:
             return
 
-        # Recursively traverse adjacent nodes until the goal is found
-        for neighbor in graph[current]:
-            if (not self.reached[0]) & (not visited[neighbor]):
-                self.__traverse(graph, visited, neighbor)
-
-                # Upon returning from completing the maze, set path node color
-                if self.reached[0]:
-                    if (current != self.start) & (current != self.end):
-                        self.set_color(x, y, "green")
-                    if self.slow_factor is not None:
-                        sleep(self.slow_factor)
-                    return
+        # Upon completing the maze, set path node colors from the goal back to the start
+        stack.pop()
+        while len(stack) > 0:
+            current = stack.pop()[0]
+
+            x, y = current.get_coordinates()
+            if (self.set_color is not None) & (current != self.start) & (current != self.end):
+                self.set_color(x, y, "green")
+            if self.slow_factor is not None:
+                self.metrics.pace(self.slow_factor)
@@ -0,0 +1,170 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  JumpPointSearch.py
+#
+#  Python class for performing a Jump Point Search (JPS) on a maze: an A* search that skips over runs of cells where
+#  every path through them has an equally short symmetric alternative, expanding only the "jump points" where a path
+#  may have to turn. This is the four-connected variant, adapted to walls between cells: a scan stops at a cell whose
+#  side passage cannot also be reached by turning one cell earlier, and vertical scans stop wherever a horizontal scan
+#  from them finds a jump point. Passages are read from tables built from the maze's compact wall encoding, with one
+#  byte per cell for each direction.
+# ----------------------------------------------------------------------------------------------------------------------
+
+import heapq
+from maze.analysis import EAST_BITS, SOUTH_BITS
+from traversals import runtime, RunMetrics
+
+class JumpPointSearch:
+    def __init__(self, maze, set_color=None, slow_factor=None):
+        self.maze = maze
+        self.length = maze.length
+
+        # Whether each cell has a passage in each direction, keyed by the change in cell index for the direction
+        self.passages = {}
+
+        # Indices of the start and end cells
+        start_x, start_y = maze.start.get_coordinates()
+        end_x, end_y = maze.end.get_coordinates()
+        self.start = start_y * self.length + start_x
+        self.end = end_y * self.length + end_x
+
+        # Number of cells passed over by scans between jump points
+        self.scanned = 0
+
+        self.metrics = RunMetrics()
+        self.set_color = self.metrics.observe(set_color)
+        self.slow_factor = slow_factor
+
+    def build_passages(self, walls):
+        """
+        Builds a table of passages for each direction from the wall encoding.
+        :param walls: The compact wall encoding of the maze
+        """
+        length = self.length
+        east = walls.translate(EAST_BITS)
+        south = walls.translate(SOUTH_BITS)
+
+        # A cell's passages to the west and north are its neighbors' passages to the east and south (the last column
+        # has no passages to the east, so the first column gets none to the west)
+        self.passages = {1: east, length: south, -1: bytes(1) + east[:-1], -length: bytes(length) + south[:-length]}
+
+    def jump(self, previous, step):
+        """
+        Scans from a cell in a direction until reaching a jump point.
+        :param previous: The cell to scan from (with an open passage in the direction of the scan)
+        :param step: The direction of the scan (1 for east, -1 for west, length for south, -length for north)
+        :return: The jump point, or None if the scan reaches a wall first
+        """
+        horizontal = step in (1, -1)
+        side_a, side_b = (-self.length, self.length) if horizontal else (-1, 1)
+        ahead = self.passages[step]
+        open_a = self.passages[side_a]
+        open_b = self.passages[side_b]
+        end = self.end
+        current = previous + step
+
+        while True:
+            self.scanned += 1
+
+            if current == end:
+                return current
+
+            # A side passage is forced if the same turn cannot be made one cell earlier
+            if open_a[current] and not (open_a[previous] and ahead[previous + side_a]):
+                return current
+            if open_b[current] and not (open_b[previous] and ahead[previous + side_b]):
+                return current
+
+            # Vertical scans stop where a horizontal scan would find a jump point
+            if not horizontal:
+                if open_a[current] and self.jump(current, side_a) is not None:
+                    return current
+                if open_b[current] and self.jump(current, side_b) is not None:
+                    return current
+
+            if not ahead[current]:
+                return None
+
+            previous, current = current, current + step
+
+    def calculate_h_value(self, cell):
+        return abs(cell % self.length - self.end % self.length) + abs(cell // self.length - self.end // self.length)
+
+    def trace_path(self, parent):
+        # Backtrack along the path, filling in the cells between jump points
+        current = self.end
+
+        while parent[current] is not None:
+            previous = parent[current]
+            step = 1 if previous // self.length == current // self.length else self.length
+            if previous > current:
+                step = -step
+
+            for cell in range(current - step, previous - step, -step):
+                if (self.set_color is not None) & (cell != self.start):
+                    self.set_color(cell % self.length, cell // self.length, "green")
+                if self.slow_factor is not None:
+                    self.metrics.pace(self.slow_factor)
+
+            current = previous
+
+    @runtime
+    def jps(self):
+        self.build_passages(self.maze.get_walls())
+        length = self.length
+
+        g_values = {self.start: 0}
+        parent = {self.start: None}
+        closed = set()
+
+        # Initialize counter for breaking ties for pushing to heap
+        counter = 0
+
+        open_list = [(self.calculate_h_value(self.start), counter, self.start)]
+
+        while open_list:
+            # Pop the jump point with the lowest f value
+            cell = heapq.heappop(open_list)[2]
+
+            # Skip outdated entries for jump points already expanded with a shorter path
+            if cell in closed:
+                continue
+
+            closed.add(cell)
+            self.metrics.expansions += 1
+
+            # Toggle tile color
+            if (self.set_color is not None) & (cell != self.start) & (cell != self.end):
+                self.set_color(cell % length, cell // length, "skyblue")
+
+            if self.slow_factor is not None:
+                self.metrics.pace(self.slow_factor)
+
+            if cell == self.end:
+                self.trace_path(parent)
+
+                return
+
+            # Scan in every direction but back towards the parent
+            back = None
+            if parent[cell] is not None:
+                back = 1 if parent[cell] // length == cell // length else length
+                if parent[cell] < cell:
+                    back = -back
+
+            for step in (1, length, -1, -length):
+                if step == back or not self.passages[step][cell]:
+                    continue
+
+                jump_point = self.jump(cell, step)
+
+                if jump_point is None or jump_point in closed:
+                    continue
+
+                g_new = g_values[cell] + abs(jump_point - cell) // abs(step)
+
+                if g_new < g_values.get(jump_point, g_new + 1):
+                    g_values[jump_point] = g_new
+                    parent[jump_point] = cell
+
+                    heapq.heappush(open_list, (g_new + self.calculate_h_value(jump_point), counter, jump_point))
+                    counter += 1
@@ -0,0 +1,119 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  MazeGenerator.py
+#
+#  Python class for generating a maze using a randomized Depth First Search (DFS) over the maze's generation graph,
+#  optionally braided afterwards by opening walls at dead ends to add loops.
+# ----------------------------------------------------------------------------------------------------------------------
+
+import random
+from traversals import runtime, RunMetrics
+
+class MazeGenerator:
+    def __init__(self, maze, toggle_wall=None, backtrack=None, slow_factor=None, seed=None, braid=0.0):
+        """
+        :param braid: The fraction of dead ends to remove after generation (0 for a perfect maze, 1 for no dead ends)
+        """
+        self.maze = maze
+        self.braid = braid
+
+        # Choose a seed if none is given, so that every generated maze can be reproduced
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.metrics = RunMetrics()
+        self.toggle_wall = self.metrics.observe(toggle_wall)
+        self.backtrack = self.metrics.observe(backtrack)
+        self.slow_factor = slow_factor
+
+    @runtime
+    def generate_maze_dfs(self):
+        # Record the seed and braid factor used to generate the maze
+        self.maze.seed = self.seed
+        self.maze.braid = self.braid
+
+        # Create a visited flag for each node, indexed by node ID
+        visited = bytearray(len(self.maze.nodes))
+
+        # Traverse the graph from the start node
+        self.__traverse(self.maze, visited, self.maze.start)
+
+        # Braid after the traversal, so that braided mazes share their spanning tree with the perfect maze of the seed
+        if self.braid > 0:
+            self.__braid(self.maze)
+
+    def __traverse(self, maze, visited, start):
+        # Get graph from maze
+        graph = maze.generation_graph
+
+        # Mark start node as visited
+        visited[start.id] = True
+        self.metrics.expansions += 1
+
+        if self.slow_factor is not None:
+            self.metrics.pace(self.slow_factor)
+
+        # Stack of nodes on the current path (used instead of recursion, so large mazes do not hit the recursion limit)
+        stack = [start]
+
+        while len(stack) > 0:
+            current = stack[-1]
+            unvisited = [neighbor for neighbor in graph[current] if not visited[neighbor.id]]
+
+            if len(unvisited) > 0:
+                neighbor = self.random.choice(unvisited)
+                # Remove the wall between the two nodes
+                if self.toggle_wall is not None:
+                    self.toggle_wall(current, neighbor)
+                # Add edge between the two nodes
+                maze.add_edge(current, neighbor)
+                # Visit the neighbor node
+                visited[neighbor.id] = True
+                self.metrics.expansions += 1
+
+                if self.slow_factor is not None:
+                    self.metrics.pace(self.slow_factor)
+
+                stack.append(neighbor)
+            else:
+                # Backtrack to the previous node on the path
+                stack.pop()
+
+                if len(stack) > 0:
+                    if self.backtrack is not None:
+                        self.backtrack(stack[-1], current)
+                    if self.slow_factor is not None:
+                        self.metrics.pace(self.slow_factor)
+
+    def __braid(self, maze):
+        graph = maze.graph
+
+        # Visit dead ends in random order
+        dead_ends = [node for node, neighbors in graph.items() if len(neighbors) == 1]
+        self.random.shuffle(dead_ends)
+
+        remaining = round(self.braid * len(dead_ends))
+
+        for node in dead_ends:
+            if remaining <= 0:
+                break
+
+            # Skip dead ends already opened by joining an earlier dead end
+            if len(graph[node]) != 1:
+                continue
+
+            # Prefer joining two dead ends, which removes both with one wall
+            closed = [neighbor for neighbor in maze.generation_graph[node] if neighbor not in graph[node]]
+            joined = [neighbor for neighbor in closed if len(graph[neighbor]) == 1]
+            neighbor = self.random.choice(joined or closed)
+
+            remaining -= 2 if joined else 1
+
+            # Remove the wall between the two nodes
+            if self.toggle_wall is not None:
+                self.toggle_wall(node, neighbor)
+            maze.add_edge(node, neighbor)
+
+            if self.slow_factor is not None:
+                self.metrics.pace(self.slow_factor)
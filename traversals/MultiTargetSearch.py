@@ -0,0 +1,146 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  MultiTargetSearch.py
+#
+#  Python class for finding the nearest pair of a set of start nodes and a set of goal nodes in a single traversal of
+#  an adjacency list graph: a multi-source Breadth First Search (BFS), and a multi-source A* search guided by the
+#  distance to the nearest goal.
+# ----------------------------------------------------------------------------------------------------------------------
+
+import heapq
+from collections import deque
+from traversals import runtime, RunMetrics
+
+class MultiTargetSearch:
+    def __init__(self, maze, starts=None, goals=None, set_color=None, slow_factor=None):
+        """
+        :param maze: The maze to be searched
+        :param starts: The nodes to search from (defaults to the maze's start)
+        :param goals: The nodes to search for (defaults to the maze's end)
+        """
+        self.maze = maze.graph
+
+        # Sets, so that each visited node is checked against every start and goal in constant time
+        self.starts = set(starts) if starts is not None else {maze.start}
+        self.goals = set(goals) if goals is not None else {maze.end}
+
+        # Coordinates of the goals, for the heuristic
+        self.goal_coordinates = [goal.get_coordinates() for goal in self.goals]
+
+        # Nearest pair found by the last search, and the path between them (from start to goal)
+        self.start = None
+        self.goal = None
+        self.path = []
+
+        self.metrics = RunMetrics()
+        self.set_color = self.metrics.observe(set_color)
+        self.slow_factor = slow_factor
+
+    def calculate_h_value(self, node):
+        # Manhattan distance to the nearest goal, which never overestimates the remaining path length
+        x_node, y_node = node.get_coordinates()
+
+        return min(abs(x_node - x_goal) + abs(y_node - y_goal) for x_goal, y_goal in self.goal_coordinates)
+
+    def visit(self, node):
+        # Toggle tile color
+        if (self.set_color is not None) and node not in self.starts and node not in self.goals:
+            self.set_color(*node.get_coordinates(), "skyblue")
+
+        if self.slow_factor is not None:
+            self.metrics.pace(self.slow_factor)
+
+    def trace_path(self, parent, goal):
+        # Backtrack from the goal to the start it was reached from
+        current = goal
+        path = [current]
+
+        while parent[current] is not None:
+            current = parent[current]
+            path.append(current)
+
+            if (self.set_color is not None) and current not in self.starts:
+                self.set_color(*current.get_coordinates(), "green")
+            if self.slow_factor is not None:
+                self.metrics.pace(self.slow_factor)
+
+        path.reverse()
+
+        self.start = current
+        self.goal = goal
+        self.path = path
+
+    @runtime
+    def multi_bfs(self):
+        # Without starts or goals there is no pair to find
+        if not self.starts or not self.goals:
+            return
+
+        # Enqueue every start at once, so that nodes are dequeued in order of distance from the nearest start
+        parent = {start: None for start in self.starts}
+        queue = deque(self.starts)
+
+        while queue:
+            current = queue.popleft()
+            self.metrics.expansions += 1
+
+            self.visit(current)
+
+            # The first goal dequeued is the nearest to any start
+            if current in self.goals:
+                self.trace_path(parent, current)
+
+                return
+
+            # Visit neighboring nodes
+            for neighbor in self.maze[current]:
+                if neighbor not in parent:
+                    parent[neighbor] = current
+                    queue.append(neighbor)
+
+    @runtime
+    def multi_a_star(self):
+        # Without starts or goals there is no pair to find (and no nearest goal for the heuristic)
+        if not self.starts or not self.goals:
+            return
+
+        # Push every start at once with a path length of zero
+        parent = {start: None for start in self.starts}
+        g_values = {start: 0 for start in self.starts}
+        closed = set()
+
+        # Initialize counter for breaking ties for pushing to heap
+        counter = 0
+
+        open_list = []
+        for start in self.starts:
+            heapq.heappush(open_list, (self.calculate_h_value(start), counter, start))
+            counter += 1
+
+        while open_list:
+            # Pop the node with the lowest f value
+            node = heapq.heappop(open_list)[2]
+
+            # Skip outdated entries for nodes already expanded with a shorter path
+            if node in closed:
+                continue
+
+            closed.add(node)
+            self.metrics.expansions += 1
+
+            self.visit(node)
+
+            # With an admissible heuristic, the first goal expanded is the nearest to any start
+            if node in self.goals:
+                self.trace_path(parent, node)
+
+                return
+
+            g_new = g_values[node] + 1
+
+            for neighbor in self.maze[node]:
+                if neighbor not in closed and g_new < g_values.get(neighbor, float("inf")):
+                    g_values[neighbor] = g_new
+                    parent[neighbor] = node
+
+                    heapq.heappush(open_list, (g_new + self.calculate_h_value(neighbor), counter, neighbor))
+                    counter += 1
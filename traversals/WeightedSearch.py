@@ -0,0 +1,147 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  WeightedSearch.py
+#
+#  Python classes for performing Dijkstra's algorithm and an A* search on an adjacency list graph with small integer
+#  costs for entering each node. Both use a bucket queue (Dial's algorithm) instead of a binary heap: path lengths are
+#  integers, and every node popped is at most the largest step cost away from the first, so a ring of buckets indexed
+#  by path length replaces the heap, and each push and pop takes constant time.
+# ----------------------------------------------------------------------------------------------------------------------
+
+from traversals import runtime, RunMetrics
+
+class BucketQueue:
+    """
+    Monotone priority queue for integer priorities, where every pushed priority is less than the lowest priority still
+    queued plus the queue's width.
+    """
+
+    def __init__(self, width):
+        """
+        :param width: The number of buckets (one more than the largest difference between queued priorities)
+        """
+        self.buckets = [[] for _ in range(width)]
+        self.width = width
+        self.current = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, priority, item):
+        self.buckets[priority % self.width].append(item)
+        self.size += 1
+
+    def pop(self):
+        """
+        Removes an item with the lowest priority.
+        :return: The priority and the item
+        """
+        bucket = self.buckets[self.current % self.width]
+
+        # Move on to the next non-empty bucket
+        while not bucket:
+            self.current += 1
+            bucket = self.buckets[self.current % self.width]
+
+        self.size -= 1
+
+        return self.current, bucket.pop()
+
+class WeightedSearch:
+    def __init__(self, maze, set_color=None, slow_factor=None):
+        self.maze = maze.graph
+        self.nodes = maze.nodes
+        self.start = maze.start
+        self.end = maze.end
+        self.length = maze.length
+
+        # Cost of entering each node (unit costs for mazes without terrain)
+        self.costs = maze.costs if maze.costs is not None else bytes([1]) * (maze.length * maze.length)
+        self.max_cost = max(self.costs)
+        self.min_cost = min(self.costs)
+
+        # Cost of the cheapest path found by the last search (-1 if the end is unreachable)
+        self.path_cost = -1
+
+        self.metrics = RunMetrics()
+        self.set_color = self.metrics.observe(set_color)
+        self.slow_factor = slow_factor
+
+    def calculate_h_value(self, node):
+        # Manhattan distance to the end at the cheapest step cost, which never overestimates the remaining cost and
+        # changes by at most that cost per step
+        return (abs(node.x - self.end.x) + abs(node.y - self.end.y)) * self.min_cost
+
+    def trace_path(self, parent):
+        # Backtrack along the path
+        current = parent[self.end.id]
+
+        while current is not None and current != self.start:
+            x, y = current.get_coordinates()
+
+            if self.set_color is not None:
+                self.set_color(x, y, "green")
+            if self.slow_factor is not None:
+                self.metrics.pace(self.slow_factor)
+
+            current = parent[current.id]
+
+    def search(self, heuristic):
+        """
+        Finds the cheapest path from start to end, expanding nodes in order of path cost plus the heuristic.
+        :param heuristic: Function giving a lower bound on the cost from a node to the end, or None for Dijkstra
+        """
+        costs = self.costs
+
+        # Path costs and parents of reached nodes, and whether each node has been expanded, indexed by node ID
+        distance = [float("inf")] * len(self.nodes)
+        parent = [None] * len(self.nodes)
+        closed = bytearray(len(self.nodes))
+
+        distance[self.start.id] = 0
+
+        # Priorities grow by at most the step cost, plus the heuristic's change along the step
+        queue = BucketQueue(self.max_cost + (self.min_cost if heuristic is not None else 0) + 1)
+        queue.push(heuristic(self.start) if heuristic is not None else 0, self.start)
+
+        while len(queue) > 0:
+            _, node = queue.pop()
+
+            # Skip outdated entries for nodes already expanded with a cheaper path
+            if closed[node.id]:
+                continue
+
+            closed[node.id] = True
+            self.metrics.expansions += 1
+
+            # Toggle tile color
+            if (self.set_color is not None) & (node != self.start) & (node != self.end):
+                self.set_color(node.x, node.y, "skyblue")
+
+            if self.slow_factor is not None:
+                self.metrics.pace(self.slow_factor)
+
+            if node == self.end:
+                self.path_cost = distance[node.id]
+                self.trace_path(parent)
+
+                return
+
+            for neighbor in self.maze[node]:
+                if closed[neighbor.id]:
+                    continue
+
+                g_new = distance[node.id] + costs[neighbor.id]
+
+                if g_new < distance[neighbor.id]:
+                    distance[neighbor.id] = g_new
+                    parent[neighbor.id] = node
+                    queue.push(g_new + heuristic(neighbor) if heuristic is not None else g_new, neighbor)
+
+    @runtime
+    def dijkstra(self):
+        self.search(None)
+
+    @runtime
+    def weighted_a_star(self):
+        self.search(self.calculate_h_value)
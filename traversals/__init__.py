@@ -1,5 +1,33 @@
 # Import modules
-from .runtime import runtime
+from .runtime import runtime, RunMetrics
+from .trace import Trace
+from .MazeGenerator import MazeGenerator
 from .DepthFirstSearch import DepthFirstSearch
 from .BreadthFirstSearch import BreadthFirstSearch
 from .AStar import AStar
+from .MultiTargetSearch import MultiTargetSearch
+from .WeightedSearch import WeightedSearch
+from .JumpPointSearch import JumpPointSearch
+from .hierarchy import HierarchicalIndex
+from .cache import Solution, SolutionCache
+
+# Modules with heavy dependencies (cProfile and threading, multiprocessing), imported on first use so that headless
+# jobs only pay for what they use
+LAZY_MODULES = {
+    "RunProfiler": ".profiling",
+    "ProcessBackend": ".backend",
+    "SharedMaze": ".backend",
+    "Race": ".race"
+}
+
+def __getattr__(name):
+    if name not in LAZY_MODULES:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+    import importlib
+    value = getattr(importlib.import_module(LAZY_MODULES[name], __name__), name)
+
+    # Cache the attribute, so later lookups skip this function
+    globals()[name] = value
+
+    return value
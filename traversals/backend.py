@@ -0,0 +1,311 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  backend.py
+#
+#  Process-based execution backend for maze generation and solving. Runs execute in a worker process, so they never
+#  compete with the UI thread for the interpreter. The maze is shared with the worker through shared memory, in the
+#  compact wall encoding from Maze.get_walls() followed by the maze's terrain costs, and each run's trace events,
+#  progress and result are sent back over a queue.
+# ----------------------------------------------------------------------------------------------------------------------
+
+import multiprocessing
+import queue
+import traceback
+from multiprocessing import shared_memory
+from time import perf_counter
+from maze import Maze
+from maze.analysis import analyze
+from traversals import DepthFirstSearch, BreadthFirstSearch, AStar, WeightedSearch, JumpPointSearch, MazeGenerator, \
+    RunProfiler, Trace
+
+# Solver class and method for each solver function name
+SOLVERS = {
+    "dfs": (DepthFirstSearch, "dfs"),
+    "bfs": (BreadthFirstSearch, "bfs"),
+    "a_star": (AStar, "a_star"),
+    "dijkstra": (WeightedSearch, "dijkstra"),
+    "weighted_a_star": (WeightedSearch, "weighted_a_star"),
+    "jps": (JumpPointSearch, "jps")
+}
+
+class SharedMaze:
+    """
+    Compact wall encoding of a maze in shared memory, with one byte per node in row-major order, followed by the cost
+    of entering each node in the same order (all zero for mazes without terrain).
+    """
+
+    def __init__(self, length, name=None):
+        """
+        :param length: The length of the maze
+        :param name: The name of an existing block to attach to (a new block is created if not given)
+        """
+        self.length = length
+        self.owner = name is None
+
+        if self.owner:
+            self.memory = shared_memory.SharedMemory(create=True, size=2 * length * length)
+        else:
+            self.memory = shared_memory.SharedMemory(name)
+
+        self.name = self.memory.name
+
+    def read(self):
+        return bytes(self.memory.buf[:self.length * self.length])
+
+    def write(self, walls):
+        self.memory.buf[:self.length * self.length] = walls
+
+    def read_costs(self):
+        """
+        :return: The terrain costs, or None if the maze has no terrain
+        """
+        cells = self.length * self.length
+        costs = bytes(self.memory.buf[cells:2 * cells])
+
+        return costs if any(costs) else None
+
+    def write_costs(self, costs):
+        cells = self.length * self.length
+        self.memory.buf[cells:2 * cells] = costs if costs is not None else bytes(cells)
+
+    def close(self):
+        self.memory.close()
+
+        # Only the creator frees the block
+        if self.owner:
+            self.memory.unlink()
+
+class ProgressRecorder:
+    """
+    Records a run's changes to a trace in a worker process, sending the new events and the run's progress to the
+    parent at most once per interval.
+    """
+
+    def __init__(self, key, length, colors, queue, interval=1 / 30):
+        """
+        :param key: The key identifying the run in messages to the parent
+        :param length: The length of the maze
+        :param colors: Color names to register in the trace first, so trace color indices match the parent's
+        :param queue: The queue to the parent
+        :param interval: The time between progress messages (in seconds)
+        """
+        self.key = key
+        self.trace = Trace(length)
+        for color in colors:
+            self.trace.get_color_index(color)
+
+        self.queue = queue
+        self.interval = interval
+        self.metrics = None
+        self.sent = 0
+        self.start_time = perf_counter()
+        self.last_send = self.start_time
+
+        # Endpoints of the maze, which generation leaves uncolored
+        self.endpoints = ()
+
+    def set_color(self, x, y, color):
+        self.trace.set_color(x, y, color)
+
+        if perf_counter() - self.last_send >= self.interval:
+            self.send()
+
+    def toggle_wall(self, node1, node2):
+        # Get coordinates from nodes
+        node1_x, node1_y = node1.get_coordinates()
+        node2_x, node2_y = node2.get_coordinates()
+
+        if abs(node1_x - node2_x) + abs(node1_y - node2_y) != 1:
+            return False
+
+        # Remove the wall between the two tiles
+        self.trace.open_wall(node1_x, node1_y, node2_x, node2_y)
+
+        if node1 not in self.endpoints:
+            self.set_color(node1_x, node1_y, "green")
+        if node2 not in self.endpoints:
+            self.set_color(node2_x, node2_y, "green")
+        return True
+
+    def backtrack(self, node1, node2):
+        # Change tile colors to indicate completed path
+        if node1 not in self.endpoints:
+            self.set_color(*node1.get_coordinates(), "gold")
+        if node2 not in self.endpoints:
+            self.set_color(*node2.get_coordinates(), "gold")
+
+    def send(self):
+        self.last_send = perf_counter()
+
+        events = self.trace.events[3 * self.sent:].tobytes()
+        self.sent = len(self.trace)
+
+        self.queue.put((
+            "progress", self.key, list(self.trace.colors), events, self.metrics.expansions,
+            self.last_send - self.start_time
+        ))
+
+def run_job(key, algorithm, shared_name, length, colors, queue, observe=True, profile_dir=None, braid=0.0):
+    """
+    Generates or solves the shared maze, sending progress while running and the run's result when done. Generation
+    writes the new maze back to shared memory and analyzes it before sending its result.
+    :param key: The key identifying the run in messages to the parent
+    :param algorithm: "generate_maze_dfs" or a solver function name (a key of SOLVERS)
+    :param shared_name: The name of the shared memory block holding the maze
+    :param length: The length of the maze
+    :param colors: Color names already used by the parent's trace
+    :param queue: The queue to the parent
+    :param observe: Whether to record the run's trace (False when only measuring)
+    :param profile_dir: The directory to write profiles to, if the run is to be profiled
+    :param braid: The fraction of dead ends to remove when generating
+    """
+    shared = None
+
+    try:
+        shared = SharedMaze(length, shared_name)
+        recorder = ProgressRecorder(key, length, colors, queue)
+
+        if algorithm == "generate_maze_dfs":
+            maze = Maze(length)
+            recorder.endpoints = (maze.start, maze.end)
+
+            if observe:
+                runner = MazeGenerator(maze, recorder.toggle_wall, recorder.backtrack, braid=braid)
+            else:
+                runner = MazeGenerator(maze, braid=braid)
+
+            function = runner.generate_maze_dfs
+        else:
+            maze = Maze.from_walls(length, shared.read())
+            maze.set_costs(shared.read_costs())
+
+            solver_class, method = SOLVERS[algorithm]
+            runner = solver_class(maze, recorder.set_color if observe else None)
+            function = getattr(runner, method)
+
+        recorder.metrics = runner.metrics
+        recorder.start_time = perf_counter()
+
+        if profile_dir is not None:
+            tag = "{}_{}x{}".format(function.__name__, length, length)
+            result = RunProfiler(profile_dir).profile(function, tag)
+        else:
+            result = function()
+
+        # Share new mazes, along with their structural statistics
+        stats = None
+        if algorithm == "generate_maze_dfs":
+            shared.write(maze.get_walls())
+            stats = analyze(maze)
+
+        # Send the remaining events, then the result
+        recorder.send()
+        queue.put(("done", key, result, maze.seed, stats))
+    except Exception:
+        queue.put(("error", key, traceback.format_exc()))
+    finally:
+        if shared is not None:
+            shared.close()
+
+def serve(jobs, results):
+    """
+    Runs jobs from the job queue until it receives None.
+    """
+    for key, algorithm, shared_name, length, colors, observe, profile_dir, braid in iter(jobs.get, None):
+        run_job(key, algorithm, shared_name, length, colors, results, observe, profile_dir, braid)
+
+class ProcessBackend:
+    """
+    Runs generation and solving jobs one at a time in a worker process. The worker is started on the first job, and
+    messages from running jobs are collected with poll().
+    """
+
+    def __init__(self):
+        # Spawn rather than fork, so that the worker does not inherit the UI's threads
+        self.context = multiprocessing.get_context("spawn")
+        self.jobs = self.context.Queue()
+        self.results = self.context.Queue()
+        self.process = None
+        self.shared = None
+        self.next_key = 0
+
+    def share(self, length, walls=None):
+        """
+        Gets the shared memory block for a maze of the given length, creating a new block (without terrain) if the
+        length has changed.
+        :param length: The length of the maze
+        :param walls: The encoded edges to write to the block, if any
+        :return: The shared maze
+        """
+        if self.shared is None or self.shared.length != length:
+            if self.shared is not None:
+                self.shared.close()
+
+            self.shared = SharedMaze(length)
+
+        if walls is not None:
+            self.shared.write(walls)
+
+        return self.shared
+
+    def submit(self, algorithm, colors, observe=True, profile_dir=None, braid=0.0):
+        """
+        Starts generating or solving the shared maze in the worker process.
+        :param algorithm: "generate_maze_dfs" or a solver function name
+        :param colors: Color names already used by the parent's trace
+        :param observe: Whether to record the run's trace
+        :param profile_dir: The directory to write profiles to, if the run is to be profiled
+        :param braid: The fraction of dead ends to remove when generating
+        :return: The key identifying the job in its messages
+        """
+        if not self.is_alive():
+            self.process = self.context.Process(target=serve, args=(self.jobs, self.results), daemon=True)
+            self.process.start()
+
+        key = self.next_key
+        self.next_key += 1
+
+        self.jobs.put((
+            key, algorithm, self.shared.name, self.shared.length, list(colors), observe, profile_dir, braid
+        ))
+
+        return key
+
+    def poll(self):
+        """
+        Gets all messages sent by jobs so far, without blocking.
+        :return: A list of message tuples, each starting with "progress", "done" or "error" and the job's key
+        """
+        messages = []
+
+        while True:
+            try:
+                messages.append(self.results.get_nowait())
+            except queue.Empty:
+                return messages
+
+    def is_alive(self):
+        return self.process is not None and self.process.is_alive()
+
+    def restart(self):
+        """
+        Replaces the worker process and its queues, after the worker died mid-job. A worker killed while writing to a
+        queue can leave it unusable, so new queues are created, and the new worker is started on the next job.
+        """
+        if self.is_alive():
+            self.process.terminate()
+
+        for old_queue in (self.jobs, self.results):
+            old_queue.close()
+            old_queue.cancel_join_thread()
+
+        self.jobs = self.context.Queue()
+        self.results = self.context.Queue()
+        self.process = None
+
+    def stop(self):
+        if self.is_alive():
+            self.process.terminate()
+
+        if self.shared is not None:
+            self.shared.close()
+            self.shared = None
@@ -0,0 +1,102 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  cache.py
+#
+#  Python classes for a least-recently-used cache of solver results, keyed by the maze's fingerprint, its terrain costs,
+#  its endpoints, and the solving algorithm, so that solving an unchanged maze again does not rerun the search. The
+#  cache is bounded by the total size of its solutions' traces.
+# ----------------------------------------------------------------------------------------------------------------------
+
+from collections import OrderedDict
+
+# Default bound on the total size of the cached traces (in bytes). A solve of a 1000x1000 maze is traced in about 25 MB
+# (an event for each of its walls and each cell the search colors), so this holds about ten of them
+MAX_BYTES = 256 * 1024 * 1024
+
+class Solution:
+    def __init__(self, trace, metrics):
+        """
+        :param trace: The complete trace of the solving run, for replaying the solution
+        :param metrics: The RunMetrics object of the solving run
+        """
+        self.trace = trace
+        self.metrics = metrics
+
+        # Size of the trace (in bytes), including the wall encoding of the maze it starts from
+        self.size = len(trace.events) * trace.events.itemsize + (len(trace.walls) if trace.walls is not None else 0)
+
+    @property
+    def path(self):
+        """
+        Cells on the solution path, from the final tile colors of the run. These are found from the trace when needed,
+        since a set of cells can take several times the memory of the trace itself.
+        :return: A set of (x, y) cells
+        """
+        return {cell for cell, color in self.trace.get_cell_colors().items() if color == "green"}
+
+    @property
+    def explored(self):
+        """
+        Cells explored by the search (including the solution path), from the final tile colors of the run.
+        :return: A set of (x, y) cells
+        """
+        return {cell for cell, color in self.trace.get_cell_colors().items() if color in ("green", "skyblue")}
+
+class SolutionCache:
+    def __init__(self, max_bytes=MAX_BYTES):
+        # Maximum total size of the cached solutions (see Solution.size), and their current total
+        self.max_bytes = max_bytes
+        self.size = 0
+
+        # Solutions by key, from least to most recently used
+        self.solutions = OrderedDict()
+
+        # Number of lookups that found and did not find a solution
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def get_key(maze, algorithm):
+        return maze.fingerprint, maze.costs, maze.get_endpoints(), algorithm
+
+    def get(self, maze, algorithm):
+        """
+        Looks up the solution of a maze, counting the lookup as a hit or a miss.
+        :param maze: The maze to be solved
+        :param algorithm: The solver function name (e.g. "a_star")
+        :return: The cached Solution, or None if the maze has not been solved with the algorithm
+        """
+        key = self.get_key(maze, algorithm)
+        solution = self.solutions.get(key)
+
+        if solution is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.solutions.move_to_end(key)
+
+        return solution
+
+    def put(self, maze, algorithm, solution):
+        """
+        Stores the solution of a maze, evicting the least recently used solutions until the cache fits its size bound.
+        Solutions larger than the whole bound are not stored, rather than evicting every other solution.
+        """
+        key = self.get_key(maze, algorithm)
+
+        previous = self.solutions.pop(key, None)
+        if previous is not None:
+            self.size -= previous.size
+
+        if solution.size > self.max_bytes:
+            return
+
+        self.solutions[key] = solution
+        self.size += solution.size
+
+        while self.size > self.max_bytes:
+            _, evicted = self.solutions.popitem(last=False)
+            self.size -= evicted.size
+
+    def clear(self):
+        self.solutions.clear()
+        self.size = 0
@@ -0,0 +1,341 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  hierarchy.py
+#
+#  Hierarchical pathfinding (HPA*) over the compact wall encoding of a maze, for large mazes that are searched many
+#  times. The grid is split into square clusters, and every open passage across a cluster border becomes a pair of
+#  entrance cells. Building the index finds the distance between each pair of entrances within each cluster, so a
+#  query only searches the small graph of entrances, linking its endpoints to the entrances of their clusters, and then
+#  refines each step of the abstract path with a search inside one cluster (kept for later queries that take the same
+#  step). Since every border crossing is an entrance, abstract paths are as short as paths in the full maze, with or
+#  without loops.
+# ----------------------------------------------------------------------------------------------------------------------
+
+import heapq
+import sys
+from array import array
+from collections import deque
+from maze.Maze import EAST, SOUTH
+
+def get_bounded_distances(length, walls, source, bounds):
+    """
+    Finds the distance of every cell in a rectangle from a source cell, with a breadth-first search that stays inside
+    the rectangle.
+    :param length: The length of the maze
+    :param walls: The compact wall encoding of the maze
+    :param source: The index of the source cell
+    :param bounds: The (x0, y0, x1, y1) rectangle to search, excluding x1 and y1 (None for the whole maze)
+    :return: A dictionary of distances by cell index, and a dictionary of parents by cell index
+    """
+    x0, y0, x1, y1 = bounds if bounds is not None else (0, 0, length, length)
+    distances = {source: 0}
+    parents = {source: None}
+    queue = deque([source])
+
+    while queue:
+        cell = queue.popleft()
+        distance = distances[cell] + 1
+        x, y = cell % length, cell // length
+        passages = walls[cell]
+
+        for neighbor, open_passage in (
+            (cell + 1, x + 1 < x1 and passages & EAST),
+            (cell + length, y + 1 < y1 and passages & SOUTH),
+            (cell - 1, x > x0 and walls[cell - 1] & EAST),
+            (cell - length, y > y0 and walls[cell - length] & SOUTH)
+        ):
+            if open_passage and neighbor not in distances:
+                distances[neighbor] = distance
+                parents[neighbor] = cell
+                queue.append(neighbor)
+
+    return distances, parents
+
+def find_path(length, walls, start, end, bounds=None):
+    """
+    Finds a shortest path between two cells with an A* search over the wall encoding, guided by the Manhattan distance.
+    :param length: The length of the maze
+    :param walls: The compact wall encoding of the maze
+    :param start: The index of the start cell
+    :param end: The index of the end cell
+    :param bounds: The (x0, y0, x1, y1) rectangle to search, excluding x1 and y1 (None for the whole maze)
+    :return: The cell indices of the path from start to end (None if there is none), and the number of expanded cells
+    """
+    x0, y0, x1, y1 = bounds if bounds is not None else (0, 0, length, length)
+    end_x, end_y = end % length, end // length
+
+    g_values = {start: 0}
+    parents = {start: None}
+    closed = set()
+    open_list = [(0, start)]
+    expansions = 0
+
+    while open_list:
+        _, cell = heapq.heappop(open_list)
+
+        # Skip outdated entries for cells already expanded with a shorter path
+        if cell in closed:
+            continue
+
+        closed.add(cell)
+        expansions += 1
+
+        if cell == end:
+            return trace_parents(parents, end), expansions
+
+        g_new = g_values[cell] + 1
+        x, y = cell % length, cell // length
+        passages = walls[cell]
+
+        for neighbor, open_passage in (
+            (cell + 1, x + 1 < x1 and passages & EAST),
+            (cell + length, y + 1 < y1 and passages & SOUTH),
+            (cell - 1, x > x0 and walls[cell - 1] & EAST),
+            (cell - length, y > y0 and walls[cell - length] & SOUTH)
+        ):
+            if open_passage and neighbor not in closed and g_new < g_values.get(neighbor, g_new + 1):
+                g_values[neighbor] = g_new
+                parents[neighbor] = cell
+
+                h_value = abs(neighbor % length - end_x) + abs(neighbor // length - end_y)
+                heapq.heappush(open_list, (g_new + h_value, neighbor))
+
+    return None, expansions
+
+def trace_parents(parents, end):
+    path = [end]
+
+    while parents[path[-1]] is not None:
+        path.append(parents[path[-1]])
+
+    path.reverse()
+
+    return path
+
+class HierarchicalIndex:
+    def __init__(self, length, walls, cluster_size=32):
+        """
+        Builds the abstract graph of cluster entrances.
+        :param length: The length of the maze
+        :param walls: The compact wall encoding of the maze (see Maze.get_walls())
+        :param cluster_size: The length of each cluster (in cells)
+        """
+        self.length = length
+        self.walls = walls
+        self.cluster_size = cluster_size
+
+        # Entrance cells, and the index of each entrance by cell
+        self.entrances = array("i")
+        self.entrance_ids = {}
+
+        # Entrances of each cluster, by cluster index
+        self.cluster_entrances = {}
+
+        # Edges between entrances, in compressed sparse row form: the edges of entrance i are targets and costs from
+        # offsets[i] to offsets[i + 1]
+        self.offsets = array("i")
+        self.targets = array("i")
+        self.costs = array("i")
+
+        # Refined paths between pairs of entrances of the same cluster, filled in by queries
+        self.segments = {}
+
+        self.__add_entrances()
+        self.__add_edges()
+
+    def get_cluster(self, cell):
+        return (cell // self.length // self.cluster_size, cell % self.length // self.cluster_size)
+
+    def get_bounds(self, cluster):
+        """
+        :return: The (x0, y0, x1, y1) rectangle of cells in a cluster, excluding x1 and y1
+        """
+        row, column = cluster
+        size = self.cluster_size
+
+        return column * size, row * size, min((column + 1) * size, self.length), min((row + 1) * size, self.length)
+
+    def __add_entrance(self, cell):
+        if cell not in self.entrance_ids:
+            self.entrance_ids[cell] = len(self.entrances)
+            self.entrances.append(cell)
+            self.cluster_entrances.setdefault(self.get_cluster(cell), []).append(cell)
+
+    def __add_entrances(self):
+        length = self.length
+        size = self.cluster_size
+
+        # Passages across vertical cluster borders (from the last column of a cluster to the east)
+        for x in range(size - 1, length - 1, size):
+            for y in range(length):
+                cell = y * length + x
+                if self.walls[cell] & EAST:
+                    self.__add_entrance(cell)
+                    self.__add_entrance(cell + 1)
+
+        # Passages across horizontal cluster borders (from the last row of a cluster to the south)
+        for y in range(size - 1, length - 1, size):
+            for x in range(length):
+                cell = y * length + x
+                if self.walls[cell] & SOUTH:
+                    self.__add_entrance(cell)
+                    self.__add_entrance(cell + length)
+
+    def __add_edges(self):
+        length = self.length
+        edges = [[] for _ in self.entrances]
+
+        for cluster, cells in self.cluster_entrances.items():
+            bounds = self.get_bounds(cluster)
+
+            for cell in cells:
+                source = self.entrance_ids[cell]
+
+                # Distances to the other entrances of the cluster, through the cluster only
+                distances, _ = get_bounded_distances(length, self.walls, cell, bounds)
+                for other in cells:
+                    if other != cell and other in distances:
+                        edges[source].append((self.entrance_ids[other], distances[other]))
+
+                # Steps across the cluster border
+                x, y = cell % length, cell // length
+                for neighbor, open_passage in (
+                    (cell + 1, x + 1 < length and self.walls[cell] & EAST),
+                    (cell + length, y + 1 < length and self.walls[cell] & SOUTH),
+                    (cell - 1, x > 0 and self.walls[cell - 1] & EAST),
+                    (cell - length, y > 0 and self.walls[cell - length] & SOUTH)
+                ):
+                    if open_passage and neighbor in self.entrance_ids and self.get_cluster(neighbor) != cluster:
+                        edges[source].append((self.entrance_ids[neighbor], 1))
+
+        for entrance_edges in edges:
+            self.offsets.append(len(self.targets))
+            for target, cost in entrance_edges:
+                self.targets.append(target)
+                self.costs.append(cost)
+
+        self.offsets.append(len(self.targets))
+
+    @property
+    def memory(self):
+        """
+        :return: The size of the abstract graph, and the size of the refined segments kept so far (in bytes)
+        """
+        arrays = (self.entrances, self.offsets, self.targets, self.costs)
+
+        graph = sum(a.itemsize * len(a) for a in arrays) + sys.getsizeof(self.entrance_ids) + sum(
+            sys.getsizeof(cells) for cells in self.cluster_entrances.values()
+        )
+        segments = sys.getsizeof(self.segments) + sum(
+            segment.itemsize * len(segment) for segment in self.segments.values()
+        )
+
+        return graph, segments
+
+    def find_path(self, start, end):
+        """
+        Finds a shortest path between two cells, searching the abstract graph and then refining each abstract step
+        within its cluster.
+        :param start: The index of the start cell
+        :param end: The index of the end cell
+        :return: The cell indices of the path from start to end (None if there is none), and the number of expanded
+        nodes (abstract and refining)
+        """
+        length = self.length
+        entrance_count = len(self.entrances)
+
+        # The endpoints join the abstract graph as two extra nodes, linked to the entrances of their clusters
+        start_id = entrance_count
+        end_id = entrance_count + 1
+        cells = {start_id: start, end_id: end}
+
+        start_cluster = self.get_cluster(start)
+        end_cluster = self.get_cluster(end)
+        start_distances, _ = get_bounded_distances(length, self.walls, start, self.get_bounds(start_cluster))
+        end_distances, _ = get_bounded_distances(length, self.walls, end, self.get_bounds(end_cluster))
+        expansions = len(start_distances) + len(end_distances)
+
+        start_edges = [
+            (self.entrance_ids[cell], start_distances[cell])
+            for cell in self.cluster_entrances.get(start_cluster, ()) if cell in start_distances
+        ]
+        if end in start_distances:
+            start_edges.append((end_id, start_distances[end]))
+
+        # Entrances of the end's cluster that can reach the end within it
+        end_links = {
+            self.entrance_ids[cell]: end_distances[cell]
+            for cell in self.cluster_entrances.get(end_cluster, ()) if cell in end_distances
+        }
+
+        end_x, end_y = end % length, end // length
+
+        def h_value(node):
+            cell = cells[node] if node >= entrance_count else self.entrances[node]
+            return abs(cell % length - end_x) + abs(cell // length - end_y)
+
+        # A* over the abstract graph
+        g_values = {start_id: 0}
+        parents = {start_id: None}
+        closed = set()
+        open_list = [(h_value(start_id), start_id)]
+
+        while open_list:
+            _, node = heapq.heappop(open_list)
+
+            if node in closed:
+                continue
+
+            closed.add(node)
+            expansions += 1
+
+            if node == end_id:
+                break
+
+            if node == start_id:
+                edges = start_edges
+            else:
+                edges = list(zip(
+                    self.targets[self.offsets[node]:self.offsets[node + 1]],
+                    self.costs[self.offsets[node]:self.offsets[node + 1]]
+                ))
+                if node in end_links:
+                    edges.append((end_id, end_links[node]))
+
+            for neighbor, cost in edges:
+                g_new = g_values[node] + cost
+
+                if neighbor not in closed and g_new < g_values.get(neighbor, g_new + 1):
+                    g_values[neighbor] = g_new
+                    parents[neighbor] = node
+                    heapq.heappush(open_list, (g_new + h_value(neighbor), neighbor))
+        else:
+            return None, expansions
+
+        # Refine each abstract step into cells: border crossings are single steps, and other steps are searched for
+        # within the cluster they cross
+        abstract = [
+            cells[node] if node >= entrance_count else self.entrances[node] for node in trace_parents(parents, end_id)
+        ]
+        path = [start]
+
+        for previous, current in zip(abstract, abstract[1:]):
+            cluster = self.get_cluster(previous)
+
+            if cluster != self.get_cluster(current):
+                path.append(current)
+                continue
+
+            # Only steps between entrances are kept, since the endpoints change from query to query
+            segment = self.segments.get((previous, current))
+
+            if segment is None:
+                segment, segment_expansions = find_path(length, self.walls, previous, current, self.get_bounds(cluster))
+                expansions += segment_expansions
+
+                if previous in self.entrance_ids and current in self.entrance_ids:
+                    segment = array("i", segment)
+                    self.segments[(previous, current)] = segment
+
+            path.extend(segment[1:])
+
+        return path, expansions
@@ -0,0 +1,95 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  profiling.py
+#
+#  Contains an opt-in profiler for maze generation and solving runs. Each profiled run writes a cProfile pstats file
+#  and a collapsed-stack file (one "frame;frame;frame count" line per stack) for building flamegraphs.
+# ----------------------------------------------------------------------------------------------------------------------
+
+import cProfile
+import os
+import sys
+import threading
+from collections import Counter
+from datetime import datetime
+
+class RunProfiler:
+    def __init__(self, output_dir, sample_interval=0.001):
+        # Directory to write profile output to
+        self.output_dir = output_dir
+
+        # Time between stack samples (in seconds)
+        self.sample_interval = sample_interval
+
+    def profile(self, function, tag, *args, **kwargs):
+        """
+        Runs a function under cProfile and a stack sampler, then writes both profiles to the output directory.
+        :param function: The function to be profiled
+        :param tag: The tag used to name the output files (e.g. the algorithm and maze size)
+        :return: The return value of the function
+        """
+        # Sample the calling thread, since that is the thread running the function
+        sampler = StackSampler(threading.get_ident(), self.sample_interval)
+        profiler = cProfile.Profile()
+
+        sampler.start()
+        profiler.enable()
+
+        try:
+            return function(*args, **kwargs)
+        finally:
+            profiler.disable()
+            sampler.stop()
+
+            self.__write_profiles(tag, profiler, sampler)
+
+    def __write_profiles(self, tag, profiler, sampler):
+        """
+        Writes the pstats and collapsed-stack output for a profiled run.
+        :param tag: The tag used to name the output files
+        :param profiler: The cProfile profiler for the run
+        :param sampler: The stack sampler for the run
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        # Name output files by tag, time of the run (to the microsecond) and process, so that runs with the same tag
+        # in the same second, or in concurrent workers, do not overwrite each other's output
+        base_path = os.path.join(
+            self.output_dir, "{}_{}_{}".format(tag, datetime.now().strftime("%Y%m%d-%H%M%S-%f"), os.getpid())
+        )
+
+        profiler.dump_stats(base_path + ".pstats")
+
+        with open(base_path + ".collapsed", "w") as file:
+            for stack, count in sampler.stacks.items():
+                file.write("{} {}\n".format(stack, count))
+
+class StackSampler(threading.Thread):
+    """
+    Thread that periodically samples the call stack of another thread and counts each distinct stack.
+    """
+
+    def __init__(self, thread_id, interval):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+
+            # Collect frames from innermost to outermost
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append("{} ({}:{})".format(code.co_name, os.path.basename(code.co_filename), code.co_firstlineno))
+                frame = frame.f_back
+
+            if stack:
+                # Collapsed stacks list the outermost frame first
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
@@ -0,0 +1,65 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  race.py
+#
+#  Runs several solvers at once on the same maze, each in its own process, streaming each solver's trace events and
+#  progress back to the parent over a queue.
+# ----------------------------------------------------------------------------------------------------------------------
+
+import multiprocessing
+import queue
+from traversals.backend import run_job
+
+class Race:
+    def __init__(self, shared, algorithms, colors=()):
+        """
+        :param shared: The SharedMaze holding the maze to be solved
+        :param algorithms: The solver function names to race (keys of SOLVERS)
+        :param colors: Color names to register in each solver's trace first, so trace color indices match the parent's
+        """
+        # Spawn rather than fork, so that workers do not inherit the UI's threads
+        context = multiprocessing.get_context("spawn")
+
+        self.queue = context.Queue()
+
+        # Worker process of each solver, whose messages are keyed by the solver's function name
+        self.processes = {}
+
+        for algorithm in algorithms:
+            self.processes[algorithm] = context.Process(
+                target=run_job, args=(algorithm, algorithm, shared.name, shared.length, list(colors), self.queue),
+                daemon=True
+            )
+
+    def start(self):
+        for process in self.processes.values():
+            process.start()
+
+    def get_exited(self):
+        """
+        Gets the solvers whose workers have exited, either after sending their result or by dying without one (killed,
+        or out of memory). Workers flush their messages before exiting, so every message from these solvers can be
+        collected by the next poll().
+        :return: A dictionary of the workers' exit codes keyed by solver name
+        """
+        return {
+            algorithm: process.exitcode
+            for algorithm, process in self.processes.items() if process.pid is not None and not process.is_alive()
+        }
+
+    def poll(self):
+        """
+        Gets all messages sent by the workers so far, without blocking.
+        :return: A list of message tuples, each starting with "progress", "done" or "error" and the solver name
+        """
+        messages = []
+
+        while True:
+            try:
+                messages.append(self.queue.get_nowait())
+            except queue.Empty:
+                return messages
+
+    def stop(self):
+        for process in self.processes.values():
+            if process.is_alive():
+                process.terminate()
@@ -1,22 +1,79 @@
 # ----------------------------------------------------------------------------------------------------------------------
 #  runtime.py
 #
-#  Contains a decorator function for getting the runtime of a function in seconds.
+#  Contains a decorator function for getting the runtime of a function in seconds, along with a class for splitting
+#  that runtime into algorithm compute time, rendering (observer callback) time, and deliberate pacing delay.
 # ----------------------------------------------------------------------------------------------------------------------
 
 from functools import wraps
-from time import perf_counter
+from time import perf_counter, sleep
 
 def runtime(function):
     """
-    Decorator for getting the runtime of a function.
-    :param function: The function to be decorated
-    :return: The runtime of the function in seconds
+    Decorator for getting the runtime of a method. The decorated method's object must have a RunMetrics object as its
+    metrics attribute, which records the total runtime of the method.
+    :param function: The method to be decorated
+    :return: The name of the method and its RunMetrics object
     """
     @wraps(function)
-    def wrapper(*args, **kwargs):
+    def wrapper(self, *args, **kwargs):
         start_time = perf_counter()
-        function(*args, **kwargs)
+        function(self, *args, **kwargs)
         end_time = perf_counter()
-        return function.__name__, end_time - start_time
+        self.metrics.total = end_time - start_time
+        return function.__name__, self.metrics
     return wrapper
+
+class RunMetrics:
+    def __init__(self):
+        # Wall-clock time of the whole run
+        self.total = 0.0
+
+        # Time spent in observer callbacks (e.g. setting tile colors)
+        self.render = 0.0
+
+        # Time spent deliberately sleeping for the slow factor
+        self.pacing = 0.0
+
+        # Number of nodes expanded (visited) by the algorithm
+        self.expansions = 0
+
+        # Whether the run's result was taken from the solution cache instead of running the algorithm
+        self.cached = False
+
+        # Solution cache hit and miss counts as of the run (left at zero for runs that do not use the cache)
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @property
+    def compute(self):
+        """
+        Time spent in the algorithm itself, excluding rendering and pacing.
+        :return: The compute time in seconds
+        """
+        return self.total - self.render - self.pacing
+
+    def observe(self, callback):
+        """
+        Wraps an observer callback so that time spent in it is counted as rendering time.
+        :param callback: The callback to be wrapped, or None for no observer
+        :return: The wrapped callback, or None if no callback was given
+        """
+        if callback is None:
+            return None
+
+        @wraps(callback)
+        def observed(*args, **kwargs):
+            start_time = perf_counter()
+            callback(*args, **kwargs)
+            self.render += perf_counter() - start_time
+        return observed
+
+    def pace(self, slow_factor):
+        """
+        Sleeps for the slow factor, counting the time as pacing delay.
+        :param slow_factor: The time to sleep for (in seconds)
+        """
+        start_time = perf_counter()
+        sleep(slow_factor)
+        self.pacing += perf_counter() - start_time
@@ -0,0 +1,262 @@
+# ----------------------------------------------------------------------------------------------------------------------
+#  trace.py
+#
+#  Python class for a compact recording of a generation or solving run. Algorithms record tile color, wall, and color
+#  reset events into a typed array as they run at full speed, and the recording can then be replayed at any speed,
+#  saved to a file, and loaded again without re-running the algorithm.
+# ----------------------------------------------------------------------------------------------------------------------
+
+import struct
+import sys
+from array import array
+from maze.Maze import EAST, SOUTH
+
+# Event kinds (each event is stored as three integers: kind, a, b)
+COLOR = 0  # a: cell, b: color index
+WALL = 1   # a: cell, b: neighboring cell
+RESET = 2  # a: color index, b: unused
+
+# File header: magic, then maze length, start event, event count, and the byte lengths of the algorithm and colors
+MAGIC = b"MAZETRC1"
+HEADER = struct.Struct("<IIIII")
+
+class Trace:
+    def __init__(self, length, algorithm=""):
+        # Length and width of the traced maze
+        self.length = length
+
+        # Name of the traced function (e.g. "a_star")
+        self.algorithm = algorithm
+
+        # Color names used by the trace, with indices for each name
+        self.colors = []
+        self.color_indices = {}
+
+        # Flat array of (kind, a, b) events
+        self.events = array("i")
+
+        # Index of the first event of the run itself (earlier events set up the maze for replay)
+        self.start = 0
+
+        # Wall encoding of the maze opened by the first events, and the number of those events, for traces that start
+        # from a whole maze (see open_walls())
+        self.walls = None
+        self.wall_events = 0
+
+        # Flag for whether the run has finished recording
+        self.complete = False
+
+    def __len__(self):
+        return len(self.events) // 3
+
+    def get_color_index(self, color):
+        index = self.color_indices.get(color)
+
+        if index is None:
+            index = len(self.colors)
+            self.colors.append(color)
+            self.color_indices[color] = index
+
+        return index
+
+    def set_color(self, x, y, color):
+        self.events.extend((COLOR, y * self.length + x, self.get_color_index(color)))
+
+    def open_wall(self, x1, y1, x2, y2):
+        self.events.extend((WALL, y1 * self.length + x1, y2 * self.length + x2))
+
+    def open_walls(self, walls):
+        """
+        Opens every wall of a maze at once from its compact wall encoding, building the events in bulk rather than one
+        wall at a time. When these are the trace's first events, the encoding is kept, so that replays can draw the
+        whole maze at once.
+        :param walls: The encoded edges, as returned by Maze.get_walls()
+        """
+        first = not self.events
+
+        for bit, step in ((EAST, 1), (SOUTH, self.length)):
+            cells = [cell for cell, encoded in enumerate(walls) if encoded & bit]
+
+            events = array("i", (WALL, 0, 0)) * len(cells)
+            events[1::3] = array("i", cells)
+            events[2::3] = array("i", [cell + step for cell in cells])
+            self.events.extend(events)
+
+        if first:
+            self.walls = bytes(walls)
+            self.wall_events = len(self)
+
+    def reset_colors(self, color):
+        self.events.extend((RESET, self.get_color_index(color), 0))
+
+    def extend(self, colors, events):
+        """
+        Appends events recorded by another trace of the same maze, such as one recorded in a worker process.
+        :param colors: The other trace's color names, which must start with this trace's colors
+        :param events: The new events, as bytes
+        """
+        for color in colors[len(self.colors):]:
+            self.get_color_index(color)
+
+        self.events.frombytes(events)
+
+    def mark_start(self):
+        """
+        Marks the next recorded event as the start of the run.
+        """
+        self.start = len(self)
+
+    def get_event(self, i):
+        return self.events[3 * i], self.events[3 * i + 1], self.events[3 * i + 2]
+
+    def get_coordinates(self, cell):
+        return cell % self.length, cell // self.length
+
+    def get_walls(self):
+        """
+        Gets every wall opened in the trace.
+        :return: A list of (x1, y1, x2, y2) walls
+        """
+        walls = []
+
+        for i in range(len(self)):
+            kind, a, b = self.get_event(i)
+            if kind == WALL:
+                walls.append(self.get_coordinates(a) + self.get_coordinates(b))
+
+        return walls
+
+    def encode_walls(self, end=None):
+        """
+        Gets the compact wall encoding of the walls opened in the trace.
+        :param end: The number of events to encode the walls of (all events if None)
+        :return: The encoded edges as bytes, as returned by Maze.get_walls()
+        """
+        # Start from the maze the trace opens first, if it is known
+        if self.walls is not None and (end is None or end >= self.wall_events):
+            walls = bytearray(self.walls)
+            first = self.wall_events
+        else:
+            walls = bytearray(self.length * self.length)
+            first = 0
+
+        events = self.events[3 * first:None if end is None else 3 * end]
+
+        for kind, a, b in zip(events[0::3], events[1::3], events[2::3]):
+            if kind == WALL:
+                walls[min(a, b)] |= EAST if abs(a - b) == 1 else SOUTH
+
+        return bytes(walls)
+
+    def get_cell_colors(self):
+        """
+        Gets the final color of every cell colored since the last color reset.
+        :return: A dictionary of color names keyed by (x, y)
+        """
+        colors = {}
+
+        for i in range(len(self)):
+            kind, a, b = self.get_event(i)
+            if kind == COLOR:
+                colors[self.get_coordinates(a)] = self.colors[b]
+            elif kind == RESET:
+                colors = {}
+
+        return colors
+
+    def check_events(self):
+        """
+        Checks that every event refers to cells of the maze and to registered colors, and that every opened wall lies
+        between two neighboring cells.
+        :raises ValueError: At the first invalid event
+        """
+        length = self.length
+        cells = length * length
+        colors = len(self.colors)
+        events = self.events
+
+        for i, (kind, a, b) in enumerate(zip(events[0::3], events[1::3], events[2::3])):
+            if kind == COLOR:
+                valid = 0 <= a < cells and 0 <= b < colors
+            elif kind == WALL:
+                valid = 0 <= a < cells and 0 <= b < cells and (
+                    abs(a - b) == length or (abs(a - b) == 1 and a // length == b // length)
+                )
+            elif kind == RESET:
+                valid = 0 <= a < colors
+            else:
+                valid = False
+
+            if not valid:
+                raise ValueError("Maze trace has an invalid event {}: {}".format(i, (kind, a, b)))
+
+    def save(self, path):
+        algorithm = self.algorithm.encode()
+        colors = "\n".join(self.colors).encode()
+
+        # Events are always stored little-endian
+        events = array("i", self.events)
+        if sys.byteorder == "big":
+            events.byteswap()
+
+        with open(path, "wb") as file:
+            file.write(MAGIC)
+            file.write(HEADER.pack(self.length, self.start, len(self), len(algorithm), len(colors)))
+            file.write(algorithm)
+            file.write(colors)
+            file.write(events.tobytes())
+
+    @classmethod
+    def load(cls, path, max_length=None):
+        """
+        Loads a trace saved by save(), checking that every event fits the traced maze, so that a damaged file cannot
+        leave the replay or the rebuilt maze in an invalid state.
+        :param path: The path of the trace file
+        :param max_length: The largest maze length accepted (no limit if None)
+        :return: The trace
+        :raises ValueError: If the file is not a complete, valid trace
+        """
+        with open(path, "rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError("Not a maze trace file: {}".format(path))
+
+            header = file.read(HEADER.size)
+            if len(header) != HEADER.size:
+                raise ValueError("Truncated maze trace file: {}".format(path))
+
+            length, start, count, algorithm_size, colors_size = HEADER.unpack(header)
+
+            if length < 2:
+                raise ValueError("Maze trace has an invalid maze length: {}".format(length))
+            if max_length is not None and length > max_length:
+                raise ValueError("Maze trace is for a {0}x{0} maze, larger than {1}x{1}".format(length, max_length))
+
+            trace = cls(length, file.read(algorithm_size).decode())
+
+            colors = file.read(colors_size).decode()
+            for color in colors.split("\n") if colors else []:
+                trace.get_color_index(color)
+
+            trace.events.frombytes(file.read(count * 3 * trace.events.itemsize))
+            if sys.byteorder == "big":
+                trace.events.byteswap()
+
+        if len(trace) != count:
+            raise ValueError("Truncated maze trace file: {}".format(path))
+
+        if start > count:
+            raise ValueError("Maze trace starts at event {} of {}".format(start, count))
+
+        trace.check_events()
+
+        # Traces of runs on a whole maze start by opening all of its walls, which replays draw at once
+        kinds = trace.events[0::3]
+        wall_events = next((i for i, kind in enumerate(kinds) if kind != WALL), len(kinds))
+        if wall_events:
+            trace.walls = trace.encode_walls(wall_events)
+            trace.wall_events = wall_events
+
+        trace.start = start
+        trace.complete = True
+
+        return trace